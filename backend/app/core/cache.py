@@ -1,151 +1,1073 @@
-"""Simple in-memory cache implementation."""
+"""Bounded in-memory cache implementation."""
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Optional, Callable, TypeVar, ParamSpec
-from functools import wraps
 import asyncio
+import math
+import os
+import random
+import sqlite3
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, NamedTuple, Optional, Callable, TypeVar, ParamSpec
+from functools import wraps
+
+from .async_utils import run_sync
+from .config import settings
+from .logging import get_logger
+from .shared_cache import SharedCacheTier, SQLiteCacheTier
 
 P = ParamSpec('P')
 T = TypeVar('T')
 
+logger = get_logger(__name__)
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate the memory footprint of a value in bytes.
+    
+    Walks dicts and sequences (the shapes our services cache) and sums
+    ``sys.getsizeof`` of the container and its items. Shared objects are
+    counted once per reference, so the result errs on the high side.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 8:
+        return size
+    
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+# Lookup states for get_or_compute
+_MISS = 0
+_FRESH = 1
+_REFRESH = 2  # Serve the cached value and refresh it in the background
+
+# Stored in place of a None loader result when negative caching is enabled.
+# Kept out of the shared tier so identity checks against it stay valid.
+_NOT_FOUND = object()
+
+# Result of an async in-flight load whose leader was cancelled; waiters
+# retry (one of them taking over the load) instead of being cancelled too
+_RETRY = object()
+
+
+class _CacheEntry:
+    """A cached value with its expiry times, approximate size and tag generations.
+    
+    ``expires_at`` is the soft expiry after which the value is no longer
+    fresh; ``stale_until`` is the hard expiry up to which stale-while-
+    revalidate callers may still be served it. ``delta`` is how long the
+    value took to load, used for probabilistic early refresh.
+    """
+    
+    __slots__ = ("value", "expires_at", "stale_until", "size", "tags", "delta")
+    
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int,
+        tags: tuple[tuple[str, int], ...] = (),
+        stale_until: Optional[float] = None,
+        delta: float = 0.0
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = expires_at if stale_until is None else stale_until
+        self.size = size
+        self.tags = tags
+        self.delta = delta
+
+
+class TagSnapshot(NamedTuple):
+    """Tag generations (and the shared-tier sync point) taken before a load."""
+    
+    tags: tuple[str, ...]
+    generations: tuple[tuple[str, int], ...]
+    synced_at: float
+
+
+class _PrefixStats:
+    """Counters for all keys sharing a prefix (the part before the first ':')."""
+    
+    __slots__ = (
+        "hits", "stale_hits", "negative_hits", "shared_hits", "misses", "coalesced",
+        "expirations", "invalidations", "evictions",
+        "entries", "bytes", "loads", "load_errors", "load_seconds", "load_max_seconds",
+    )
+    
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+    
+    def merge(self, other: "_PrefixStats") -> None:
+        """Add another bucket's counters into this one."""
+        for name in self.__slots__:
+            if name == "load_max_seconds":
+                self.load_max_seconds = max(self.load_max_seconds, other.load_max_seconds)
+            else:
+                setattr(self, name, getattr(self, name) + getattr(other, name))
+    
+    def to_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "load_avg_ms": round(self.load_seconds / self.loads * 1000, 2) if self.loads else None,
+            "load_max_ms": round(self.load_max_seconds * 1000, 2),
+        }
+
+
+def key_prefix(key: str) -> str:
+    """Get the metrics prefix of a cache key, e.g. ``blog_by_id`` for ``blog_by_id:42``."""
+    return key.split(":", 1)[0]
+
+
+class _Shard:
+    """One lock-protected LRU partition of the cache.
+    
+    Each shard has its own ordered dict, lock, limits and stats, so threads
+    touching keys in different shards never wait on each other.
+    """
+    
+    __slots__ = ("entries", "lock", "bytes", "stats", "max_entries", "max_bytes", "generations")
+    
+    def __init__(self, max_entries: int, max_bytes: int, generations: dict[str, int]):
+        self.entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.lock = threading.Lock()
+        self.bytes = 0
+        self.stats: dict[str, _PrefixStats] = {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Shared with the owning Cache; read without a lock (see Cache)
+        self.generations = generations
+    
+    def stat(self, key: str) -> _PrefixStats:
+        """Get the stats bucket for a key. Caller must hold the lock."""
+        prefix = key_prefix(key)
+        stats = self.stats.get(prefix)
+        if stats is None:
+            stats = self.stats[prefix] = _PrefixStats()
+        return stats
+    
+    def is_stale(self, entry: _CacheEntry) -> bool:
+        """Check whether any of the entry's tags was invalidated after it was set."""
+        for tag, generation in entry.tags:
+            if self.generations.get(tag, 0) != generation:
+                return True
+        return False
+    
+    def remove(self, key: str, reason: Optional[str] = None) -> None:
+        """Remove an entry, counting it under ``reason``. Caller must hold the lock."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            stats = self.stat(key)
+            stats.entries -= 1
+            stats.bytes -= entry.size
+            if reason is not None:
+                setattr(stats, reason, getattr(stats, reason) + 1)
+    
+    def remove_unusable(self, key: str, entry: _CacheEntry, now: float) -> bool:
+        """Remove an entry if it is past its hard expiry or invalidated. Caller must hold the lock."""
+        if self.is_stale(entry):
+            self.remove(key, "invalidations")
+            return True
+        if now >= entry.stale_until:
+            self.remove(key, "expirations")
+            return True
+        return False
+    
+    def insert(self, key: str, entry: _CacheEntry) -> None:
+        """Insert or replace an entry, evicting LRU entries over the limits. Caller must hold the lock."""
+        self.remove(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        stats = self.stat(key)
+        stats.entries += 1
+        stats.bytes += entry.size
+        
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.bytes > self.max_bytes
+        ):
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+            stats = self.stat(evicted_key)
+            stats.entries -= 1
+            stats.bytes -= evicted.size
+            stats.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every entry, keeping counters. Caller must hold the lock."""
+        self.entries.clear()
+        self.bytes = 0
+        for stats in self.stats.values():
+            stats.entries = 0
+            stats.bytes = 0
+
 
 class Cache:
-    """Thread-safe in-memory cache with TTL support."""
+    """Thread-safe, bounded in-memory cache with TTL support.
+    
+    Entries are kept in least-recently-used order. When either the entry
+    count or the approximate byte budget is exceeded, the least recently
+    used entries are evicted. A background sweeper thread periodically
+    drops expired entries so keys that are never read again don't linger.
+    
+    Entries can be stored under one or more dependency tags. Each tag has a
+    generation counter that is recorded with the entry when it is set;
+    ``invalidate_tags`` bumps the counter, which makes every entry stored
+    under the old generation a miss in O(1) regardless of how many derived
+    keys exist.
+    
+    ``get_or_compute`` callers can opt into stale-while-revalidate with
+    ``stale_ttl``: an expired value is still served for that grace window
+    while a single background refresh runs, and values are refreshed early
+    with XFetch-style probability as they approach expiry, so hot keys are
+    normally reloaded before any request has to wait for them.
+    
+    An optional ``SharedCacheTier`` acts as an L2 shared by every worker on
+    the host. L1 misses are looked up there before loading, loads and sets
+    are written through, and deletes/invalidations are broadcast through it
+    and applied to the other workers' L1 by a background sync thread.
+    Values written through are stamped with the time of the last applied
+    sync rather than the current time: a value built from L1 is only known
+    to reflect the other workers' invalidations up to then, so one that may
+    have been built from a stale entry reads as invalidated in L2.
     
-    def __init__(self, default_ttl: int = 300):
-        """Initialize cache with default TTL in seconds."""
-        self._cache: dict[str, tuple[Any, float]] = {}
+    Keys are spread over ``shards`` lock-striped partitions, each an
+    independent LRU with an even share of the entry and byte limits, so
+    executor threads and the event loop only contend when they touch the
+    same shard. Tag generations are bumped under their own lock and read
+    without one: a single dict lookup is atomic under the GIL, and an
+    entry compared against a generation that is bumped a moment later is
+    caught by the next lookup.
+    
+    Hits, misses, expirations, evictions, entry counts, bytes and loader
+    latency are counted per key prefix; see ``stats``.
+    """
+    
+    # XFetch beta: values > 1 favour earlier refreshes
+    XFETCH_BETA = 1.0
+    
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        shared: Optional[SharedCacheTier] = None,
+        shards: int = 16
+    ):
+        """Initialize cache with default TTL in seconds, size limits, optional L2 and shard count."""
+        shards = max(1, min(shards, max_entries))
         self._default_ttl = default_ttl
-        self._lock = asyncio.Lock()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._generations: dict[str, int] = {}
+        self._generations_lock = threading.Lock()
+        self._shards = [
+            _Shard(math.ceil(max_entries / shards), max_bytes // shards, self._generations)
+            for _ in range(shards)
+        ]
+        # In-flight loads for single-flight coalescing (threads and event loop)
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._async_inflight: dict[str, asyncio.Future] = {}
+        self._background_tasks: set[asyncio.Task] = set()
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="cache_refresh_"
+        )
+        self._shared = shared
+        # Wall time of the last poll whose broadcast invalidations were
+        # applied to L1; this worker's L1 reflects every event before it
+        self._synced_at = time.time()
+        self._sweeper: Optional[threading.Thread] = None
+        self._syncer: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+    
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+    
+    @property
+    def size_bytes(self) -> int:
+        """Approximate number of bytes held by cached values."""
+        return sum(shard.bytes for shard in self._shards)
+    
+    def _shard(self, key: str) -> _Shard:
+        """Get the shard that owns a key."""
+        return self._shards[hash(key) % len(self._shards)]
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired."""
-        async with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                if datetime.now().timestamp() < expiry:
-                    return value
-                # Expired, remove from cache
-                del self._cache[key]
-            return None
+        return self.get_sync(key)
     
     def get_sync(self, key: str) -> Optional[Any]:
         """Synchronous get for non-async contexts."""
-        if key in self._cache:
-            value, expiry = self._cache[key]
-            if datetime.now().timestamp() < expiry:
-                return value
-            del self._cache[key]
-        return None
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                now = time.monotonic()
+                # Expired or invalidated entries are removed; ones past their
+                # TTL but within the grace window are kept for SWR callers
+                if not shard.remove_unusable(key, entry, now) and now < entry.expires_at:
+                    shard.entries.move_to_end(key)
+                    shard.stat(key).hits += 1
+                    return None if entry.value is _NOT_FOUND else entry.value
+        
+        value = self._promote(key)
+        if value is None:
+            with shard.lock:
+                shard.stat(key).misses += 1
+        return value
+    
+    def _promote(self, key: str) -> Optional[Any]:
+        """Copy a value from the shared tier into L1, returning it if found."""
+        if self._shared is None:
+            return None
+        hit = self._shared.get(key)
+        if hit is None:
+            return None
+        value, remaining, tags = hit
+        generations = self._tag_generations(tags)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.stat(key).shared_hits += 1
+        self._store(key, value, remaining, generations)
+        return value
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: tuple[str, ...] = (),
+        since: Optional[TagSnapshot] = None
+    ) -> None:
+        """Set value in cache with optional TTL and dependency tags."""
+        self.set_sync(key, value, ttl, tags, since)
+    
+    def set_sync(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: tuple[str, ...] = (),
+        since: Optional[TagSnapshot] = None
+    ) -> None:
+        """Synchronous set for non-async contexts.
+        
+        For a value loaded outside ``get_or_compute``, pass the ``snapshot``
+        of its tags taken before the load as ``since`` (its tags replace
+        ``tags``), so an invalidation during the load leaves it stale.
+        """
+        if since is None:
+            since = self.snapshot(tags)
+        self._store(key, value, ttl, since.generations)
+        if self._shared is not None:
+            self._shared.set(key, value, ttl or self._default_ttl, since.tags, since.synced_at)
     
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set value in cache with optional TTL."""
-        async with self._lock:
-            ttl = ttl or self._default_ttl
-            expiry = datetime.now().timestamp() + ttl
-            self._cache[key] = (value, expiry)
+    def snapshot(self, tags: tuple[str, ...]) -> TagSnapshot:
+        """Snapshot the state of ``tags`` before loading a value for ``set_sync``."""
+        return TagSnapshot(tags, self._tag_generations(tags), self._synced_at)
     
-    def set_sync(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Synchronous set for non-async contexts."""
+    def _tag_generations(self, tags: tuple[str, ...]) -> tuple[tuple[str, int], ...]:
+        """Snapshot the current generation of each tag."""
+        return tuple((tag, self._generations.get(tag, 0)) for tag in tags)
+    
+    def _store(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int],
+        generations: tuple[tuple[str, int], ...],
+        stale_ttl: int = 0,
+        delta: float = 0.0
+    ) -> None:
+        """Store an entry recorded against the given tag generations."""
         ttl = ttl or self._default_ttl
-        expiry = datetime.now().timestamp() + ttl
-        self._cache[key] = (value, expiry)
+        size = estimate_size(value)
+        shard = self._shard(key)
+        
+        if size > shard.max_bytes:
+            # A single value larger than the shard's budget would evict all of it
+            logger.warning(
+                f"Value for cache key '{key}' exceeds cache shard byte budget, not caching",
+                **{"cache.key": key, "cache.size_bytes": size}
+            )
+            return
+        
+        expires_at = time.monotonic() + ttl
+        entry = _CacheEntry(
+            value,
+            expires_at,
+            size,
+            generations,
+            stale_until=expires_at + stale_ttl,
+            delta=delta
+        )
+        with shard.lock:
+            shard.insert(key, entry)
+    
+    def _lookup(self, key: str, stale_ttl: int, record: bool = True) -> tuple[Any, int]:
+        """Look up a key for get_or_compute, returning its value and lookup state."""
+        shard = self._shard(key)
+        with shard.lock:
+            stats = shard.stat(key) if record else _PrefixStats()
+            entry = shard.entries.get(key)
+            now = time.monotonic()
+            if entry is None or shard.remove_unusable(key, entry, now):
+                stats.misses += 1
+                return None, _MISS
+            
+            if now >= entry.expires_at:
+                if not stale_ttl:
+                    stats.misses += 1
+                    return None, _MISS
+                shard.entries.move_to_end(key)
+                stats.hits += 1
+                stats.stale_hits += 1
+                return entry.value, _REFRESH
+            
+            shard.entries.move_to_end(key)
+            stats.hits += 1
+            if entry.value is _NOT_FOUND:
+                stats.negative_hits += 1
+                return None, _FRESH
+            if stale_ttl and entry.delta:
+                # XFetch: refresh early with probability rising towards expiry
+                early = -entry.delta * self.XFETCH_BETA * math.log(1.0 - random.random())
+                if now + early >= entry.expires_at:
+                    return entry.value, _REFRESH
+            return entry.value, _FRESH
+    
+    def _record_load(self, key: str, seconds: float, failed: bool = False) -> None:
+        """Record loader latency for a key's prefix."""
+        shard = self._shard(key)
+        with shard.lock:
+            stats = shard.stat(key)
+            stats.loads += 1
+            stats.load_seconds += seconds
+            stats.load_max_seconds = max(stats.load_max_seconds, seconds)
+            if failed:
+                stats.load_errors += 1
+    
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        ttl: Optional[int],
+        tags: tuple[str, ...],
+        stale_ttl: int,
+        use_shared: bool = True,
+        negative_ttl: int = 0
+    ) -> T:
+        """Run a loader and store its result. Caller must own the in-flight slot.
+        
+        Unless ``use_shared`` is False (background refreshes, which must not
+        pick the same value back up), the shared tier is checked first. A
+        ``None`` result is remembered locally for ``negative_ttl`` seconds.
+        """
+        if use_shared:
+            value = self._promote(key)
+            if value is not None:
+                return value
+        
+        # Snapshot generations (and the sync point) first so an
+        # invalidation during the load makes the stored result stale
+        # instead of hiding it
+        generations = self._tag_generations(tags)
+        loaded_at = self._synced_at
+        start = time.monotonic()
+        try:
+            value = loader()
+        except BaseException:
+            self._record_load(key, time.monotonic() - start, failed=True)
+            raise
+        self._record_load(key, time.monotonic() - start)
+        if value is not None:
+            self._store(
+                key, value, ttl, generations, stale_ttl, time.monotonic() - start
+            )
+            if self._shared is not None:
+                self._shared.set(key, value, ttl or self._default_ttl, tags, loaded_at)
+        elif negative_ttl:
+            self._store(key, _NOT_FOUND, negative_ttl, generations)
+        return value
+    
+    async def _aload(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: Optional[int],
+        tags: tuple[str, ...],
+        stale_ttl: int,
+        use_shared: bool = True,
+        value_tags: Optional[Callable[[T], tuple[str, ...]]] = None
+    ) -> T:
+        """Async variant of ``_load`` for coroutine loaders.
+        
+        Shared-tier reads and writes are blocking SQLite calls, so they run
+        on the executor instead of the event loop. Tags from ``value_tags``
+        are only known once the value is loaded, so every generation is
+        snapshotted up front for them.
+        """
+        if use_shared and self._shared is not None:
+            value = await run_sync(self._promote, key)
+            if value is not None:
+                return value
+        
+        snapshot = dict(self._generations) if value_tags is not None else None
+        generations = self._tag_generations(tags)
+        loaded_at = self._synced_at
+        start = time.monotonic()
+        try:
+            value = await loader()
+        except BaseException:
+            self._record_load(key, time.monotonic() - start, failed=True)
+            raise
+        self._record_load(key, time.monotonic() - start)
+        if value is not None and snapshot is not None:
+            extra = tuple(tag for tag in value_tags(value) if tag not in tags)  # type: ignore[misc]
+            generations += tuple((tag, snapshot.get(tag, 0)) for tag in extra)
+            tags = tags + extra
+        if value is not None:
+            self._store(
+                key, value, ttl, generations, stale_ttl, time.monotonic() - start
+            )
+            if self._shared is not None:
+                await run_sync(self._shared.set, key, value, ttl or self._default_ttl, tags, loaded_at)
+        return value
+    
+    def get_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        ttl: Optional[int] = None,
+        tags: tuple[str, ...] = (),
+        stale_ttl: int = 0,
+        negative_ttl: int = 0
+    ) -> T:
+        """Get a value, running ``loader`` on a miss with single-flight coalescing.
+        
+        Only one loader runs per key at a time in this process; concurrent
+        callers that miss the same key block until the running load finishes
+        and share its result (or its exception). ``None`` results are
+        returned but only cached (in this process, under the same tags) when
+        ``negative_ttl`` is set.
+        
+        With ``stale_ttl`` set, a value up to ``stale_ttl`` seconds past its
+        TTL (or one picked for early refresh) is returned immediately while
+        a background thread reloads it.
+        """
+        value, state = self._lookup(key, stale_ttl)
+        if state == _FRESH:
+            return value
+        if state == _REFRESH:
+            self._refresh_in_background(key, loader, ttl, tags, stale_ttl)
+            return value
+        
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = Future()
+                self._inflight[key] = call
+        
+        if not is_leader:
+            shard = self._shard(key)
+            with shard.lock:
+                shard.stat(key).coalesced += 1
+            return call.result()
+        
+        try:
+            # Another leader may have finished between our miss and taking over
+            value, state = self._lookup(key, stale_ttl, record=False)
+            if state == _MISS:
+                value = self._load(
+                    key, loader, ttl, tags, stale_ttl, negative_ttl=negative_ttl
+                )
+            call.set_result(value)
+            return value
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _refresh_in_background(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        ttl: Optional[int],
+        tags: tuple[str, ...],
+        stale_ttl: int
+    ) -> None:
+        """Reload a key on the refresh pool unless a load is already running."""
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            call: Future = Future()
+            self._inflight[key] = call
+        
+        def _run() -> None:
+            try:
+                call.set_result(
+                    self._load(key, loader, ttl, tags, stale_ttl, use_shared=False)
+                )
+            except Exception as e:
+                call.set_exception(e)
+                logger.warning(
+                    f"Background cache refresh failed for '{key}': {e}",
+                    **{"cache.key": key, "error.type": type(e).__name__}
+                )
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+        
+        try:
+            self._refresh_executor.submit(_run)
+        except RuntimeError:
+            # Executor already shut down; keep serving the stale value
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: Optional[int] = None,
+        tags: tuple[str, ...] = (),
+        stale_ttl: int = 0,
+        value_tags: Optional[Callable[[T], tuple[str, ...]]] = None
+    ) -> T:
+        """Async variant of ``get_or_compute`` for coroutine loaders.
+        
+        Coalesces concurrent misses on the running event loop; waiters await
+        the leader's result instead of starting their own load. Background
+        refreshes run as tasks on the same loop. ``value_tags`` adds tags
+        that depend on the loaded value, e.g. the author of a post.
+        
+        If the leader is cancelled (say its client disconnected), its
+        waiters aren't: the first to resume takes over the load.
+        """
+        while True:
+            value, state = self._lookup(key, stale_ttl)
+            if state == _FRESH:
+                return value
+            if state == _REFRESH:
+                self._arefresh_in_background(key, loader, ttl, tags, stale_ttl, value_tags)
+                return value
+            
+            pending = self._async_inflight.get(key)
+            if pending is None:
+                break
+            shard = self._shard(key)
+            with shard.lock:
+                shard.stat(key).coalesced += 1
+            value = await asyncio.shield(pending)
+            if value is not _RETRY:
+                return value
+        
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        try:
+            value = await self._aload(key, loader, ttl, tags, stale_ttl, value_tags=value_tags)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._async_inflight.pop(key, None)
+    
+    def _arefresh_in_background(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: Optional[int],
+        tags: tuple[str, ...],
+        stale_ttl: int,
+        value_tags: Optional[Callable[[T], tuple[str, ...]]] = None
+    ) -> None:
+        """Schedule a reload task on the running loop unless one is already running."""
+        if key in self._async_inflight:
+            return
+        
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        
+        async def _run() -> None:
+            try:
+                future.set_result(
+                    await self._aload(
+                        key, loader, ttl, tags, stale_ttl, use_shared=False, value_tags=value_tags
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()
+                logger.warning(
+                    f"Background cache refresh failed for '{key}': {e}",
+                    **{"cache.key": key, "error.type": type(e).__name__}
+                )
+            except BaseException:
+                # Cancelled (e.g. at shutdown); don't leave waiters hanging
+                future.set_result(_RETRY)
+                raise
+            finally:
+                self._async_inflight.pop(key, None)
+        
+        def _done(task: asyncio.Task) -> None:
+            self._background_tasks.discard(task)
+            # A task cancelled before it started never ran _run
+            if not future.done():
+                future.set_result(_RETRY)
+                if self._async_inflight.get(key) is future:
+                    del self._async_inflight[key]
+        
+        task = asyncio.create_task(_run())
+        self._background_tasks.add(task)
+        task.add_done_callback(_done)
     
     async def delete(self, key: str) -> None:
         """Delete key from cache."""
-        async with self._lock:
-            self._cache.pop(key, None)
+        self.delete_sync(key)
     
     def delete_sync(self, key: str) -> None:
         """Synchronous delete for non-async contexts."""
-        self._cache.pop(key, None)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.remove(key, "invalidations")
+        if self._shared is not None:
+            self._shared.delete(key)
     
     async def clear(self) -> None:
         """Clear all cache entries."""
-        async with self._lock:
-            self._cache.clear()
+        self.clear_sync()
     
     def clear_sync(self) -> None:
         """Synchronous clear for non-async contexts."""
-        self._cache.clear()
+        self._clear_local()
+        if self._shared is not None:
+            self._shared.clear()
     
     async def delete_pattern(self, pattern: str) -> None:
         """Delete all keys matching pattern (simple prefix match)."""
-        async with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if k.startswith(pattern)]
-            for key in keys_to_delete:
-                del self._cache[key]
+        self.delete_pattern_sync(pattern)
+    
+    def delete_pattern_sync(self, pattern: str) -> None:
+        """Synchronous prefix delete for non-async contexts."""
+        self._delete_prefix_local(pattern)
+        if self._shared is not None:
+            self._shared.delete_prefix(pattern)
+    
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Invalidate every entry stored under any of the given tags."""
+        self.invalidate_tags_sync(*tags)
+    
+    def invalidate_tags_sync(self, *tags: str) -> None:
+        """Synchronous tag invalidation for non-async contexts."""
+        self._bump_generations(tags)
+        if self._shared is not None:
+            self._shared.invalidate_tags(tags)
+    
+    def _clear_local(self) -> None:
+        """Drop every L1 entry, one shard at a time."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+    
+    def _delete_prefix_local(self, prefix: str) -> None:
+        """Drop L1 entries whose key starts with ``prefix``."""
+        for shard in self._shards:
+            with shard.lock:
+                for key in [k for k in shard.entries if k.startswith(prefix)]:
+                    shard.remove(key, "invalidations")
+    
+    def _bump_generations(self, tags: tuple[str, ...]) -> None:
+        """Advance each tag's generation, making entries stored under it stale."""
+        with self._generations_lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+    
+    def apply_shared_invalidations(self) -> int:
+        """Apply deletes/invalidations broadcast by other workers to L1.
+        
+        Returns the number of events applied.
+        """
+        if self._shared is None:
+            return 0
+        polled = self._shared.poll_invalidations()
+        if polled is None:
+            return 0
+        
+        polled_at, events = polled
+        for kind, target in events:
+            if kind == "key":
+                shard = self._shard(target)
+                with shard.lock:
+                    shard.remove(target, "invalidations")
+            elif kind == "tag":
+                self._bump_generations((target,))
+            elif kind == "prefix":
+                self._delete_prefix_local(target)
+            elif kind == "clear":
+                self._clear_local()
+        self._synced_at = polled_at
+        return len(events)
+    
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of cache size and per-prefix counters, merged across shards."""
+        merged: dict[str, _PrefixStats] = {}
+        entries = size = 0
+        for shard in self._shards:
+            with shard.lock:
+                entries += len(shard.entries)
+                size += shard.bytes
+                for prefix, stats in shard.stats.items():
+                    merged.setdefault(prefix, _PrefixStats()).merge(stats)
+        
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "shards": len(self._shards),
+            "shared_tier": self._shared is not None,
+            "prefixes": {
+                prefix: stats.to_dict() for prefix, stats in sorted(merged.items())
+            },
+        }
+    
+    def reset_stats(self) -> None:
+        """Reset counters, keeping the current entry and byte totals."""
+        for shard in self._shards:
+            with shard.lock:
+                for stats in shard.stats.values():
+                    entries, size = stats.entries, stats.bytes
+                    stats.__init__()
+                    stats.entries, stats.bytes = entries, size
+    
+    def sweep(self) -> int:
+        """Remove all expired or invalidated entries. Returns the number removed."""
+        now = time.monotonic()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [
+                    (k, entry) for k, entry in shard.entries.items()
+                    if now >= entry.stale_until or shard.is_stale(entry)
+                ]
+                for key, entry in expired:
+                    shard.remove_unusable(key, entry, now)
+            removed += len(expired)
+        if self._shared is not None:
+            self._shared.sweep()
+        return removed
+    
+    def start_sweeper(self, interval: float = 30.0, sync_interval: float = 1.0) -> None:
+        """Start the background threads for expiry sweeping and shared-tier sync."""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        
+        self._sweeper_stop.clear()
+        
+        if self._shared is not None:
+            def _sync() -> None:
+                while not self._sweeper_stop.wait(sync_interval):
+                    try:
+                        self.apply_shared_invalidations()
+                    except Exception as e:
+                        logger.error(f"Shared cache sync failed: {e}")
+            
+            self._syncer = threading.Thread(target=_sync, name="cache_sync", daemon=True)
+            self._syncer.start()
+        
+        def _run() -> None:
+            while not self._sweeper_stop.wait(interval):
+                try:
+                    removed = self.sweep()
+                    if removed:
+                        logger.debug(
+                            f"Cache sweeper removed {removed} expired entries",
+                            **{"cache.swept": removed, "cache.entries": len(self)}
+                        )
+                except Exception as e:
+                    logger.error(f"Cache sweeper failed: {e}")
+        
+        self._sweeper = threading.Thread(target=_run, name="cache_sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper and shared-tier sync threads."""
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+        if self._syncer is not None:
+            self._syncer.join(timeout=5)
+            self._syncer = None
+    
+    def shutdown(self) -> None:
+        """Stop background work: the sweeper thread and the refresh pool."""
+        self.stop_sweeper()
+        self._refresh_executor.shutdown(wait=False)
+
+
+def _shared_tier_path() -> str:
+    """Path of the shared tier's file, by default in a directory private to this user."""
+    if settings.CACHE_SHARED_PATH:
+        return settings.CACHE_SHARED_PATH
+    
+    uid = getattr(os, "getuid", lambda: None)()
+    directory = os.path.join(
+        tempfile.gettempdir(), "mcu_redefined" if uid is None else f"mcu_redefined-{uid}"
+    )
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return os.path.join(directory, "cache.sqlite3")
+
+
+def _check_shared_tier_path(path: str) -> None:
+    """Refuse a shared tier file that another user could have written.
+    
+    Values are unpickled from it, so anyone able to write the file (or
+    its directory, or the WAL files next to it) could run code in every
+    worker. The file must be ours and its directory ours or root's,
+    neither writable by group or others.
+    
+    Raises:
+        PermissionError: If the file or its directory fails the check
+    """
+    if not hasattr(os, "getuid"):
+        return
+    uid = os.getuid()
+    directory = os.path.dirname(os.path.abspath(path))
+    for target, owners in (
+        (directory, (uid, 0)),
+        (path, (uid,)),
+        (path + "-wal", (uid,)),
+        (path + "-shm", (uid,)),
+    ):
+        try:
+            info = os.lstat(target)
+        except FileNotFoundError:
+            continue
+        if stat.S_ISLNK(info.st_mode) or info.st_uid not in owners or info.st_mode & 0o022:
+            raise PermissionError(
+                f"{target} must be owned by this user and not writable by group or others"
+            )
+
+
+def _create_shared_tier() -> Optional[SharedCacheTier]:
+    """Create the host-local shared tier from settings, if enabled."""
+    if not settings.CACHE_SHARED_ENABLED:
+        return None
+    
+    path = settings.CACHE_SHARED_PATH or "<default>"
+    try:
+        path = _shared_tier_path()
+        _check_shared_tier_path(path)
+        return SQLiteCacheTier(path, max_entries=settings.CACHE_SHARED_MAX_ENTRIES)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(
+            f"Shared cache tier unavailable, using per-process cache only: {e}",
+            **{"cache.shared_path": path}
+        )
+        return None
 
 
 # Global cache instance
-cache = Cache()
+cache = Cache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    shared=_create_shared_tier(),
+    shards=settings.CACHE_SHARDS,
+)
 
 
-def cached(ttl: Optional[int] = None, key_prefix: Optional[str] = None):
-    """Decorator for caching function results (sync version for ORM operations)."""
+def _build_cache_key(prefix: str, args: tuple, kwargs: dict) -> str:
+    """Build a cache key from a prefix and call arguments."""
+    key_parts = [prefix]
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            key_parts.extend([str(a) for a in sorted(arg) if a is not None])
+        elif arg is not None:
+            key_parts.append(str(arg))
+    
+    for k, v in sorted(kwargs.items()):
+        if isinstance(v, (list, tuple, set)):
+            key_parts.append(f"{k}={','.join(str(a) for a in sorted(v) if a)}")
+        elif v is not None:
+            key_parts.append(f"{k}={v}")
+    
+    return ":".join(key_parts)
+
+
+def cached(
+    ttl: Optional[int] = None,
+    key_prefix: Optional[str] = None,
+    tags: tuple[str, ...] = ()
+):
+    """Decorator for caching function results (sync version for ORM operations).
+    
+    Concurrent misses for the same key are coalesced into a single call.
+    """
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key
-            key_parts = [key_prefix or func.__name__]
-            for arg in args:
-                if isinstance(arg, (list, tuple, set)):
-                    key_parts.extend([str(a) for a in sorted(arg) if a is not None])
-                elif arg is not None:
-                    key_parts.append(str(arg))
-            
-            for k, v in sorted(kwargs.items()):
-                if isinstance(v, (list, tuple, set)):
-                    key_parts.append(f"{k}={','.join(str(a) for a in sorted(v) if a)}")
-                elif v is not None:
-                    key_parts.append(f"{k}={v}")
-            
-            cache_key = ":".join(key_parts)
-            
-            # Try to get from cache
-            result = cache.get_sync(cache_key)
-            if result is not None:
-                return result
-            
-            # Call original function and cache result
-            result = func(*args, **kwargs)
-            cache.set_sync(cache_key, result, ttl)
-            return result
+            cache_key = _build_cache_key(key_prefix or func.__name__, args, kwargs)
+            return cache.get_or_compute(
+                cache_key, lambda: func(*args, **kwargs), ttl, tags
+            )
         return wrapper
     return decorator
 
 
-def async_cached(ttl: Optional[int] = None, key_prefix: Optional[str] = None):
-    """Decorator for caching async function results."""
+def async_cached(
+    ttl: Optional[int] = None,
+    key_prefix: Optional[str] = None,
+    tags: tuple[str, ...] = ()
+):
+    """Decorator for caching async function results.
+    
+    Concurrent misses for the same key are coalesced into a single call.
+    """
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Generate cache key
-            key_parts = [key_prefix or func.__name__]
-            for arg in args:
-                if isinstance(arg, (list, tuple, set)):
-                    key_parts.extend([str(a) for a in sorted(arg) if a is not None])
-                elif arg is not None:
-                    key_parts.append(str(arg))
-            
-            for k, v in sorted(kwargs.items()):
-                if isinstance(v, (list, tuple, set)):
-                    key_parts.append(f"{k}={','.join(str(a) for a in sorted(v) if a)}")
-                elif v is not None:
-                    key_parts.append(f"{k}={v}")
-            
-            cache_key = ":".join(key_parts)
-            
-            # Try to get from cache
-            result = await cache.get(cache_key)
-            if result is not None:
-                return result
-            
-            # Call original function and cache result
-            result = await func(*args, **kwargs)
-            await cache.set(cache_key, result, ttl)
-            return result
+            cache_key = _build_cache_key(key_prefix or func.__name__, args, kwargs)
+            return await cache.aget_or_compute(
+                cache_key, lambda: func(*args, **kwargs), ttl, tags
+            )
         return wrapper
     return decorator
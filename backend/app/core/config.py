@@ -27,6 +27,8 @@ class Settings(BaseSettings):
     # Turso (SQLite) Database for content
     TURSO_DATABASE_URL: str = ""
     TURSO_AUTHTOKEN: str = ""
+    SEARCH_FTS_ENABLED: bool = True  # FTS5 full-text search; falls back to LIKE if unavailable
+    COUNTERS_RECONCILE_INTERVAL: int = 3600  # Seconds between counter drift checks (0 disables)
     
     # PostgreSQL Database for users
     PG_DB_HOST: str = "localhost"
@@ -41,6 +43,33 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: Optional[str] = None
     R2_BUCKET_NAME: str = "mcuredefined"
     R2_PUBLIC_URL: Optional[str] = None
+    # Threads in the shared pool that uploads post images to R2
+    R2_UPLOAD_CONCURRENCY: int = 6
+    # Largest file the multipart upload endpoints accept, in bytes
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    # Seconds an image sent to an upload endpoint is kept without being used (0 keeps it)
+    UPLOAD_UNUSED_TTL: int = 86400
+    # Re-encode uploaded JPEG/PNG/WebP images as WebP (needs Pillow)
+    IMAGE_OPTIMIZE_ENABLED: bool = True
+    # Longest side of a stored image, in pixels
+    IMAGE_MAX_DIMENSION: int = 2048
+    # Narrower copies stored for srcset, in pixels wide
+    IMAGE_VARIANT_WIDTHS: list[int] = [480, 960, 1440]
+    IMAGE_WEBP_QUALITY: int = 80
+    # Worker processes that decode and encode images
+    IMAGE_PROCESS_WORKERS: int = 2
+    
+    # In-process cache
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Approximate budget for cached values
+    CACHE_SHARDS: int = 16  # Lock-striped partitions; limits are split evenly
+    CACHE_SWEEP_INTERVAL: int = 30  # Seconds between expired-entry sweeps
+    CACHE_SHARED_ENABLED: bool = True  # Share cached values between workers on this host
+    CACHE_SHARED_PATH: str = ""  # SQLite file for the shared tier (defaults to a private dir under the temp dir)
+    CACHE_SHARED_MAX_ENTRIES: int = 50000
+    CACHE_SHARED_SYNC_INTERVAL: float = 1.0  # Seconds between invalidation polls
+    CACHE_WARMUP_ENABLED: bool = True  # Preload hot keys before accepting traffic
+    CACHE_WARMUP_TIMEOUT: float = 10.0  # Seconds startup waits for warm-up
     
     # CORS
     CORS_ORIGINS: list[str] = ["*"]
@@ -1,13 +1,16 @@
-"""FastAPI dependencies for authentication and authorization."""
+"""FastAPI dependencies for authentication, authorization and uploads."""
 
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, Request, status, Header
+from starlette.datastructures import UploadFile
+from starlette.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
-from typing import Optional, Any
+from typing import AsyncIterator, Optional, Any
 
+from .config import settings
 from .database import get_user_db
 from .logging import get_logger
 
@@ -84,7 +87,7 @@ async def get_current_admin(
         
         logger.debug(f"Admin authentication successful for user {session.user_id}")
         return True
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -136,6 +139,48 @@ async def get_optional_user(
             "email": user.email,
             "role": user.role
         }
-        
+    
     except Exception:
         return None
+
+
+async def get_upload_file(request: Request) -> AsyncIterator[UploadFile]:
+    """
+    Parse a multipart/form-data upload and yield its ``file`` field.
+    
+    Declared as a dependency instead of a ``File()`` parameter so the
+    size cap applies before the body is read. The parser spools the whole
+    file to a temporary file, which is hashed and uploaded afterwards, so
+    the body is counted as it arrives too: a chunked request without a
+    Content-Length is cut off at the cap instead of filling the disk.
+    """
+    # Leave room for the multipart boundaries and form fields
+    limit = settings.UPLOAD_MAX_BYTES + 64 * 1024
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File is larger than {settings.UPLOAD_MAX_BYTES} bytes"
+    )
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise too_large
+    
+    received = 0
+    
+    async def receive() -> Message:
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise too_large
+        return message
+    
+    async with Request(request.scope, receive).form(max_files=1) as form:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A multipart 'file' field is required"
+            )
+        yield file
@@ -0,0 +1,127 @@
+"""SQLite FTS5 full-text indexes for the content database."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+from sqlalchemy import column, literal_column, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.expression import TableClause
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Content table -> columns indexed in its "<table>_fts" virtual table
+FULLTEXT_INDEXES: dict[str, tuple[str, ...]] = {
+    "blog_posts": ("title", "description"),
+    "reviews": ("title", "description"),
+    "timeline": ("name",),
+}
+
+# Set once ensure_fulltext_indexes succeeds; searches fall back to LIKE until then
+_available = False
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _ddl(content_table: str, columns: tuple[str, ...]) -> list[str]:
+    """Statements creating an external-content FTS5 table and its sync triggers."""
+    fts = f"{content_table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{content_table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {content_table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {content_table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {content_table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def ensure_fulltext_indexes(engine: Engine) -> bool:
+    """Create any missing FTS5 tables and triggers, building new indexes from existing rows.
+    
+    Returns whether full-text search is available. Failures (e.g. an
+    SQLite build without FTS5) are logged and leave searches on LIKE.
+    """
+    global _available
+    if not settings.SEARCH_FTS_ENABLED:
+        return False
+    
+    try:
+        with engine.begin() as conn:
+            existing = {
+                row[0] for row in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+            }
+            for content_table, columns in FULLTEXT_INDEXES.items():
+                for statement in _ddl(content_table, columns):
+                    conn.execute(text(statement))
+                fts = f"{content_table}_fts"
+                if fts not in existing:
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+                    logger.info(f"Built full-text index {fts}", **{"fts.table": fts})
+    except OperationalError as e:
+        logger.warning(f"Full-text search unavailable, using LIKE search: {e}")
+        _available = False
+        return False
+    
+    _available = True
+    return True
+
+
+def rebuild_fulltext_indexes(engine: Engine) -> None:
+    """Recreate every full-text index from its content table."""
+    with engine.begin() as conn:
+        for content_table in FULLTEXT_INDEXES:
+            fts = f"{content_table}_fts"
+            conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+            conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('optimize')"))
+
+
+def fulltext_table(content_table: str) -> Optional[TableClause]:
+    """Get the FTS table for a content table, or None if FTS is unavailable.
+    
+    Join it with ``fts.c.rowid == model.id``.
+    """
+    if not _available or content_table not in FULLTEXT_INDEXES:
+        return None
+    return table(f"{content_table}_fts", column("rowid"), column("rank"))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """Turn user input into an FTS5 query: every word must match as a prefix.
+    
+    Words are quoted, so FTS5 syntax in the input (AND, NEAR, column
+    filters, quotes) is treated as plain text. Returns None if the input
+    has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def match_clause(fts_table: TableClause, expression: str) -> Any:
+    """``<fts> MATCH :expression`` for use in a WHERE clause."""
+    return literal_column(fts_table.name).op("MATCH")(expression)
+
+
+def rank(fts_table: TableClause) -> Any:
+    """BM25 relevance of the current match; lower is more relevant.
+    
+    Uses FTS5's hidden ``rank`` column (bm25 by default), which unlike a
+    direct ``bm25()`` call still works alongside window functions.
+    """
+    return fts_table.c.rank
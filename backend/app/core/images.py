@@ -0,0 +1,200 @@
+"""Upload-time image optimization.
+
+Re-encodes uploaded images before they are stored: EXIF orientation is
+applied and all metadata dropped, the longest side is capped, the result
+is transcoded to WebP, narrower width variants are produced for
+``srcset``, and a tiny blurred WebP is inlined as an LQIP placeholder.
+Decoding and encoding are CPU-bound and hold the GIL, so they run in a
+process pool rather than on the DB executor or the upload threads.
+
+Pillow is optional: without it images are stored as uploaded.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, BinaryIO, Optional, Sequence
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Types that get re-encoded. GIFs, and animated PNG and WebP files (see
+# should_optimize), are left alone so animations survive.
+OPTIMIZED_MIME_TYPES = ("image/jpeg", "image/jpg", "image/png", "image/webp")
+
+OUTPUT_MIME_TYPE = "image/webp"
+
+# Width of the inlined placeholder, in pixels
+PLACEHOLDER_WIDTH = 16
+
+# Keys an optimized image dict carries besides 'link' and 'key'
+DETAIL_FIELDS = ("width", "height", "placeholder", "variants")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = Lock()
+
+
+@dataclass
+class OptimizedImage:
+    """An image re-encoded as WebP, with its narrower variants and placeholder."""
+    
+    data: bytes
+    width: int
+    height: int
+    placeholder: str  # data: URI
+    variants: dict[int, bytes] = field(default_factory=dict)  # width -> WebP bytes
+
+
+def should_optimize(mime_type: str, fileobj: Optional[BinaryIO] = None) -> bool:
+    """
+    Whether an upload of this type goes through the optimization pipeline.
+    
+    Given the upload itself, animated images are left out too, since
+    re-encoding would keep only their first frame.
+    """
+    if not (PIL_AVAILABLE and settings.IMAGE_OPTIMIZE_ENABLED and mime_type in OPTIMIZED_MIME_TYPES):
+        return False
+    return fileobj is None or not is_animated(fileobj)
+
+
+def is_animated(fileobj: BinaryIO) -> bool:
+    """Whether an image has more than one frame, leaving ``fileobj`` rewound.
+    
+    Only the image's header is parsed, so this is cheap enough to run
+    outside the process pool.
+    """
+    try:
+        with Image.open(fileobj) as image:
+            return bool(getattr(image, "is_animated", False))
+    except (OSError, Image.DecompressionBombError):
+        # Unreadable images are rejected by optimize_image
+        return False
+    finally:
+        fileobj.seek(0)
+
+
+def image_details(image_data: dict[str, Any]) -> dict[str, Any]:
+    """The optimization details set in an image dict, to carry over with its link and key."""
+    return {name: image_data[name] for name in DETAIL_FIELDS if image_data.get(name)}
+
+
+def _encode(image: "Image.Image", quality: int) -> bytes:
+    buffer = io.BytesIO()
+    # No exif/icc_profile arguments, so no metadata is written
+    image.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def optimize_image(
+    data: bytes,
+    max_dimension: int,
+    variant_widths: Sequence[int],
+    quality: int
+) -> OptimizedImage:
+    """
+    Re-encode an image as WebP. Runs in a worker process.
+    
+    Args:
+        data: Uploaded image bytes
+        max_dimension: Cap for the longest side of the main image
+        variant_widths: Widths to produce narrower copies at (wider ones are skipped)
+        quality: WebP quality, 1-100
+    
+    Returns:
+        The optimized image
+    
+    Raises:
+        ValueError: If the data isn't a readable image
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            source.load()
+            image = ImageOps.exif_transpose(source)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Invalid image data: {e}")
+    
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    
+    variants = {}
+    for width in sorted(set(variant_widths)):
+        if width >= image.width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        variants[width] = _encode(image.resize((width, height), Image.Resampling.LANCZOS), quality)
+    
+    placeholder_height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, placeholder_height), Image.Resampling.BILINEAR)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    placeholder = f"data:{OUTPUT_MIME_TYPE};base64,{base64.b64encode(_encode(tiny, 30)).decode()}"
+    
+    return OptimizedImage(
+        data=_encode(image, quality),
+        width=image.width,
+        height=image.height,
+        placeholder=placeholder,
+        variants=variants
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn rather than fork: the parent runs many threads
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.IMAGE_PROCESS_WORKERS),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def optimize(data: bytes) -> OptimizedImage:
+    """
+    Optimize an image in the process pool, blocking until it is done.
+    
+    Raises:
+        ValueError: If the data isn't a readable image
+    """
+    future = _get_pool().submit(
+        optimize_image,
+        data,
+        settings.IMAGE_MAX_DIMENSION,
+        settings.IMAGE_VARIANT_WIDTHS,
+        settings.IMAGE_WEBP_QUALITY
+    )
+    result = future.result()
+    logger.debug(
+        "Image optimized",
+        **{
+            "image.original_bytes": len(data),
+            "image.optimized_bytes": len(result.data),
+            "image.width": result.width,
+            "image.height": result.height,
+            "image.variants": sorted(result.variants),
+        }
+    )
+    return result
+
+
+def shutdown_image_pool() -> None:
+    """Shutdown the image processing pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
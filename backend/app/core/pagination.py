@@ -0,0 +1,36 @@
+"""Opaque cursors for keyset pagination."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple[Any, ...]:
+    """Decode a cursor made by ``encode_cursor``, checking it holds ``types`` in order.
+    
+    Raises:
+        ValueError: If the cursor is malformed or was made for another sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        # bool is an int subclass, but never a valid key
+        or any(type(value) is not expected for value, expected in zip(values, types))
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
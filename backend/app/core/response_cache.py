@@ -0,0 +1,136 @@
+"""Cache of fully encoded JSON responses for read endpoints."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from .cache import cache
+
+# Matches the GZipMiddleware minimum size in main.py
+GZIP_MIN_SIZE = 1000
+GZIP_LEVEL = 6
+
+
+class EncodedResponse(NamedTuple):
+    """A response body ready to write, with its gzip variant and strong ETag."""
+    
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+    
+    @property
+    def gzip_etag(self) -> str:
+        """ETag of the gzip representation (strong ETags differ per encoding)."""
+        return f'{self.etag[:-1]}-gzip"'
+
+
+def encode_json(
+    payload: Any,
+    model: Optional[type[BaseModel]] = None,
+    exclude: Any = None
+) -> EncodedResponse:
+    """Encode a payload the way FastAPI would, precompressing large bodies.
+    
+    With ``model`` set the payload is validated and dumped through it, as
+    the route's ``response_model`` would have been, leaving out the
+    ``exclude`` fields (in pydantic's ``model_dump`` format).
+    """
+    if model is not None:
+        payload = model.model_validate(payload).model_dump(mode="json", exclude=exclude)
+    
+    body = json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=str
+    ).encode("utf-8")
+    gzip_body = gzip.compress(body, GZIP_LEVEL) if len(body) >= GZIP_MIN_SIZE else None
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return EncodedResponse(body, gzip_body, etag)
+
+
+def _etag_matches(if_none_match: str, encoded: EncodedResponse) -> bool:
+    """Check an If-None-Match header against both representations."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return encoded.etag in candidates or encoded.gzip_etag in candidates
+
+
+def to_response(request: Request, encoded: EncodedResponse) -> Response:
+    """Build a response for a request, answering 304 or the precompressed body."""
+    use_gzip = (
+        encoded.gzip_body is not None
+        and "gzip" in request.headers.get("accept-encoding", "")
+    )
+    headers = {
+        "ETag": encoded.gzip_etag if use_gzip else encoded.etag,
+        "Vary": "Accept-Encoding",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, encoded):
+        return Response(status_code=304, headers=headers)
+    
+    if use_gzip:
+        # GZipMiddleware passes responses that already have Content-Encoding through
+        headers["Content-Encoding"] = "gzip"
+        return Response(encoded.gzip_body, media_type="application/json", headers=headers)
+    return Response(encoded.body, media_type="application/json", headers=headers)
+
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    producer: Callable[[], Awaitable[Any]],
+    ttl: int,
+    tags: tuple[str, ...] = (),
+    model: Optional[type[BaseModel]] = None,
+    exclude: Any = None,
+    payload_tags: Optional[Callable[[Any], tuple[str, ...]]] = None
+) -> Optional[Response]:
+    """Serve a GET endpoint from pre-encoded bytes, producing them on a miss.
+    
+    ``producer`` builds the payload; if it returns None nothing is cached
+    and None is returned so the route can raise its 404. Entries are stored
+    in the shared cache under ``tags``, so the writes that invalidate a
+    content type's service keys invalidate its responses too, plus any
+    tags ``payload_tags`` derives from the payload.
+    """
+    extra_tags: tuple[str, ...] = ()
+    
+    async def _load() -> Optional[EncodedResponse]:
+        nonlocal extra_tags
+        payload = await producer()
+        if payload is None:
+            return None
+        if payload_tags is not None:
+            extra_tags = payload_tags(payload)
+        return encode_json(payload, model, exclude)
+    
+    encoded = await cache.aget_or_compute(
+        key,
+        _load,
+        ttl=ttl,
+        tags=tags,
+        value_tags=(lambda _: extra_tags) if payload_tags is not None else None
+    )
+    if encoded is None:
+        return None
+    return to_response(request, encoded)
+
+
+def response_key(prefix: str, route: str, *params: Any) -> str:
+    """Build a response cache key, e.g. ``blog_response:list:[1,5]``.
+    
+    Params are JSON-encoded so values containing ':' cannot collide.
+    """
+    return f"{prefix}_response:{route}:{json.dumps(params, separators=(',', ':'))}"
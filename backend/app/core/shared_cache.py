@@ -0,0 +1,281 @@
+"""Host-local shared cache tier backed by a SQLite file."""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedCacheTier(ABC):
+    """Interface for a cache tier shared by every worker process on a host.
+    
+    The in-process ``Cache`` uses an implementation of this as its L2: values
+    missing from the local dict are looked up here before hitting the
+    database, and every delete/invalidation is recorded so the other workers
+    can apply it to their own L1 via ``poll_invalidations``.
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[tuple[Any, float, tuple[str, ...]]]:
+        """Return (value, remaining TTL in seconds, tags) or None on a miss."""
+    
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: tuple[str, ...] = (),
+        loaded_at: Optional[float] = None
+    ) -> None:
+        """Store a value.
+        
+        ``loaded_at`` is the wall time up to which the value is known to
+        reflect every invalidation: entries under a tag invalidated at or
+        after it are treated as stale.
+        """
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a key and broadcast the deletion."""
+    
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Delete keys by prefix and broadcast the deletion."""
+    
+    @abstractmethod
+    def invalidate_tags(self, tags: tuple[str, ...]) -> None:
+        """Invalidate entries under the given tags and broadcast it."""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry and broadcast the clear."""
+    
+    @abstractmethod
+    def poll_invalidations(self) -> Optional[tuple[float, list[tuple[str, str]]]]:
+        """Return (kind, target) events broadcast by other workers since the last poll.
+        
+        Returns:
+            Tuple of (wall time by which every event is included, events),
+            or None if the tier couldn't be read
+        """
+    
+    @abstractmethod
+    def sweep(self) -> None:
+        """Remove expired entries and old broadcast events."""
+
+
+class SQLiteCacheTier(SharedCacheTier):
+    """Shared cache tier stored in a local SQLite database in WAL mode.
+    
+    Runs without any external service: every worker opens the same file.
+    Values are pickled, so no other user may be able to write the file.
+    Tag invalidation records the time each tag was last invalidated, and an
+    entry is stale when it was loaded before that, so invalidating a tag is
+    a single-row write however many keys it covers.
+    Deletes and invalidations are appended to an ``invalidations`` log that
+    each worker polls, skipping its own events.
+    """
+    
+    # How long broadcast events are kept for workers that poll late
+    EVENT_RETENTION_SECONDS = 600
+    
+    def __init__(self, path: str, max_entries: int = 50_000, timeout: float = 2.0):
+        self._path = path
+        self._max_entries = max_entries
+        self._timeout = timeout
+        self._origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._last_event_id = 0
+        
+        conn = self._connect()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                loaded_at REAL NOT NULL,
+                tags TEXT NOT NULL DEFAULT '[]'
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at);
+            CREATE TABLE IF NOT EXISTS tag_invalidations (
+                tag TEXT PRIMARY KEY,
+                invalidated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS invalidations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                target TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            """
+        )
+        # Only events broadcast after this worker started are relevant
+        row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()
+        self._last_event_id = row[0]
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=self._timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _broadcast(self, conn: sqlite3.Connection, kind: str, target: str) -> None:
+        conn.execute(
+            "INSERT INTO invalidations (kind, target, origin, created_at) VALUES (?, ?, ?, ?)",
+            (kind, target, self._origin, time.time())
+        )
+    
+    def get(self, key: str) -> Optional[tuple[Any, float, tuple[str, ...]]]:
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires_at, loaded_at, tags FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            value, expires_at, loaded_at, tags_json = row
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return None
+            
+            tags = tuple(json.loads(tags_json))
+            if tags:
+                placeholders = ",".join("?" * len(tags))
+                invalidated = conn.execute(
+                    f"SELECT 1 FROM tag_invalidations WHERE tag IN ({placeholders}) "
+                    "AND invalidated_at >= ? LIMIT 1",
+                    (*tags, loaded_at)
+                ).fetchone()
+                if invalidated:
+                    return None
+            
+            return pickle.loads(value), remaining, tags
+        except (sqlite3.Error, pickle.UnpicklingError) as e:
+            logger.warning(f"Shared cache read failed for '{key}': {e}", **{"cache.key": key})
+            return None
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: tuple[str, ...] = (),
+        loaded_at: Optional[float] = None
+    ) -> None:
+        now = time.time()
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, loaded_at, tags) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, now + ttl, loaded_at or now, json.dumps(list(tags)))
+                )
+        except (sqlite3.Error, pickle.PicklingError, TypeError) as e:
+            logger.warning(f"Shared cache write failed for '{key}': {e}", **{"cache.key": key})
+    
+    def delete(self, key: str) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._broadcast(conn, "key", key)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache delete failed for '{key}': {e}", **{"cache.key": key})
+    
+    def delete_prefix(self, prefix: str) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                    (len(prefix), prefix)
+                )
+                self._broadcast(conn, "prefix", prefix)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache prefix delete failed for '{prefix}': {e}")
+    
+    def invalidate_tags(self, tags: tuple[str, ...]) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                # Stamp under the write lock (see poll_invalidations)
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                for tag in tags:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO tag_invalidations (tag, invalidated_at) VALUES (?, ?)",
+                        (tag, now)
+                    )
+                    self._broadcast(conn, "tag", tag)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache tag invalidation failed for {tags}: {e}")
+    
+    def clear(self) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+                self._broadcast(conn, "clear", "")
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache clear failed: {e}")
+    
+    def poll_invalidations(self) -> Optional[tuple[float, list[tuple[str, str]]]]:
+        try:
+            conn = self._connect()
+            with conn:
+                # Read under the write lock: events stamped before polled_at
+                # have committed, and later ones are stamped after it
+                conn.execute("BEGIN IMMEDIATE")
+                polled_at = time.time()
+                rows = conn.execute(
+                    "SELECT id, kind, target, origin FROM invalidations WHERE id > ? ORDER BY id",
+                    (self._last_event_id,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache invalidation poll failed: {e}")
+            return None
+        
+        if rows:
+            self._last_event_id = rows[-1][0]
+        return polled_at, [(kind, target) for _, kind, target, origin in rows if origin != self._origin]
+    
+    def sweep(self) -> None:
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM invalidations WHERE created_at < ?",
+                    (now - self.EVENT_RETENTION_SECONDS,)
+                )
+                # Keep the file bounded: drop the entries closest to expiry
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self._max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache sweep failed: {e}")
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import io
-import uuid
-from typing import Optional, Any, TYPE_CHECKING
+import re
+import secrets
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Optional, Any, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mypy_boto3_s3 import S3Client
@@ -18,14 +24,85 @@ except ImportError:
     BOTO3_AVAILABLE = False
     ClientError = Exception  # type: ignore
 
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..models.content import ImageHandle, StoredImage
+from . import images
+from .async_utils import run_sync
 from .config import settings
+from .database import content_engine
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
 
+# Name of a content-addressed object: SHA-256 hex digest plus extension
+_CONTENT_KEY = re.compile(r"/[0-9a-f]{64}\.[a-z]+$")
+
+# Image types the multipart upload endpoints accept
+UPLOAD_MIME_TYPES = ("image/jpeg", "image/png", "image/gif", "image/webp")
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an uploaded file is over the configured size cap."""
+
+
+def is_content_addressed(key: str) -> bool:
+    """Whether a key was named after its content (and so is refcounted)."""
+    return bool(_CONTENT_KEY.search(key))
+
+
+def variant_key(key: str, width: int) -> str:
+    """Key of the ``width`` pixel wide variant stored next to an optimized image."""
+    return f"{key.rsplit('.', 1)[0]}-{width}w.webp"
+
+
+def _hash_file(fileobj: BinaryIO, max_bytes: int) -> tuple[str, int, BinaryIO]:
+    """
+    SHA-256 a file in chunks, enforcing a size cap.
+    
+    Seekable files (like the spooled files of multipart uploads) are
+    rewound and returned as-is; anything else is copied to a spooled
+    temporary file on the way so it can still be uploaded afterwards.
+    
+    Returns:
+        Tuple of (hex digest, size in bytes, file positioned at the start)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    seekable = fileobj.seekable() if hasattr(fileobj, "seekable") else False
+    copy: Any = None if seekable else tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(f"File is larger than {max_bytes} bytes")
+        digest.update(chunk)
+        if copy is not None:
+            copy.write(chunk)
+    
+    body = fileobj if copy is None else copy
+    body.seek(0)
+    return digest.hexdigest(), size, body
+
+
 class R2Storage:
-    """Cloudflare R2 storage client."""
+    """Cloudflare R2 storage client.
+    
+    Images are stored under their content hash (``{folder}/{sha256}.{ext}``)
+    and tracked in the ``stored_images`` table of the content database. An
+    upload whose key is already indexed just takes another reference, with
+    no transfer to R2, and ``delete_image`` drops a reference, removing the
+    object only when nothing refers to it any more. Keys from before content
+    addressing (``{folder}/{uuid}.{ext}``) aren't indexed and are deleted
+    directly, as before.
+    
+    Static JPEG, PNG and WebP uploads are optimized (see ``core.images``) when
+    Pillow is installed: the object is the WebP re-encoding, still named
+    after the hash of the uploaded bytes, and its width variants are stored
+    as ``{folder}/{sha256}-{width}w.webp`` and deleted along with it.
+    """
     
     MIME_TO_EXT: dict[str, str] = {
         'image/jpeg': 'jpg',
@@ -59,16 +136,172 @@ class R2Storage:
             )
         return self._client
     
-    def upload_base64_image(self, base64_string: str, folder: str = "blog-images") -> dict[str, str]:
+    @staticmethod
+    def _acquire(key: str, size: int, temporary: bool = False) -> tuple[int, bool, Optional[dict[str, Any]]]:
+        """
+        Take a reference to ``key`` in the index, returning its new refcount,
+        whether the object is stored yet and its optimization info.
+        """
+        now = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+        statement = sqlite_insert(StoredImage).values(
+            key=key,
+            size=size,
+            refcount=1,
+            pending=1 if temporary else 0,
+            pending_since=now if temporary else None,
+            created_at=now
+        )
+        set_: dict[str, Any] = {"refcount": StoredImage.refcount + 1}
+        if temporary:
+            set_.update(pending=StoredImage.pending + 1, pending_since=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[StoredImage.key],
+            set_=set_
+        ).returning(StoredImage.refcount, StoredImage.stored, StoredImage.optimized)
+        with content_engine.begin() as connection:
+            refcount, stored, optimized = connection.execute(statement).one()
+        return int(refcount), bool(stored), optimized
+    
+    @staticmethod
+    def _release(key: str) -> tuple[Optional[int], Optional[dict[str, Any]]]:
+        """
+        Drop a reference to ``key``, returning the refcount left (None if not
+        indexed) and the key's optimization info.
+        """
+        with content_engine.begin() as connection:
+            row = connection.execute(
+                update(StoredImage)
+                .where(StoredImage.key == key)
+                .values(refcount=StoredImage.refcount - 1)
+                .returning(StoredImage.refcount, StoredImage.optimized)
+            ).one_or_none()
+            if row is None:
+                return None, None
+            if row.refcount <= 0:
+                connection.execute(delete(StoredImage).where(StoredImage.key == key))
+        return row.refcount, row.optimized
+    
+    def _describe(self, key: str, optimized: Optional[dict[str, Any]]) -> dict[str, Any]:
+        """Image dict for a stored key, with the details of its optimized version if any."""
+        result: dict[str, Any] = {"link": self.public_url(key), "key": key}
+        if optimized:
+            result.update(
+                width=optimized["width"],
+                height=optimized["height"],
+                placeholder=optimized["placeholder"],
+                variants={str(width): self.public_url(variant_key(key, width)) for width in optimized["variants"]}
+            )
+        return result
+    
+    def acquire(self, key: str) -> Optional[dict[str, Any]]:
         """
-        Upload a base64 encoded image to R2.
+        Take another reference to an already stored image, e.g. for each
+        place a post uses an image sent to an upload endpoint.
+        
+        Args:
+            key: Object key in bucket
+        
+        Returns:
+            Dict with 'link' and 'key', plus the details of its optimized
+            version if any, or None if the key isn't indexed or still being
+            uploaded (nothing was taken)
+        """
+        with content_engine.begin() as connection:
+            row = connection.execute(
+                update(StoredImage)
+                .where(StoredImage.key == key, StoredImage.stored)
+                .values(refcount=StoredImage.refcount + 1)
+                .returning(StoredImage.optimized)
+            ).one_or_none()
+        if row is None:
+            return None
+        return self._describe(key, row.optimized)
+    
+    def _put(self, key: str, body: BinaryIO, content_type: str) -> None:
+        self.client.upload_fileobj(
+            body,
+            settings.R2_BUCKET_NAME,
+            key,
+            ExtraArgs={'ContentType': content_type}
+        )
+    
+    def _store(
+        self,
+        key: str,
+        size: int,
+        body: BinaryIO,
+        content_type: str,
+        optimize: bool = False,
+        temporary: bool = False
+    ) -> dict[str, Any]:
+        """
+        Reference ``key``, uploading ``body`` only if no stored copy exists yet.
+        
+        A ``temporary`` reference is given back by
+        ``release_unused_uploads`` once it is old enough.
+        
+        With ``optimize``, a new image is re-encoded in the image process
+        pool first and its width variants are uploaded next to it.
+        Duplicates of a stored image skip that work and get the stored
+        details back. A duplicate that arrives while the first copy is still
+        being uploaded uploads the same bytes too, so it never returns a key
+        whose object might not exist.
+        """
+        refcount, stored, optimized = self._acquire(key, size, temporary)
+        if stored:
+            logger.debug("Image already stored, reusing it", **{"image.key": key, "image.size": size})
+            return self._describe(key, optimized)
+        if refcount > 1:
+            logger.debug("Image is being uploaded by another request, uploading it too", **{"image.key": key})
+        
+        uploaded: list[str] = []
+        try:
+            if optimize:
+                result = images.optimize(body.read())
+                optimized = {
+                    "width": result.width,
+                    "height": result.height,
+                    "placeholder": result.placeholder,
+                    "variants": sorted(result.variants),
+                }
+                size = len(result.data)
+                for width, data in result.variants.items():
+                    self._put(variant_key(key, width), io.BytesIO(data), images.OUTPUT_MIME_TYPE)
+                    uploaded.append(variant_key(key, width))
+                body, content_type = io.BytesIO(result.data), images.OUTPUT_MIME_TYPE
+            
+            self._put(key, body, content_type)
+            uploaded.append(key)
+            with content_engine.begin() as connection:
+                connection.execute(
+                    update(StoredImage)
+                    .where(StoredImage.key == key)
+                    .values(stored=True, size=size, optimized=optimized)
+                )
+        except Exception as e:
+            remaining, _ = self._release(key)
+            # A concurrent upload of the same bytes may still need them
+            if not remaining:
+                for variant in uploaded:
+                    self._delete_object(variant)
+            # ValueError is an unreadable image, not an R2 failure
+            if isinstance(e, ClientError) and not isinstance(e, ValueError):
+                raise Exception(f"Failed to upload image to R2: {str(e)}")
+            raise
+        
+        return self._describe(key, optimized)
+    
+    def upload_base64_image(self, base64_string: str, folder: str = "blog-images") -> dict[str, Any]:
+        """
+        Upload a base64 encoded image to R2, or reuse an identical stored one.
         
         Args:
             base64_string: Base64 encoded image data (with data URI prefix)
             folder: Folder path in bucket
-            
+        
         Returns:
-            Dict with 'link' and 'key' of uploaded image
+            Dict with 'link' and 'key' of uploaded image, plus 'width',
+            'height', 'placeholder' and 'variants' if it was optimized
         """
         if not base64_string.startswith("data:image"):
             return {"link": base64_string, "key": ""}
@@ -76,42 +309,161 @@ class R2Storage:
         # Extract base64 data and mime type
         header, base64_data = base64_string.split(",", 1)
         mime_type = header.split(":")[1].split(";")[0]
-        extension = self.MIME_TO_EXT.get(mime_type, 'jpg')
         
-        # Decode and create file object
+        # Decode and name the file after its (original) content, so a
+        # duplicate is recognised before any re-encoding
         image_binary = base64.b64decode(base64_data)
-        image_file = io.BytesIO(image_binary)
+        optimize = images.should_optimize(mime_type, io.BytesIO(image_binary))
+        extension = "webp" if optimize else self.MIME_TO_EXT.get(mime_type, 'jpg')
+        filename = f"{folder}/{hashlib.sha256(image_binary).hexdigest()}.{extension}"
         
-        # Generate unique filename
-        filename = f"{folder}/{uuid.uuid4()}.{extension}"
+        return self._store(filename, len(image_binary), io.BytesIO(image_binary), mime_type, optimize)
+    
+    def public_url(self, key: str) -> str:
+        """Public URL of an object in the bucket."""
+        return f"{settings.R2_PUBLIC_URL}/{key}"
+    
+    def upload_file(
+        self,
+        fileobj: BinaryIO,
+        content_type: str,
+        folder: str = "blog-images",
+        max_bytes: Optional[int] = None,
+        temporary: bool = False
+    ) -> dict[str, Any]:
+        """
+        Stream an uploaded image file to R2 in chunks, or reuse an identical
+        stored one.
         
-        try:
-            self.client.upload_fileobj(
-                image_file,
-                settings.R2_BUCKET_NAME,
-                filename,
-                ExtraArgs={'ContentType': mime_type}
-            )
-            
-            public_url = f"{settings.R2_PUBLIC_URL}/{filename}"
-            return {"link": public_url, "key": filename}
-            
-        except ClientError as e:
-            raise Exception(f"Failed to upload image to R2: {str(e)}")
+        The file is hashed in a first pass, which also enforces the size
+        cap before anything is sent to R2.
+        
+        Args:
+            fileobj: Readable binary file, e.g. ``UploadFile.file``
+            content_type: MIME type of the image
+            folder: Folder path in bucket
+            max_bytes: Size cap, defaulting to ``UPLOAD_MAX_BYTES``
+            temporary: Hold the upload's reference only for
+                       ``UPLOAD_UNUSED_TTL``; whatever uses the key takes
+                       its own with ``acquire``
+        
+        Returns:
+            Dict with 'link' and 'key' of uploaded image, plus 'width',
+            'height', 'placeholder' and 'variants' if it was optimized
+        
+        Raises:
+            ValueError: If the content type is not an accepted image type,
+                        or the file isn't a readable image
+            UploadTooLarge: If the file is over the size cap
+        """
+        if content_type not in UPLOAD_MIME_TYPES:
+            raise ValueError("Unsupported image format. Allowed: JPEG, PNG, GIF, WebP")
+        
+        digest, size, body = _hash_file(fileobj, max_bytes or settings.UPLOAD_MAX_BYTES)
+        optimize = images.should_optimize(content_type, body)
+        extension = "webp" if optimize else self.MIME_TO_EXT[content_type]
+        filename = f"{folder}/{digest}.{extension}"
+        
+        return self._store(filename, size, body, content_type, optimize, temporary)
     
     def delete_image(self, key: str) -> bool:
         """
-        Delete an image from R2.
+        Drop a reference to an image, deleting it from R2 once unused.
         
         Args:
             key: Object key in bucket
-            
+        
         Returns:
             True if successful
         """
         if not key:
             return False
-            
+        
+        try:
+            remaining, optimized = self._release(key)
+        except Exception as e:
+            # Without the refcount, keeping the object is the safe choice
+            logger.error(
+                f"Failed to release image reference: {str(e)}",
+                **{"image.key": key, "error.type": type(e).__name__}
+            )
+            return False
+        
+        if remaining is not None and remaining > 0:
+            logger.debug("Image still referenced, keeping it", **{"image.key": key, "image.refcount": remaining})
+            return True
+        
+        return self._delete_stored(key, optimized)
+    
+    def issue_handle(self, key: str) -> str:
+        """
+        Create an unguessable handle for a reference to ``key``, for clients
+        that may delete their own upload with ``release_handle``.
+        """
+        handle = secrets.token_urlsafe(32)
+        with content_engine.begin() as connection:
+            connection.execute(
+                sqlite_insert(ImageHandle).values(
+                    handle=handle,
+                    key=key,
+                    created_at=datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+                )
+            )
+        return handle
+    
+    def release_handle(self, handle: str) -> bool:
+        """
+        Drop the reference a handle stands for. Each handle works once.
+        
+        Returns:
+            True if successful, False if the handle is unknown
+        """
+        with content_engine.begin() as connection:
+            key = connection.execute(
+                delete(ImageHandle)
+                .where(ImageHandle.handle == handle)
+                .returning(ImageHandle.key)
+            ).scalar_one_or_none()
+        if key is None:
+            return False
+        return self.delete_image(key)
+    
+    def _delete_stored(self, key: str, optimized: Optional[dict[str, Any]]) -> bool:
+        """Delete an object and the variants of its optimized version."""
+        for width in (optimized or {}).get("variants", []):
+            self._delete_object(variant_key(key, width))
+        return self._delete_object(key)
+    
+    def release_unused_uploads(self, max_age: float) -> int:
+        """
+        Give back the temporary references of uploads older than ``max_age``
+        seconds, deleting the images nothing else took a reference to.
+        
+        Returns:
+            Number of images deleted
+        """
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).strftime("%Y/%m/%d %H:%M:%S")
+        with content_engine.begin() as connection:
+            rows = connection.execute(
+                update(StoredImage)
+                .where(StoredImage.pending > 0, StoredImage.pending_since < cutoff)
+                .values(refcount=StoredImage.refcount - StoredImage.pending, pending=0)
+                .returning(StoredImage.key, StoredImage.refcount, StoredImage.optimized)
+            ).all()
+            unused = [row for row in rows if row.refcount <= 0]
+            if unused:
+                connection.execute(delete(StoredImage).where(StoredImage.key.in_([row.key for row in unused])))
+        
+        for row in unused:
+            self._delete_stored(row.key, row.optimized)
+        if rows:
+            logger.info(
+                f"Released {len(rows)} upload holds, deleted {len(unused)} unused images",
+                **{"upload.released": len(rows), "upload.deleted": len(unused)}
+            )
+        return len(unused)
+    
+    def _delete_object(self, key: str) -> bool:
         try:
             self.client.delete_object(
                 Bucket=settings.R2_BUCKET_NAME,
@@ -125,8 +477,68 @@ class R2Storage:
 # Global storage instance
 storage = R2Storage()
 
+# Bounded pool for image uploads, kept apart from the DB executor so a
+# post full of images can't starve database work
+_upload_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.R2_UPLOAD_CONCURRENCY),
+    thread_name_prefix="r2_upload_"
+)
+
+
+def upload_concurrently(uploads: Sequence[Callable[[], dict[str, Any]]]) -> list[dict[str, Any]]:
+    """
+    Run upload callables on the upload pool and return their results in order.
+    
+    Waits for every upload to finish. If any of them failed, the images that
+    did upload are deleted again so nothing is left orphaned in the bucket,
+    and the first error is raised.
+    
+    Args:
+        uploads: Callables each uploading one image and returning its
+                 'link'/'key' dict
+    
+    Returns:
+        Upload results in the same order as ``uploads``
+    """
+    if len(uploads) <= 1:
+        return [upload() for upload in uploads]
+    
+    futures = [_upload_executor.submit(upload) for upload in uploads]
+    wait(futures)
+    
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        uploaded = [
+            future.result().get("key", "") for future in futures
+            if future.exception() is None and future.result().get("key")
+        ]
+        logger.warning(
+            f"{len(errors)} of {len(uploads)} image uploads failed, deleting {len(uploaded)} uploaded images",
+            **{"upload.failed": len(errors), "upload.rolled_back": len(uploaded)}
+        )
+        for key in uploaded:
+            storage.delete_image(key)
+        raise errors[0]  # type: ignore[misc]
+    
+    return [future.result() for future in futures]
+
 
-def process_image(image_data: Optional[dict[str, Any]], use_default_if_not_base64: bool = False) -> dict[str, str]:
+async def run_upload_collector(max_age: float, interval: float = 3600) -> None:
+    """Release unused uploads every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_sync(storage.release_unused_uploads, max_age)
+        except Exception as e:
+            logger.error(f"Releasing unused uploads failed: {e}", **{"error.type": type(e).__name__})
+
+
+def shutdown_upload_executor() -> None:
+    """Shutdown the upload thread pool, waiting for running uploads."""
+    _upload_executor.shutdown(wait=True)
+
+
+def process_image(image_data: Optional[dict[str, Any]], use_default_if_not_base64: bool = False) -> dict[str, Any]:
     """
     Process image data - upload to R2 if base64, otherwise return as-is.
     
@@ -134,7 +546,7 @@ def process_image(image_data: Optional[dict[str, Any]], use_default_if_not_base6
         image_data: Dict with 'link' key containing image URL or base64 data
         use_default_if_not_base64: If True, return default image when link is not base64
                                    (used for thumbnails that require new uploads)
-        
+    
     Returns:
         Dict with 'link' and optionally 'key'
     """
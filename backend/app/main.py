@@ -4,8 +4,9 @@ MCU Redefined API - FastAPI Application
 A modern async API for the MCU Redefined platform.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
@@ -14,6 +15,13 @@ from .core.database import ContentBase, content_engine
 from .core.logging import setup_logging, get_logger
 from .core.middleware import RequestLoggingMiddleware, RateLimitMiddleware
 from .core.async_utils import shutdown_executor
+from .core.storage import run_upload_collector, shutdown_upload_executor
+from .core.images import shutdown_image_pool
+from .core.cache import cache
+from .core.fulltext import ensure_fulltext_indexes
+from .core.dependencies import get_current_admin
+from .services.warmup import warm_up_cache
+from .services.reconcile import run_counter_reconciler
 from .routers import blogs_router, reviews_router, timeline_router, users_router, topic_images_router
 
 # Setup logging first
@@ -26,6 +34,23 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
     # Startup: Create database tables if they don't exist
     ContentBase.metadata.create_all(content_engine)
+    ensure_fulltext_indexes(content_engine)
+    cache.start_sweeper(settings.CACHE_SWEEP_INTERVAL, settings.CACHE_SHARED_SYNC_INTERVAL)
+    
+    # Totals are maintained on write; this corrects drift from out-of-band edits
+    reconciler = None
+    if settings.COUNTERS_RECONCILE_INTERVAL > 0:
+        reconciler = asyncio.create_task(run_counter_reconciler(settings.COUNTERS_RECONCILE_INTERVAL))
+    
+    # Images uploaded for posts that were never saved
+    collector = None
+    if settings.UPLOAD_UNUSED_TTL > 0:
+        collector = asyncio.create_task(run_upload_collector(settings.UPLOAD_UNUSED_TTL))
+    
+    # Preload hot keys so the first visitors after a deploy don't pay for them
+    if settings.CACHE_WARMUP_ENABLED:
+        await warm_up_cache(settings.CACHE_WARMUP_TIMEOUT)
+    
     logger.info(
         f"{settings.APP_NAME} v{settings.APP_VERSION} started",
         **{
@@ -46,8 +71,16 @@ async def lifespan(app: FastAPI):
         }
     )
     
-    # Shutdown the thread pool executor
+    if reconciler is not None:
+        reconciler.cancel()
+    if collector is not None:
+        collector.cancel()
+    cache.shutdown()
+    
+    # Shutdown the thread pool executors, then the image workers they use
     await shutdown_executor()
+    shutdown_upload_executor()
+    shutdown_image_pool()
 
 
 # Create FastAPI application
@@ -100,6 +133,15 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/admin/cache/stats")
+async def cache_stats(reset: bool = False, _: bool = Depends(get_current_admin)):
+    """Per-prefix cache hit, miss, eviction and load-latency counters (admin only)."""
+    stats = cache.stats()
+    if reset:
+        cache.reset_stats()
+    return stats
+
+
 # Legacy route compatibility - collaborate endpoint
 @app.get("/collaborate")
 async def collaborate():
@@ -1,4 +1,4 @@
-from .content import BlogPost, BlogTag, Reviews, ReviewTag, Timeline
+from .content import BlogPost, BlogTag, Reviews, ReviewTag, Timeline, ContentCounter, StoredImage
 from .user import User, Session, Account, BlogLike, ReviewLike, ProjectLike
 
 __all__ = [
@@ -7,6 +7,8 @@ __all__ = [
     "Reviews",
     "ReviewTag",
     "Timeline",
+    "ContentCounter",
+    "StoredImage",
     "User",
     "Session",
     "Account",
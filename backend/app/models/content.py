@@ -5,7 +5,7 @@ from __future__ import annotations
 import sqlalchemy as sa
 from sqlalchemy import Index, CheckConstraint, Table
 from datetime import datetime, date
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterable, TYPE_CHECKING
 
 from ..core.database import ContentBase
 
@@ -18,10 +18,12 @@ class BaseModel:
     
     __table__: Table
     
-    def to_dict(self) -> dict[str, Any]:
-        """Convert model to dictionary."""
+    def to_dict(self, exclude: Iterable[str] = ()) -> dict[str, Any]:
+        """Convert model to dictionary, leaving out the ``exclude`` columns."""
         result: dict[str, Any] = {}
         for column in self.__table__.columns:
+            if column.name in exclude:
+                continue
             try:
                 value = getattr(self, column.name)
                 if isinstance(value, (date, datetime)):
@@ -129,3 +131,61 @@ class Timeline(ContentBase, BaseModel):
         Index('idx_timeline_phase', 'phase'),
         Index('idx_timeline_name', 'name'),
     )
+
+
+class ContentCounter(ContentBase, BaseModel):
+    """Row counts maintained alongside content writes.
+    
+    One row per (scope, kind, name): the total for a content type
+    (kind 'total', empty name), or the number of items with a given tag
+    or author. Services update them in the same transaction as the write.
+    """
+    
+    __tablename__ = 'content_counters'
+    
+    scope = sa.Column(sa.String(30), primary_key=True)  # Content type, e.g. 'blog'
+    kind = sa.Column(sa.String(10), primary_key=True)  # 'total', 'tag' or 'author'
+    name = sa.Column(sa.String(255), primary_key=True, default='')
+    value = sa.Column(sa.Integer, nullable=False, default=0)
+
+
+class StoredImage(ContentBase, BaseModel):
+    """Index of content-addressed images in R2.
+    
+    Keys are ``{folder}/{sha256}.{ext}``, so an upload whose key is already
+    here and ``stored`` is a duplicate and needs no transfer; the row exists
+    before its first upload finishes, and ``stored`` is only set once the
+    object is in R2. ``refcount`` is the number of uploads that returned the
+    key minus the deletes of it; the object is only removed from R2 once
+    that reaches zero. ``pending`` counts references held by upload
+    endpoints for content that hasn't used the key yet; they are given back
+    after ``UPLOAD_UNUSED_TTL``. ``optimized`` describes the WebP
+    re-encoding of an optimized upload: its dimensions, placeholder and the
+    widths of the variants stored next to it.
+    """
+    
+    __tablename__ = 'stored_images'
+    
+    key = sa.Column(sa.String(255), primary_key=True)
+    size = sa.Column(sa.Integer, nullable=False, default=0)  # Bytes
+    refcount = sa.Column(sa.Integer, nullable=False, default=0)
+    stored = sa.Column(sa.Boolean, nullable=False, default=False)  # Set once the object is in R2
+    pending = sa.Column(sa.Integer, nullable=False, default=0)  # Temporary upload references
+    pending_since = sa.Column(sa.String(75))  # Time of the latest temporary reference
+    optimized = sa.Column(sa.JSON)  # None for images stored as uploaded
+    created_at = sa.Column(sa.String(75))
+
+
+class ImageHandle(ContentBase, BaseModel):
+    """Delete handle for one reference to a stored image.
+    
+    Anyone with an image's bytes can compute its key, so endpoints that let
+    clients delete their own uploads return a random handle instead and
+    only release the reference it stands for.
+    """
+    
+    __tablename__ = 'image_handles'
+    
+    handle = sa.Column(sa.String(64), primary_key=True)
+    key = sa.Column(sa.String(255), nullable=False)  # StoredImage key
+    created_at = sa.Column(sa.String(75))
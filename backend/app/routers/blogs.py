@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Any
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response, UploadFile
+from datetime import date
+from typing import Any, Optional
 
 from ..schemas.content import (
     BlogCreate,
@@ -12,12 +13,18 @@ from ..schemas.content import (
     BlogListResponse,
     TagsResponse,
     AuthorsResponse,
+    ImageUploadResponse,
 )
 from ..services.blog import BlogService
+from ..services.base import ContentView
+from ..services.blog_image import blog_image_service
+from ..services.search import ContentSearch
 from ..services.author import AuthorService
-from ..core.dependencies import get_current_admin
+from ..core.dependencies import get_current_admin, get_upload_file
 from ..core.logging import get_logger
 from ..core.async_utils import run_sync
+from ..core.storage import UploadTooLarge
+from ..core.response_cache import cached_json_response, response_key
 
 router = APIRouter(prefix="/blogs", tags=["blogs"])
 logger = get_logger(__name__)
@@ -25,86 +32,196 @@ logger = get_logger(__name__)
 
 @router.get("", response_model=BlogListResponse)
 async def get_blogs(
+    request: Request,
     page: int = Query(default=1, ge=1),
-    limit: int = Query(default=5, ge=1, le=50)
-) -> dict[str, Any]:
-    """Get paginated blog posts."""
-    total = await run_sync(BlogService.count)
-    blogs = await run_sync(BlogService.get_paginated, page, limit)
+    limit: int = Query(default=5, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None),
+    view: ContentView = Query(default="full")
+) -> Response:
+    """Get paginated blog posts.
+    
+    Pages by ``cursor`` when given (``page`` is then ignored), otherwise
+    by ``page``. Either way ``next_cursor`` points at the following page.
+    ``view=summary`` leaves out each item's content.
+    """
+    after = None
+    if cursor:
+        try:
+            after = BlogService.parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def _load() -> dict[str, Any]:
+        if cursor:
+            result = BlogService.get_after(after, limit, view)
+            return {"blogs": result["items"], "total": result["total"], "next_cursor": result["next_cursor"]}
+        
+        result = BlogService.get_page(page, limit, view)
+        blogs, total = result["items"], result["total"]
+        has_more = bool(blogs) and page * limit < total
+        return {
+            "blogs": blogs,
+            "total": total,
+            "next_cursor": BlogService.cursor_for(blogs[-1]) if has_more else None
+        }
     
-    return {"blogs": blogs, "total": total}
+    async def _produce() -> dict[str, Any]:
+        # One executor hop, and one statement on a miss
+        return await run_sync(_load)
+    
+    key = (
+        response_key(BlogService.cache_prefix, "after", cursor, limit, view) if cursor
+        else response_key(BlogService.cache_prefix, "list", page, limit, view)
+    )
+    return await cached_json_response(
+        request,
+        key,
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,),
+        model=BlogListResponse,
+        # Leave content out entirely rather than serializing it as null
+        exclude={"blogs": {"__all__": {"content"}}} if view == "summary" else None
+    )
 
 
 @router.get("/latest")
-async def get_latest_blogs() -> list[dict[str, Any]]:
+async def get_latest_blogs(request: Request) -> Response:
     """Get the 3 most recent blog posts."""
-    return await run_sync(BlogService.get_latest, 3)
+    async def _produce() -> list[dict[str, Any]]:
+        return await run_sync(BlogService.get_latest, 3)
+    
+    return await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "latest", 3),
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,)
+    )
 
 
 @router.get("/recent")
-async def get_recent_blog() -> dict[str, Any]:
+async def get_recent_blog(request: Request) -> Response:
     """Get the most recent blog post."""
-    result = await run_sync(BlogService.get_recent)
-    if not result:
+    async def _produce() -> Optional[dict[str, Any]]:
+        return await run_sync(BlogService.get_recent)
+    
+    response = await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "recent"),
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,)
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="No blogs found")
-    return result
+    return response
 
 
 @router.get("/search")
 async def search_blogs(
+    request: Request,
     query: str = Query(default=""),
     tags: str = Query(default=""),
     author: str = Query(default=""),
     author_id: str = Query(default=""),
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
     page: int = Query(default=1, ge=1),
-    limit: int = Query(default=5, ge=1, le=50)
-) -> dict[str, Any]:
-    """Search blog posts by query, tags, author, or author_id."""
-    tags_list = [t.strip() for t in tags.split(",") if t.strip()]
+    limit: int = Query(default=5, ge=1, le=50),
+    view: ContentView = Query(default="full")
+) -> Response:
+    """Search blog posts by any combination of query, tags, author, author_id and date range."""
+    search = (
+        ContentSearch(BlogService)
+        .text(query)
+        .tags([t.strip() for t in tags.split(",")])
+        .author(author)
+        .author_id(author_id)
+        .created_between(date_from, date_to)
+        .view(view)
+    )
     
     def _search() -> dict[str, Any]:
-        result = BlogService.search(
-            query=query.lower(),
-            tags=tags_list if tags_list else None,
-            author=author,
-            author_id=author_id,
-            page=page,
-            limit=limit
-        )
-        # BlogService.search already returns 'blogs' key
+        # Copy: the cached result is shared
+        result = dict(search.fetch_cached(page, limit))
+        result["blogs"] = result.pop("items")
         return result
     
-    return await run_sync(_search)
+    async def _produce() -> dict[str, Any]:
+        return await run_sync(_search)
+    
+    return await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "search", search.cache_key(page, limit)),
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,)
+    )
 
 
 @router.get("/tags", response_model=TagsResponse)
-async def get_all_tags() -> dict[str, list[str]]:
+async def get_all_tags(request: Request) -> Response:
     """Get all unique blog tags."""
-    tags = await run_sync(BlogService.get_all_tags)
-    return {"tags": tags}
+    async def _produce() -> dict[str, list[str]]:
+        return {"tags": await run_sync(BlogService.get_all_tags)}
+    
+    return await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "tags"),
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,),
+        model=TagsResponse
+    )
 
 
 @router.get("/authors", response_model=AuthorsResponse)
-async def get_all_authors() -> dict[str, list[str]]:
+async def get_all_authors(request: Request) -> Response:
     """Get all unique blog authors."""
-    authors = await run_sync(BlogService.get_all_authors)
-    return {"authors": authors}
+    async def _produce() -> dict[str, list[str]]:
+        return {"authors": await run_sync(BlogService.get_all_authors)}
+    
+    return await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "authors"),
+        _produce,
+        ttl=BlogService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,),
+        model=AuthorsResponse
+    )
 
 
 @router.get("/{blog_id}", response_model=BlogResponse)
-async def get_blog(blog_id: int) -> dict[str, Any]:
+async def get_blog(request: Request, blog_id: int) -> Response:
     """Get a single blog post by ID."""
-    blog = await run_sync(BlogService.get_by_id, blog_id)
+    async def _produce() -> Optional[dict[str, Any]]:
+        blog = await run_sync(BlogService.get_by_id, blog_id)
+        if not blog:
+            return None
+        
+        # Resolve author info from user database if author_id exists
+        if blog.get("author_id"):
+            author_info = await AuthorService.get_author_info(blog["author_id"])
+            # Copy rather than mutate the dict held by the service cache
+            blog = {**blog, "author_info": author_info}
+        return blog
     
-    if not blog:
+    # Author info is cached for AuthorService.CACHE_TTL, so don't outlive it
+    response = await cached_json_response(
+        request,
+        response_key(BlogService.cache_prefix, "by_id", blog_id),
+        _produce,
+        ttl=AuthorService.CACHE_TTL,
+        tags=(BlogService.cache_prefix,),
+        model=BlogResponse,
+        payload_tags=lambda blog: (
+            (AuthorService.cache_tag(blog["author_id"]),) if blog.get("author_id") else ()
+        )
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Blog not found")
-    
-    # Resolve author info from user database if author_id exists
-    if blog.get("author_id"):
-        author_info = await AuthorService.get_author_info(blog["author_id"])
-        blog["author_info"] = author_info
-    
-    return blog
+    return response
 
 
 @router.post("/create")
@@ -166,6 +283,38 @@ async def create_blog(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/images", response_model=ImageUploadResponse, status_code=201)
+async def upload_blog_image(
+    thumbnail: bool = Query(default=False),
+    _: bool = Depends(get_current_admin),
+    file: UploadFile = Depends(get_upload_file)
+) -> ImageUploadResponse:
+    """Upload a blog image as multipart/form-data. Requires admin authentication.
+    
+    The ``file`` field is spooled to a temporary file and then uploaded,
+    up to ``UPLOAD_MAX_BYTES``. Send the returned ``key`` (no ``link`` needed)
+    in an image block's content, or as the thumbnail with
+    ``thumbnail=true``, to use the image in a blog.
+    """
+    try:
+        result = await run_sync(
+            blog_image_service.upload_image_file, file.file, file.content_type or "", thumbnail
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(
+            f"Failed to upload blog image: {str(e)}",
+            exc_info=True,
+            **{"error.type": type(e).__name__, "error.message": str(e)}
+        )
+        raise HTTPException(status_code=500, detail="Failed to upload image")
+    
+    return ImageUploadResponse(**result)
+
+
 @router.put("/update/{blog_id}")
 async def update_blog(
     blog_id: int,
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Any
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response, UploadFile
+from datetime import date
+from typing import Any, Optional
 
 from ..schemas.content import (
     ReviewCreate,
@@ -12,88 +13,195 @@ from ..schemas.content import (
     ReviewListResponse,
     TagsResponse,
     AuthorsResponse,
+    ImageUploadResponse,
 )
 from ..services.review import ReviewService
+from ..services.base import ContentView
+from ..services.review_image import review_image_service
+from ..services.search import ContentSearch
 from ..services.author import AuthorService
-from ..core.dependencies import get_current_admin
+from ..core.dependencies import get_current_admin, get_upload_file
 from ..core.async_utils import run_sync
+from ..core.storage import UploadTooLarge
+from ..core.response_cache import cached_json_response, response_key
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
 @router.get("", response_model=ReviewListResponse)
 async def get_reviews(
+    request: Request,
     page: int = Query(default=1, ge=1),
-    limit: int = Query(default=5, ge=1, le=50)
-) -> dict[str, Any]:
-    """Get paginated reviews."""
-    total = await run_sync(ReviewService.count)
-    reviews = await run_sync(ReviewService.get_paginated, page, limit)
+    limit: int = Query(default=5, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None),
+    view: ContentView = Query(default="full")
+) -> Response:
+    """Get paginated reviews.
+    
+    Pages by ``cursor`` when given (``page`` is then ignored), otherwise
+    by ``page``. Either way ``next_cursor`` points at the following page.
+    ``view=summary`` leaves out each item's content.
+    """
+    after = None
+    if cursor:
+        try:
+            after = ReviewService.parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def _load() -> dict[str, Any]:
+        if cursor:
+            result = ReviewService.get_after(after, limit, view)
+            return {"blogs": result["items"], "total": result["total"], "next_cursor": result["next_cursor"]}
+        
+        result = ReviewService.get_page(page, limit, view)
+        reviews, total = result["items"], result["total"]
+        has_more = bool(reviews) and page * limit < total
+        return {
+            "blogs": reviews,
+            "total": total,
+            "next_cursor": ReviewService.cursor_for(reviews[-1]) if has_more else None
+        }
+    
+    async def _produce() -> dict[str, Any]:
+        # One executor hop, and one statement on a miss
+        return await run_sync(_load)
     
-    return {"blogs": reviews, "total": total}
+    key = (
+        response_key(ReviewService.cache_prefix, "after", cursor, limit, view) if cursor
+        else response_key(ReviewService.cache_prefix, "list", page, limit, view)
+    )
+    return await cached_json_response(
+        request,
+        key,
+        _produce,
+        ttl=ReviewService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,),
+        model=ReviewListResponse,
+        # Leave content out entirely rather than serializing it as null
+        exclude={"blogs": {"__all__": {"content"}}} if view == "summary" else None
+    )
 
 
 @router.get("/latest")
-async def get_latest_reviews() -> list[dict[str, Any]]:
+async def get_latest_reviews(request: Request) -> Response:
     """Get the 3 most recent reviews."""
-    return await run_sync(ReviewService.get_latest, 3)
+    async def _produce() -> list[dict[str, Any]]:
+        return await run_sync(ReviewService.get_latest, 3)
+    
+    return await cached_json_response(
+        request,
+        response_key(ReviewService.cache_prefix, "latest", 3),
+        _produce,
+        ttl=ReviewService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,)
+    )
 
 
 @router.get("/search")
 async def search_reviews(
+    request: Request,
     query: str = Query(default=""),
     tags: str = Query(default=""),
     author: str = Query(default=""),
     author_id: str = Query(default=""),
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
     page: int = Query(default=1, ge=1),
-    limit: int = Query(default=5, ge=1, le=50)
-) -> dict[str, Any]:
-    """Search reviews by query, tags, author, or author_id."""
-    tags_list = [t.strip() for t in tags.split(",") if t.strip()]
+    limit: int = Query(default=5, ge=1, le=50),
+    view: ContentView = Query(default="full")
+) -> Response:
+    """Search reviews by any combination of query, tags, author, author_id and date range."""
+    search = (
+        ContentSearch(ReviewService)
+        .text(query)
+        .tags([t.strip() for t in tags.split(",")])
+        .author(author)
+        .author_id(author_id)
+        .created_between(date_from, date_to)
+        .view(view)
+    )
     
     def _search() -> dict[str, Any]:
-        result = ReviewService.search(
-            query=query.lower(),
-            tags=tags_list if tags_list else None,
-            author=author,
-            author_id=author_id,
-            page=page,
-            limit=limit
-        )
-        # ReviewService.search returns 'reviews' key
+        # Copy: the cached result is shared
+        result = dict(search.fetch_cached(page, limit))
+        result["reviews"] = result.pop("items")
         return result
     
-    return await run_sync(_search)
+    async def _produce() -> dict[str, Any]:
+        return await run_sync(_search)
+    
+    return await cached_json_response(
+        request,
+        response_key(ReviewService.cache_prefix, "search", search.cache_key(page, limit)),
+        _produce,
+        ttl=ReviewService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,)
+    )
 
 
 @router.get("/tags", response_model=TagsResponse)
-async def get_all_tags() -> dict[str, list[str]]:
+async def get_all_tags(request: Request) -> Response:
     """Get all unique review tags."""
-    tags = await run_sync(ReviewService.get_all_tags)
-    return {"tags": tags}
+    async def _produce() -> dict[str, list[str]]:
+        return {"tags": await run_sync(ReviewService.get_all_tags)}
+    
+    return await cached_json_response(
+        request,
+        response_key(ReviewService.cache_prefix, "tags"),
+        _produce,
+        ttl=ReviewService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,),
+        model=TagsResponse
+    )
 
 
 @router.get("/authors", response_model=AuthorsResponse)
-async def get_all_authors() -> dict[str, list[str]]:
+async def get_all_authors(request: Request) -> Response:
     """Get all unique review authors."""
-    authors = await run_sync(ReviewService.get_all_authors)
-    return {"authors": authors}
+    async def _produce() -> dict[str, list[str]]:
+        return {"authors": await run_sync(ReviewService.get_all_authors)}
+    
+    return await cached_json_response(
+        request,
+        response_key(ReviewService.cache_prefix, "authors"),
+        _produce,
+        ttl=ReviewService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,),
+        model=AuthorsResponse
+    )
 
 
 @router.get("/{review_id}", response_model=ReviewResponse)
-async def get_review(review_id: int) -> dict[str, Any]:
+async def get_review(request: Request, review_id: int) -> Response:
     """Get a single review by ID."""
-    review = await run_sync(ReviewService.get_by_id, review_id)
+    async def _produce() -> Optional[dict[str, Any]]:
+        review = await run_sync(ReviewService.get_by_id, review_id)
+        if not review:
+            return None
+        
+        # Resolve author info from user database if author_id exists
+        if review.get("author_id"):
+            author_info = await AuthorService.get_author_info(review["author_id"])
+            # Copy rather than mutate the dict held by the service cache
+            review = {**review, "author_info": author_info}
+        return review
     
-    if not review:
+    # Author info is cached for AuthorService.CACHE_TTL, so don't outlive it
+    response = await cached_json_response(
+        request,
+        response_key(ReviewService.cache_prefix, "by_id", review_id),
+        _produce,
+        ttl=AuthorService.CACHE_TTL,
+        tags=(ReviewService.cache_prefix,),
+        model=ReviewResponse,
+        payload_tags=lambda review: (
+            (AuthorService.cache_tag(review["author_id"]),) if review.get("author_id") else ()
+        )
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Review not found")
-    
-    # Resolve author info from user database if author_id exists
-    if review.get("author_id"):
-        author_info = await AuthorService.get_author_info(review["author_id"])
-        review["author_info"] = author_info
-    
-    return review
+    return response
 
 
 @router.post("/create")
@@ -120,6 +228,33 @@ async def create_review(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/images", response_model=ImageUploadResponse, status_code=201)
+async def upload_review_image(
+    thumbnail: bool = Query(default=False),
+    _: bool = Depends(get_current_admin),
+    file: UploadFile = Depends(get_upload_file)
+) -> ImageUploadResponse:
+    """Upload a review image as multipart/form-data. Requires admin authentication.
+    
+    The ``file`` field is spooled to a temporary file and then uploaded,
+    up to ``UPLOAD_MAX_BYTES``. Send the returned ``key`` (no ``link`` needed)
+    in an image block's content, or as the thumbnail with
+    ``thumbnail=true``, to use the image in a review.
+    """
+    try:
+        result = await run_sync(
+            review_image_service.upload_image_file, file.file, file.content_type or "", thumbnail
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to upload image")
+    
+    return ImageUploadResponse(**result)
+
+
 @router.put("/update/{review_id}")
 async def update_review(
     review_id: int,
@@ -2,60 +2,99 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Any, Optional
 
 from ..services.timeline import TimelineService
 from ..core.async_utils import run_sync
+from ..core.response_cache import cached_json_response, response_key
 
 router = APIRouter(prefix="/release-slate", tags=["timeline"])
 
+# Matches the shortest TTL of the service keys each response is built from
+RESPONSE_TTL = 60
+
 
 @router.get("")
 async def get_all_projects(
+    request: Request,
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=50, ge=1, le=100),
     query: str = Query(default=""),
-    phase: Optional[int] = Query(default=None, ge=1, le=9)
-) -> dict[str, Any]:
+    phase: Optional[int] = Query(default=None, ge=1, le=9),
+    cursor: Optional[str] = Query(default=None)
+) -> Response:
     """Get MCU projects with optional pagination and filtering.
     
     By default returns all projects (limit=50) for backwards compatibility.
     Use page/limit for pagination, query for search, phase for filtering.
+    Paginated responses carry a ``next_cursor``; passing it back as
+    ``cursor`` pages by (phase, id) instead of by offset.
     """
-    # If search/filter is requested, use search method
-    if query or phase is not None:
-        def _search() -> dict[str, Any]:
-            return TimelineService.search(
-                query=query.lower() if query else "",
-                phase=phase,
-                page=page,
-                limit=limit
-            )
-        return await run_sync(_search)
+    if cursor:
+        if query or phase is not None:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with query or phase")
+        try:
+            after = TimelineService.parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        async def _produce_after() -> dict[str, Any]:
+            return await run_sync(TimelineService.get_after, after, limit)
+        
+        return await cached_json_response(
+            request,
+            response_key(TimelineService.cache_prefix, "after", cursor, limit),
+            _produce_after,
+            ttl=RESPONSE_TTL,
+            tags=(TimelineService.cache_prefix,)
+        )
     
-    # For paginated requests without filters
-    if page > 1 or limit < 50:
-        result = await run_sync(TimelineService.get_paginated, page, limit)
-        return result
+    async def _produce() -> dict[str, Any]:
+        # If search/filter is requested, use search method
+        if query or phase is not None:
+            def _search() -> dict[str, Any]:
+                return TimelineService.search(
+                    query=query.lower() if query else "",
+                    phase=phase,
+                    page=page,
+                    limit=limit
+                )
+            return await run_sync(_search)
+        
+        # For paginated requests without filters
+        if page > 1 or limit < 50:
+            result = await run_sync(TimelineService.get_paginated, page, limit)
+            return result
+        
+        # Default: return all projects (original behavior)
+        projects = await run_sync(TimelineService.get_all)
+        return {
+            "projects": projects,
+            "total": len(projects),
+            "total_pages": 1,
+            "page": 1
+        }
     
-    # Default: return all projects (original behavior)
-    projects = await run_sync(TimelineService.get_all)
-    return {
-        "projects": projects,
-        "total": len(projects),
-        "total_pages": 1,
-        "page": 1
-    }
+    return await cached_json_response(
+        request,
+        response_key(
+            TimelineService.cache_prefix, "list", page, limit, query.lower(), phase
+        ),
+        _produce,
+        ttl=RESPONSE_TTL,
+        tags=(TimelineService.cache_prefix,)
+    )
 
 
 @router.get("/search")
 async def search_projects(
+    request: Request,
     query: str = Query(default=""),
     phase: Optional[int] = Query(default=None, ge=1, le=9),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=10, ge=1, le=50)
-) -> dict[str, Any]:
+) -> Response:
     """Search MCU projects by name or filter by phase."""
     def _search() -> dict[str, Any]:
         return TimelineService.search(
@@ -64,25 +103,52 @@ async def search_projects(
             page=page,
             limit=limit
         )
-    return await run_sync(_search)
+    
+    async def _produce() -> dict[str, Any]:
+        return await run_sync(_search)
+    
+    return await cached_json_response(
+        request,
+        response_key(
+            TimelineService.cache_prefix, "search", query.lower(), phase, page, limit
+        ),
+        _produce,
+        ttl=RESPONSE_TTL,
+        tags=(TimelineService.cache_prefix,)
+    )
 
 
 @router.get("/{project_id}")
-async def get_project(project_id: int) -> dict[str, Any]:
+async def get_project(request: Request, project_id: int) -> Response:
     """Get a single project by ID."""
-    project = await run_sync(TimelineService.get_by_id, project_id)
+    async def _produce() -> Optional[dict[str, Any]]:
+        return await run_sync(TimelineService.get_by_id, project_id)
     
-    if not project:
+    response = await cached_json_response(
+        request,
+        response_key(TimelineService.cache_prefix, "by_id", project_id),
+        _produce,
+        ttl=RESPONSE_TTL,
+        tags=(TimelineService.cache_prefix,)
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    return project
+    return response
 
 
 @router.get("/phase/{phase}")
-async def get_projects_by_phase(phase: int) -> list[dict[str, Any]]:
+async def get_projects_by_phase(request: Request, phase: int) -> Response:
     """Get all projects in a specific phase."""
     if phase < 1 or phase > 9:
         raise HTTPException(status_code=400, detail="Phase must be between 1 and 9")
     
-    projects = await run_sync(TimelineService.get_by_phase, phase)
-    return projects
+    async def _produce() -> list[dict[str, Any]]:
+        return await run_sync(TimelineService.get_by_phase, phase)
+    
+    return await cached_json_response(
+        request,
+        response_key(TimelineService.cache_prefix, "phase", phase),
+        _produce,
+        ttl=RESPONSE_TTL,
+        tags=(TimelineService.cache_prefix,)
+    )
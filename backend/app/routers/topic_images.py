@@ -5,12 +5,15 @@ API endpoints for forum topic image management.
 Designed to be easily extractable to a separate microservice.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
 from pydantic import BaseModel, Field
 from typing import Optional
 
 from ..services.topic_image import topic_image_service
+from ..core.async_utils import run_sync
+from ..core.dependencies import get_upload_file
 from ..core.logging import get_logger
+from ..core.storage import UploadTooLarge
 
 logger = get_logger(__name__)
 
@@ -28,12 +31,16 @@ class ImageUploadRequest(BaseModel):
 class ImageUploadResponse(BaseModel):
     """Response model for successful image upload."""
     link: str = Field(..., description="Public URL of the uploaded image")
-    key: str = Field(..., description="Storage key for the image (used for deletion)")
+    key: str = Field(..., description="Delete handle for the image")
+    width: Optional[int] = Field(None, description="Width in pixels, for optimized images")
+    height: Optional[int] = Field(None, description="Height in pixels, for optimized images")
+    placeholder: Optional[str] = Field(None, description="Blurred low-res data URI to show while loading")
+    variants: Optional[dict[str, str]] = Field(None, description="URLs of narrower copies by width, for srcset")
 
 
 class ImageDeleteRequest(BaseModel):
     """Request model for image deletion."""
-    key: str = Field(..., description="Storage key of the image to delete")
+    key: str = Field(..., description="Delete handle returned by the upload")
 
 
 class ImageDeleteResponse(BaseModel):
@@ -58,7 +65,7 @@ class ImageValidateResponse(BaseModel):
     response_model=ImageUploadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Upload a topic image",
-    description="Upload a base64 encoded image for use in forum topics. Returns the public URL and storage key."
+    description="Upload a base64 encoded image for use in forum topics. Returns the public URL and a delete handle."
 )
 async def upload_image(request: ImageUploadRequest) -> ImageUploadResponse:
     """
@@ -66,7 +73,7 @@ async def upload_image(request: ImageUploadRequest) -> ImageUploadResponse:
     
     The image should be provided as a base64-encoded data URI (e.g., data:image/jpeg;base64,...).
     
-    Returns the public URL for displaying the image and a storage key for deletion.
+    Returns the public URL for displaying the image and a handle for deleting it.
     """
     logger.debug("Received topic image upload request")
     
@@ -80,10 +87,47 @@ async def upload_image(request: ImageUploadRequest) -> ImageUploadResponse:
         )
     
     try:
-        result = topic_image_service.upload_image(request.image)
-        return ImageUploadResponse(
-            link=result["link"],
-            key=result["key"]
+        result = await run_sync(topic_image_service.upload_image, request.image)
+        return ImageUploadResponse(**result)
+    except ValueError as e:
+        logger.warning(f"Image upload validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Image upload failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to upload image"
+        )
+
+
+@router.post(
+    "/upload-file",
+    response_model=ImageUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload a topic image file",
+    description="Upload an image as multipart/form-data (field 'file'). Returns the public URL and a delete handle."
+)
+async def upload_image_file(file: UploadFile = Depends(get_upload_file)) -> ImageUploadResponse:
+    """
+    Upload an image file for a forum topic.
+    
+    The file arrives as multipart form data instead of base64 in JSON. It
+    is spooled to a temporary file before being uploaded, and rejected
+    with 413 once it is over ``UPLOAD_MAX_BYTES``.
+    """
+    logger.debug("Received topic image file upload request")
+    
+    try:
+        result = await run_sync(topic_image_service.upload_image_file, file.file, file.content_type or "")
+        return ImageUploadResponse(**result)
+    except UploadTooLarge as e:
+        logger.warning(f"Image upload too large: {str(e)}")
+        raise HTTPException(
+            status_code=413,
+            detail=str(e)
         )
     except ValueError as e:
         logger.warning(f"Image upload validation error: {str(e)}")
@@ -103,13 +147,14 @@ async def upload_image(request: ImageUploadRequest) -> ImageUploadResponse:
     "/delete",
     response_model=ImageDeleteResponse,
     summary="Delete a topic image",
-    description="Delete a previously uploaded topic image using its storage key."
+    description="Delete a previously uploaded topic image using the handle its upload returned."
 )
 async def delete_image(request: ImageDeleteRequest) -> ImageDeleteResponse:
     """
     Delete a topic image from storage.
     
-    Requires the storage key that was returned during upload.
+    Requires the 'key' that was returned during upload. Each one deletes
+    that upload only once; the image stays while other uploads use it.
     """
     logger.debug(f"Received topic image delete request for key: {request.key}")
     
@@ -120,7 +165,7 @@ async def delete_image(request: ImageDeleteRequest) -> ImageDeleteResponse:
         )
     
     try:
-        success = topic_image_service.delete_image(request.key)
+        success = await run_sync(topic_image_service.delete_image, request.key)
         if success:
             return ImageDeleteResponse(
                 success=True,
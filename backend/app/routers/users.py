@@ -31,7 +31,8 @@ async def get_liked_content(
             return BlogService.get_by_ids(
                 user_liked['blogs'], 
                 request.page, 
-                request.limit
+                request.limit,
+                request.view
             )
         return await run_sync(_get_blogs)
     
@@ -40,7 +41,8 @@ async def get_liked_content(
             return ReviewService.get_by_ids(
                 user_liked['reviews'],
                 request.page,
-                request.limit
+                request.limit,
+                request.view
             )
         return await run_sync(_get_reviews)
     
@@ -112,7 +114,8 @@ async def search_liked_content(
                 tags=tags_list if tags_list else None,
                 author=request.author,
                 page=request.page,
-                limit=request.limit
+                limit=request.limit,
+                view=request.view
             )
         return await run_sync(_search_blogs)
     
@@ -124,7 +127,8 @@ async def search_liked_content(
                 tags=tags_list if tags_list else None,
                 author=request.author,
                 page=request.page,
-                limit=request.limit
+                limit=request.limit,
+                view=request.view
             )
         return await run_sync(_search_reviews)
     
@@ -13,6 +13,7 @@ from .content import (
     AuthorsResponse,
     ContentBlock,
     ImageData,
+    ImageUploadResponse,
 )
 from .user import (
     LikedContentRequest,
@@ -35,6 +36,7 @@ __all__ = [
     "AuthorsResponse",
     "ContentBlock",
     "ImageData",
+    "ImageUploadResponse",
     "LikedContentRequest",
     "LikedContentResponse",
     "SearchRequest",
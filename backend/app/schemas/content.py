@@ -7,8 +7,23 @@ from datetime import date
 
 class ImageData(BaseModel):
     """Image data schema."""
-    link: str
+    link: str = ""  # Derived from the key for images sent to the upload endpoint
     key: Optional[str] = ""
+    # Set for optimized uploads; send them back unchanged on update
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None  # Blurred low-res data URI
+    variants: Optional[dict[str, str]] = None  # Width in pixels -> URL, for srcset
+
+
+class ImageUploadResponse(BaseModel):
+    """Response for an image uploaded through a multipart endpoint."""
+    link: str
+    key: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
+    variants: Optional[dict[str, str]] = None
 
 
 class ContentBlock(BaseModel):
@@ -56,7 +71,7 @@ class BlogResponse(BaseModel):
     author_id: Optional[str] = None  # User ID from user database
     author_info: Optional[AuthorInfo] = None  # Resolved author details
     description: Optional[str] = None
-    content: Any
+    content: Any = None  # Omitted from summary views
     thumbnail_path: Any
     tags: list[str] = Field(default_factory=list)
     created_at: Optional[str] = None
@@ -72,6 +87,7 @@ class BlogListResponse(BaseModel):
     total: int
     total_pages: Optional[int] = None
     page: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 # Review Schemas
@@ -104,7 +120,7 @@ class ReviewResponse(BaseModel):
     author_id: Optional[str] = None  # User ID from user database
     author_info: Optional[AuthorInfo] = None  # Resolved author details
     description: Optional[str] = None
-    content: Any
+    content: Any = None  # Omitted from summary views
     thumbnail_path: Any
     tags: list[str] = Field(default_factory=list)
     created_at: Optional[str] = None
@@ -120,6 +136,7 @@ class ReviewListResponse(BaseModel):
     total: int
     total_pages: Optional[int] = None
     page: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 # Timeline Schemas
@@ -146,6 +163,7 @@ class TimelineListResponse(BaseModel):
     total: int
     total_pages: Optional[int] = None
     page: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 # Common Response Schemas
@@ -10,6 +10,7 @@ class LikedContentRequest(BaseModel):
     type: Literal["blogs", "reviews", "projects"] = "blogs"
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=5, ge=1, le=50)
+    view: Literal["summary", "full"] = "full"  # "summary" leaves out blog/review content
 
 
 class LikedContentResponse(BaseModel):
@@ -29,6 +30,7 @@ class SearchRequest(BaseModel):
     author: str = ""
     page: int = Field(default=1, ge=1)
     limit: int = Field(default=5, ge=1, le=50)
+    view: Literal["summary", "full"] = "full"  # "summary" leaves out blog/review content
 
 
 class UserResponse(BaseModel):
@@ -22,6 +22,14 @@ class AuthorService:
     
     CACHE_TTL = 300  # 5 minutes cache for author info
     
+    # Prefix of the per-author tag on cached responses that embed author info
+    CACHE_TAG = "author_info"
+    
+    @classmethod
+    def cache_tag(cls, author_id: str) -> str:
+        """Tag for cached responses embedding this author's info."""
+        return f"{cls.CACHE_TAG}:{author_id}"
+    
     @classmethod
     async def get_author_info(cls, author_id: str) -> Optional[dict[str, Any]]:
         """
@@ -29,42 +37,39 @@ class AuthorService:
         
         Args:
             author_id: The user ID from the PostgreSQL user database
-            
+        
         Returns:
             Dictionary with author info or None if not found
         """
         if not author_id:
             return None
         
-        cache_key = f"author_info:{author_id}"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+        async def _load() -> Optional[dict[str, Any]]:
+            try:
+                async with AsyncSessionLocal() as session:
+                    stmt = select(User).where(User.id == author_id)
+                    result = await session.execute(stmt)
+                    user = result.scalar_one_or_none()
+                    
+                    if not user:
+                        logger.warning(f"Author not found for ID: {author_id}")
+                        return None
+                    
+                    return {
+                        "id": user.id,
+                        "name": user.name,
+                        "username": user.username,
+                        "display_name": user.display_name,
+                        "image": user.image
+                    }
+            
+            except Exception as e:
+                logger.error(f"Error fetching author info for {author_id}: {e}")
+                return None
         
-        try:
-            async with AsyncSessionLocal() as session:
-                stmt = select(User).where(User.id == author_id)
-                result = await session.execute(stmt)
-                user = result.scalar_one_or_none()
-                
-                if not user:
-                    logger.warning(f"Author not found for ID: {author_id}")
-                    return None
-                
-                author_info = {
-                    "id": user.id,
-                    "name": user.name,
-                    "username": user.username,
-                    "display_name": user.display_name,
-                    "image": user.image
-                }
-                
-                cache.set_sync(cache_key, author_info, ttl=cls.CACHE_TTL)
-                return author_info
-                
-        except Exception as e:
-            logger.error(f"Error fetching author info for {author_id}: {e}")
-            return None
+        return await cache.aget_or_compute(
+            f"author_info:{author_id}", _load, ttl=cls.CACHE_TTL
+        )
     
     @classmethod
     async def get_authors_info(cls, author_ids: list[str]) -> dict[str, dict[str, Any]]:
@@ -73,7 +78,7 @@ class AuthorService:
         
         Args:
             author_ids: List of user IDs from the PostgreSQL user database
-            
+        
         Returns:
             Dictionary mapping author_id to author info
         """
@@ -115,7 +120,7 @@ class AuthorService:
                         }
                         result[user.id] = author_info
                         cache.set_sync(f"author_info:{user.id}", author_info, ttl=cls.CACHE_TTL)
-                        
+            
             except Exception as e:
                 logger.error(f"Error batch fetching author info: {e}")
         
@@ -125,4 +130,5 @@ class AuthorService:
     def invalidate_author_cache(cls, author_id: str) -> None:
         """Invalidate cached author info when user updates their profile."""
         cache.delete_sync(f"author_info:{author_id}")
+        cache.invalidate_tags_sync(cls.cache_tag(author_id))
         logger.debug(f"Invalidated author cache for: {author_id}")
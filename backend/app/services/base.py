@@ -2,18 +2,24 @@
 
 import json
 from math import ceil
-from typing import Optional, Any
-from datetime import datetime
+from typing import Iterable, Literal, Optional, Any
+from datetime import date, datetime
 from contextlib import contextmanager
 
-from sqlalchemy.orm import Session as SQLASession
+from sqlalchemy import Select, distinct, func, insert, literal, select, tuple_
+from sqlalchemy.orm import Query, Session as SQLASession, defer
 
 from ..core.database import ContentSessionLocal
 from ..core.cache import cache
+from ..core.pagination import decode_cursor, encode_cursor
+from .counters import AUTHOR, TAG, TOTAL, CounterService
 
 
 DATETIME_FORMAT = "%Y/%m/%d %H:%M:%S"
 
+# "summary" leaves out the article body, which list UIs never render
+ContentView = Literal["summary", "full"]
+
 
 @contextmanager
 def get_session():
@@ -39,6 +45,33 @@ def parse_json_field(value: Any) -> Any:
     return value
 
 
+def paginate(query: Query, page: int, limit: int, total: Any = None) -> tuple[list[Any], int]:
+    """Fetch one page of an ordered query and the total row count in one statement.
+    
+    The total rides along as an extra column on every row: ``COUNT(*) OVER ()``
+    by default, which is computed before LIMIT/OFFSET, or any scalar
+    expression passed as ``total`` (e.g. a maintained counter). Only a page
+    past the end, which has no row to carry it, needs a separate COUNT.
+    
+    Returns:
+        The page's rows with the total column stripped, and the total.
+    """
+    total_column = (total if total is not None else func.count().over()).label("total")
+    rows = (
+        query
+        .add_columns(total_column)
+        .offset((page - 1) * limit)
+        .limit(limit)
+        .all()
+    )
+    
+    if rows and rows[0].total is not None:
+        return [row[:-1] for row in rows], rows[0].total
+    if not rows and page == 1:
+        return [], 0
+    return [row[:-1] for row in rows], query.order_by(None).count()
+
+
 class BaseContentService:
     """Base service for content operations."""
     
@@ -47,23 +80,123 @@ class BaseContentService:
     item_id_field: str = ""
     cache_prefix: str = ""
     
+    # Writes invalidate every derived key (see _invalidate_cache), so cached
+    # content can live long; the TTL only bounds drift from out-of-band edits.
+    # Per-item keys must be stored under ``item_tag`` for that to hold.
+    CACHE_TTL = 3600
+    
+    # How long a lookup for a missing ID is remembered
+    NOT_FOUND_TTL = 30
+    
+    # Columns left out of summary views (and not loaded for them)
+    SUMMARY_EXCLUDE = ("content",)
+    
+    @classmethod
+    def item_tag(cls, item_id: int) -> str:
+        """Cache tag of the keys derived from a single item."""
+        return f"{cls.cache_prefix}:{item_id}"
+    
     @classmethod
     def _get_tags(cls, item_id: int, session: Optional[SQLASession] = None) -> list[str]:
         """Get tags for an item. Override in subclass."""
         return []
     
     @classmethod
-    def _add_tags(cls, item_id: int, tags: list[str]) -> None:
-        """Add tags for an item. Override in subclass."""
-        pass
+    def _add_tags(
+        cls,
+        session: SQLASession,
+        item_id: int,
+        tags: list[str],
+        replace: bool = True
+    ) -> None:
+        """Set an item's tags and tag counters inside the caller's transaction.
+        
+        The new rows go in with one executemany INSERT. Pass ``replace=False``
+        for a freshly inserted item to skip reading and deleting old tags.
+        The caller invalidates the cache once the transaction has committed.
+        """
+        if not cls.tag_model:
+            return
+        
+        item_id_column = getattr(cls.tag_model, cls.item_id_field)
+        tags = list(dict.fromkeys(tags))
+        old_tags: list[str] = []
+        if replace:
+            old_tags = [row[0] for row in session.query(cls.tag_model.tag).filter(item_id_column == item_id)]
+            session.query(cls.tag_model).filter(item_id_column == item_id).delete(synchronize_session=False)
+        
+        if tags:
+            session.execute(
+                insert(cls.tag_model),
+                [{cls.item_id_field: item_id, "tag": tag} for tag in tags]
+            )
+        cls._adjust_counters(session, tags=cls._count_changes(old_tags, tags))
     
     @classmethod
-    def _process_item(cls, item: Any, session: Optional[SQLASession] = None) -> dict:
+    def _get_tags_for_items(
+        cls,
+        item_ids: list[int],
+        session: Optional[SQLASession] = None
+    ) -> dict[int, list[str]]:
+        """Get tags for many items, loading every uncached item with one IN query.
+        
+        Shares the per-item ``{prefix}_tags_by_id`` cache keys with ``_get_tags``.
+        """
+        if not item_ids or not cls.tag_model:
+            return {item_id: [] for item_id in item_ids}
+        
+        result: dict[int, list[str]] = {}
+        missing = []
+        for item_id in item_ids:
+            cached = cache.get_sync(f"{cls.cache_prefix}_tags_by_id:{item_id}")
+            if cached is not None:
+                result[item_id] = cached
+            else:
+                missing.append(item_id)
+        
+        if missing:
+            snapshots = {item_id: cache.snapshot((cls.item_tag(item_id),)) for item_id in missing}
+            item_id_column = getattr(cls.tag_model, cls.item_id_field)
+            
+            def _query(s: SQLASession) -> list[Any]:
+                return (
+                    s.query(item_id_column, cls.tag_model.tag)
+                    .filter(item_id_column.in_(missing))
+                    .order_by(cls.tag_model.id)
+                    .all()
+                )
+            
+            if session is None:
+                with get_session() as new_session:
+                    rows = _query(new_session)
+            else:
+                rows = _query(session)
+            
+            loaded: dict[int, list[str]] = {item_id: [] for item_id in missing}
+            for item_id, tag in rows:
+                loaded[item_id].append(tag)
+            for item_id, tags in loaded.items():
+                cache.set_sync(
+                    f"{cls.cache_prefix}_tags_by_id:{item_id}", tags,
+                    ttl=cls.CACHE_TTL, since=snapshots[item_id]
+                )
+            result.update(loaded)
+        
+        return result
+    
+    @classmethod
+    def _process_item(
+        cls,
+        item: Any,
+        session: Optional[SQLASession] = None,
+        tags: Optional[list[str]] = None,
+        view: ContentView = "full"
+    ) -> dict:
         """Process item to dict with tags and parsed JSON."""
-        item_dict = item.to_dict()
+        item_dict = item.to_dict(exclude=cls.SUMMARY_EXCLUDE if view == "summary" else ())
         
-        # Get tags
-        item_dict['tags'] = cls._get_tags(item.id, session)
+        # Get tags, unless already batch-loaded by _process_items
+        item_dict['tags'] = tags if tags is not None else cls._get_tags(item.id, session)
         
         # Parse JSON fields
         for field in ['content', 'thumbnail_path']:
@@ -73,65 +206,340 @@ class BaseContentService:
         return item_dict
     
     @classmethod
-    def count(cls) -> int:
-        """Get total count of items."""
-        cache_key = f"{cls.cache_prefix}_count"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+    def _process_items(
+        cls,
+        items: list[Any],
+        session: Optional[SQLASession] = None,
+        view: ContentView = "full"
+    ) -> list[dict]:
+        """Process a page of items, loading all of their tags in one query."""
+        tags_by_id = cls._get_tags_for_items([item.id for item in items], session)
+        return [cls._process_item(item, session, tags_by_id[item.id], view) for item in items]
+    
+    @classmethod
+    def _view_options(cls, view: ContentView) -> list[Any]:
+        """Query options for a view; summaries never load the excluded columns."""
+        if view != "summary":
+            return []
+        return [defer(getattr(cls.model, column)) for column in cls.SUMMARY_EXCLUDE]
+    
+    @classmethod
+    def _tags_column(cls) -> Any:
+        """Each item's tags as a JSON array column, so a page and its tags load together."""
+        if not cls.tag_model:
+            return literal("[]").label("tags")
         
-        with get_session() as session:
-            count = session.query(cls.model).count()
-            cache.set_sync(cache_key, count, ttl=60)
-            return count
+        item_tags = (
+            select(cls.tag_model.tag)
+            .where(getattr(cls.tag_model, cls.item_id_field) == cls.model.id)
+            .order_by(cls.tag_model.id)
+            .correlate(cls.model)
+            .subquery()
+        )
+        return select(func.json_group_array(item_tags.c.tag)).scalar_subquery().label("tags")
+    
+    @classmethod
+    def _page_query(cls, session: SQLASession, view: ContentView = "full") -> Query:
+        """Query for (item, tags JSON) rows; pass the rows to ``_process_rows``."""
+        return session.query(cls.model, cls._tags_column()).options(*cls._view_options(view))
     
     @classmethod
-    def get_paginated(cls, page: int = 1, limit: int = 5) -> list[dict]:
-        """Get paginated items."""
-        cache_key = f"{cls.cache_prefix}_paginated:{page}:{limit}"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+    def _process_rows(cls, rows: list[Any], view: ContentView = "full") -> list[dict]:
+        """Process rows from ``_page_query`` without another tag query."""
+        return [cls._process_item(row[0], tags=json.loads(row[1]), view=view) for row in rows]
+    
+    @classmethod
+    def summarize(cls, item: dict) -> dict:
+        """Project a processed full item down to its summary view."""
+        return {key: value for key, value in item.items() if key not in cls.SUMMARY_EXCLUDE}
+    
+    @classmethod
+    def _ensure_counters(cls, session: SQLASession) -> int:
+        """Build this type's counters from the tables if they don't exist yet.
         
+        Returns:
+            The item total.
+        """
+        total = CounterService.get_total(session, cls.cache_prefix)
+        if total is None:
+            CounterService.reconcile(session, cls.cache_prefix, cls.model, cls.tag_model, cls.item_id_field)
+            session.flush()
+            total = CounterService.get_total(session, cls.cache_prefix) or 0
+        return total
+    
+    @classmethod
+    def reconcile_counters(cls) -> int:
+        """Recompute this type's counters, returning how many had drifted."""
         with get_session() as session:
-            total = session.query(cls.model).count()
-            offset = (page - 1) * limit
-            
-            if offset >= total:
-                return []
-            
-            items = (
-                session.query(cls.model)
-                .order_by(cls.model.created_at.desc())
-                .offset(offset)
-                .limit(limit)
-                .all()
+            drift = CounterService.reconcile(
+                session, cls.cache_prefix, cls.model, cls.tag_model, cls.item_id_field
             )
-            
-            result = [cls._process_item(item, session) for item in items]
-            cache.set_sync(cache_key, result, ttl=30)
-            return result
+        
+        if drift:
+            cache.invalidate_tags_sync(cls.cache_prefix)
+        return drift
+    
+    @classmethod
+    def count(cls) -> int:
+        """Get total count of items, read from the counters table."""
+        def _load() -> int:
+            with get_session() as session:
+                return cls._ensure_counters(session)
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_count",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,)
+        )
+    
+    @classmethod
+    def get_tag_counts(cls) -> dict[str, int]:
+        """Get the number of items carrying each tag."""
+        if not cls.tag_model:
+            return {}
+        
+        def _load() -> dict[str, int]:
+            with get_session() as session:
+                cls._ensure_counters(session)
+                return CounterService.get_counts(session, cls.cache_prefix, TAG)
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_tag_counts",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,)
+        )
+    
+    @classmethod
+    def get_author_counts(cls) -> dict[str, int]:
+        """Get the number of items by each author."""
+        def _load() -> dict[str, int]:
+            with get_session() as session:
+                cls._ensure_counters(session)
+                return CounterService.get_counts(session, cls.cache_prefix, AUTHOR)
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_author_counts",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,)
+        )
+    
+    @staticmethod
+    def _count_changes(old: Iterable[str], new: Iterable[str]) -> dict[str, int]:
+        """Counter deltas for replacing the names in ``old`` with those in ``new``."""
+        old_names, new_names = set(old), set(new)
+        return {
+            **{name: -1 for name in old_names - new_names},
+            **{name: 1 for name in new_names - old_names},
+        }
+    
+    @classmethod
+    def _adjust_counters(
+        cls,
+        session: SQLASession,
+        total: int = 0,
+        authors: Optional[dict[str, int]] = None,
+        tags: Optional[dict[str, int]] = None
+    ) -> None:
+        """Record a write's effect on the counters, in the write's own session."""
+        deltas = [(TOTAL, "", total)]
+        deltas += [(AUTHOR, author, delta) for author, delta in (authors or {}).items()]
+        deltas += [(TAG, tag, delta) for tag, delta in (tags or {}).items()]
+        CounterService.adjust(session, cls.cache_prefix, deltas)
+    
+    @classmethod
+    def get_page(cls, page: int = 1, limit: int = 5, view: ContentView = "full") -> dict:
+        """Get a page of items by offset, newest first, with the total.
+        
+        Items, their tags and the total (read from the counters table) come
+        back in one statement. Kept for page-number clients; deep pages cost
+        more with every page skipped, so new callers should use ``get_after``.
+        
+        Returns:
+            Dict with ``items`` and ``total``.
+        """
+        def _load() -> dict:
+            with get_session() as session:
+                rows, total = paginate(
+                    cls._page_query(session, view)
+                    .order_by(cls.model.created_at.desc(), cls.model.id.desc()),
+                    page,
+                    limit,
+                    total=CounterService.total_column(cls.cache_prefix)
+                )
+                return {"items": cls._process_rows(rows, view), "total": total}
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_page:{view}:{page}:{limit}",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,),
+            stale_ttl=120
+        )
+    
+    @classmethod
+    def get_paginated(cls, page: int = 1, limit: int = 5, view: ContentView = "full") -> list[dict]:
+        """Get a page of items by offset, newest first."""
+        return cls.get_page(page, limit, view)["items"]
+    
+    @classmethod
+    def parse_cursor(cls, cursor: str) -> tuple[str, int]:
+        """Decode a ``next_cursor`` from ``get_after``.
+        
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        return decode_cursor(cursor, (str, int))
+    
+    @classmethod
+    def cursor_for(cls, item: dict) -> str:
+        """Cursor pointing just past ``item`` in newest-first order."""
+        return encode_cursor((item['created_at'], item['id']))
+    
+    @classmethod
+    def get_after(
+        cls,
+        after: Optional[tuple[str, int]] = None,
+        limit: int = 5,
+        view: ContentView = "full"
+    ) -> dict:
+        """Get the page of items following ``after`` (keyset pagination), newest first.
+        
+        Pages are keyed on (created_at, id), which the created_at index
+        covers (SQLite appends the rowid to every index), so any page
+        costs the same as the first, and posts published while a client
+        pages never shift later pages. ``after`` comes from
+        ``parse_cursor``; None starts at the newest item.
+        
+        Returns:
+            Dict with ``items``, ``total`` and ``next_cursor`` (None on the
+            last page).
+        """
+        def _load() -> dict:
+            with get_session() as session:
+                query = cls._page_query(session, view).add_columns(
+                    CounterService.total_column(cls.cache_prefix).label("total")
+                )
+                if after is not None:
+                    query = query.filter(tuple_(cls.model.created_at, cls.model.id) < after)
+                
+                # One extra row tells whether another page follows
+                rows = (
+                    query
+                    .order_by(cls.model.created_at.desc(), cls.model.id.desc())
+                    .limit(limit + 1)
+                    .all()
+                )
+                processed = cls._process_rows(rows[:limit], view)
+                
+                return {
+                    "items": processed,
+                    "total": rows[0].total if rows and rows[0].total is not None else cls.count(),
+                    "next_cursor": cls.cursor_for(processed[-1]) if len(rows) > limit else None
+                }
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_after:{view}:{json.dumps(after)}:{limit}",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,)
+        )
+    
+    @classmethod
+    def get_known_ids(cls) -> frozenset[int]:
+        """Get the exact set of existing item IDs.
+        
+        Stored under the content type's tag, so any write rebuilds it on
+        the next lookup.
+        """
+        def _load() -> frozenset[int]:
+            with get_session() as session:
+                return frozenset(row[0] for row in session.query(cls.model.id).all())
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_ids",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,)
+        )
     
     @classmethod
     def get_by_id(cls, item_id: int) -> Optional[dict]:
-        """Get single item by ID."""
-        cache_key = f"{cls.cache_prefix}_by_id:{item_id}"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+        """Get single item by ID.
         
-        with get_session() as session:
-            item = session.query(cls.model).filter(cls.model.id == item_id).first()
-            
-            if not item:
-                return None
-            
-            result = cls._process_item(item, session)
-            cache.set_sync(cache_key, result, ttl=10)
-            return result
+        IDs missing from ``get_known_ids`` return None without a query, and
+        misses that do reach the database are cached for ``NOT_FOUND_TTL``.
+        """
+        if item_id not in cls.get_known_ids():
+            return None
+        
+        def _load() -> Optional[dict]:
+            with get_session() as session:
+                item = session.query(cls.model).filter(cls.model.id == item_id).first()
+                
+                if not item:
+                    return None
+                
+                return cls._process_item(item, session)
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_by_id:{item_id}",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.item_tag(item_id),),
+            negative_ttl=cls.NOT_FOUND_TTL
+        )
     
     @classmethod
-    def get_by_ids(cls, ids: list[int], page: int = 1, limit: int = 5) -> dict:
+    def get_many(cls, ids: list[int], view: ContentView = "full") -> list[dict]:
+        """Get items by ID in the given order, skipping IDs that don't exist.
+        
+        Cached items come from their ``{prefix}_by_id`` keys; the rest are
+        loaded with one IN query (plus one tag query). Full items are cached
+        under those keys for later ``get_by_id`` calls; summaries are not,
+        since they lack the excluded columns.
+        """
+        known_ids = cls.get_known_ids()
+        ids = [item_id for item_id in ids if item_id in known_ids]
+        
+        found: dict[int, dict] = {}
+        missing = []
+        for item_id in dict.fromkeys(ids):
+            cached = cache.get_sync(f"{cls.cache_prefix}_by_id:{item_id}")
+            if cached is not None:
+                found[item_id] = cls.summarize(cached) if view == "summary" else cached
+            else:
+                missing.append(item_id)
+        
+        if missing:
+            snapshots = {item_id: cache.snapshot((cls.item_tag(item_id),)) for item_id in missing}
+            with get_session() as session:
+                rows = (
+                    session.query(cls.model)
+                    .options(*cls._view_options(view))
+                    .filter(cls.model.id.in_(missing))
+                    .all()
+                )
+                for item in cls._process_items(rows, session, view):
+                    found[item['id']] = item
+                    if view == "full":
+                        cache.set_sync(
+                            f"{cls.cache_prefix}_by_id:{item['id']}", item,
+                            ttl=cls.CACHE_TTL, since=snapshots[item['id']]
+                        )
+        
+        return [found[item_id] for item_id in ids if item_id in found]
+    
+    @classmethod
+    def get_by_ids(
+        cls,
+        ids: list[int],
+        page: int = 1,
+        limit: int = 5,
+        view: ContentView = "full"
+    ) -> dict:
         """Get items by IDs with pagination."""
         if not ids:
             return {"items": [], "total": 0, "total_pages": 0, "page": page}
@@ -141,58 +549,54 @@ class BaseContentService:
         end_idx = min(start_idx + limit, total)
         page_ids = ids[start_idx:end_idx]
         
-        with get_session() as session:
-            items = []
-            for item_id in page_ids:
-                item = session.query(cls.model).filter(cls.model.id == item_id).first()
-                if item:
-                    items.append(cls._process_item(item, session))
-            
-            return {
-                "items": items,
-                "total": total,
-                "total_pages": ceil(total / limit),
-                "page": page
-            }
+        return {
+            "items": cls.get_many(page_ids, view),
+            "total": total,
+            "total_pages": ceil(total / limit),
+            "page": page
+        }
     
     @classmethod
     def get_latest(cls, limit: int = 3) -> list[dict]:
         """Get latest items."""
-        cache_key = f"{cls.cache_prefix}_latest:{limit}"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
-        
-        with get_session() as session:
-            items = (
-                session.query(cls.model)
-                .with_entities(
-                    cls.model.id,
-                    cls.model.title,
-                    cls.model.author,
-                    cls.model.author_id,
-                    cls.model.created_at,
-                    cls.model.thumbnail_path
+        def _load() -> list[dict]:
+            with get_session() as session:
+                items = (
+                    session.query(cls.model)
+                    .with_entities(
+                        cls.model.id,
+                        cls.model.title,
+                        cls.model.author,
+                        cls.model.author_id,
+                        cls.model.created_at,
+                        cls.model.thumbnail_path
+                    )
+                    .order_by(cls.model.created_at.desc())
+                    .limit(limit)
+                    .all()
                 )
-                .order_by(cls.model.created_at.desc())
-                .limit(limit)
-                .all()
-            )
-            
-            result = []
-            for item in items:
-                item_dict = {
-                    'id': item.id,
-                    'title': item.title,
-                    'author': item.author,
-                    'author_id': item.author_id,
-                    'created_at': item.created_at,
-                    'thumbnail_path': parse_json_field(item.thumbnail_path)
-                }
-                result.append(item_dict)
-            
-            cache.set_sync(cache_key, result, ttl=60)
-            return result
+                
+                result = []
+                for item in items:
+                    item_dict = {
+                        'id': item.id,
+                        'title': item.title,
+                        'author': item.author,
+                        'author_id': item.author_id,
+                        'created_at': item.created_at,
+                        'thumbnail_path': parse_json_field(item.thumbnail_path)
+                    }
+                    result.append(item_dict)
+                
+                return result
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_latest:{limit}",
+            _load,
+            ttl=cls.CACHE_TTL,
+            tags=(cls.cache_prefix,),
+            stale_ttl=300
+        )
     
     @classmethod
     def search(
@@ -202,105 +606,73 @@ class BaseContentService:
         author: str = "",
         author_id: str = "",
         page: int = 1,
-        limit: int = 5
+        limit: int = 5,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        view: ContentView = "full"
     ) -> dict:
-        """Search items by query, tags, author, or author_id."""
-        items = []
-        total = 0
+        """Search items by any combination of query, tags, author, author_id and date range."""
+        from .search import ContentSearch
         
-        with get_session() as session:
-            # Search by tags
-            if tags and cls.tag_model:
-                item_ids = None
-                for tag in tags:
-                    tag_items = set([
-                        row[0] for row in session.query(
-                            getattr(cls.tag_model, cls.item_id_field)
-                        ).filter(cls.tag_model.tag == tag).all()
-                    ])
-                    item_ids = tag_items if item_ids is None else item_ids.intersection(tag_items)
-                
-                if item_ids:
-                    total = len(item_ids)
-                    start_idx = (page - 1) * limit
-                    page_ids = list(item_ids)[start_idx:start_idx + limit]
-                    
-                    for item_id in page_ids:
-                        item = session.query(cls.model).filter(cls.model.id == item_id).first()
-                        if item:
-                            items.append(cls._process_item(item, session))
-            
-            # Search by author_id (exact match)
-            elif author_id:
-                base_query = session.query(cls.model).filter(
-                    cls.model.author_id == author_id
-                )
-                total = base_query.count()
-                
-                results = base_query.order_by(cls.model.created_at.desc()).offset((page-1)*limit).limit(limit)
-                items = [cls._process_item(item, session) for item in results]
-            
-            # Search by author name
-            elif author:
-                base_query = session.query(cls.model).filter(
-                    cls.model.author.ilike(f'%{author}%')
-                )
-                total = base_query.count()
-                
-                results = base_query.order_by(cls.model.created_at.desc()).offset((page-1)*limit).limit(limit)
-                items = [cls._process_item(item, session) for item in results]
-            
-            # Search by title/description
-            elif query:
-                import sqlalchemy
-                base_query = session.query(cls.model).filter(
-                    sqlalchemy.or_(
-                        cls.model.title.ilike(f'%{query}%'),
-                        cls.model.description.ilike(f'%{query}%')
-                    )
-                )
-                total = base_query.count()
-                
-                results = base_query.order_by(cls.model.created_at.desc()).offset((page-1)*limit).limit(limit)
-                items = [cls._process_item(item, session) for item in results]
+        # Copy so subclasses can rename keys without touching the cached dict
+        return dict(
+            ContentSearch(cls)
+            .text(query)
+            .tags(tags)
+            .author(author)
+            .author_id(author_id)
+            .created_between(date_from, date_to)
+            .view(view)
+            .fetch_cached(page, limit)
+        )
+    
+    @classmethod
+    def _ids_with_all_tags(cls, tags: list[str]) -> Select:
+        """Select the IDs of items carrying every one of ``tags``."""
+        item_id_column = getattr(cls.tag_model, cls.item_id_field)
+        return (
+            select(item_id_column)
+            .where(cls.tag_model.tag.in_(tags))
+            .group_by(item_id_column)
+            .having(func.count(distinct(cls.tag_model.tag)) == len(set(tags)))
+        )
+    
+    @classmethod
+    def search_within(
+        cls,
+        ids: list[int],
+        query: str = "",
+        tags: Optional[list[str]] = None,
+        author: str = "",
+        page: int = 1,
+        limit: int = 5,
+        view: ContentView = "full"
+    ) -> dict:
+        """Search a fixed set of items (e.g. a user's likes) in the database.
         
-        return {
-            "items": items,
-            "total": total,
-            "total_pages": ceil(total / limit) if total > 0 else 0,
-            "page": page
-        }
+        Not cached: the ID set differs per caller.
+        """
+        from .search import ContentSearch
+        
+        return (
+            ContentSearch(cls)
+            .within(ids)
+            .text(query)
+            .tags(tags)
+            .author(author)
+            .view(view)
+            .fetch(page, limit)
+        )
     
     @classmethod
     def get_all_tags(cls) -> list[str]:
         """Get all unique tags."""
-        if not cls.tag_model:
-            return []
-        
-        cache_key = f"{cls.cache_prefix}_all_tags"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
-        
-        with get_session() as session:
-            tags = session.query(cls.tag_model.tag).distinct().all()
-            result = sorted([tag[0] for tag in tags])
-            cache.set_sync(cache_key, result, ttl=60)
-            return result
+        return sorted(cls.get_tag_counts())
     
     @classmethod
     def get_all_authors(cls) -> list[str]:
         """Get all unique authors."""
-        cache_key = f"{cls.cache_prefix}_all_authors"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
-        
-        with get_session() as session:
-            authors = session.query(cls.model.author).distinct().all()
-            result = sorted([author[0] for author in authors])
-            cache.set_sync(cache_key, result, ttl=60)
-            return result
+        return sorted(cls.get_author_counts())
     
     @classmethod
     def get_authors_by_ids(cls, ids: list[int]) -> list[str]:
@@ -321,23 +693,24 @@ class BaseContentService:
             return []
         
         tags = set()
-        for item_id in ids:
-            item_tags = cls._get_tags(item_id)
+        for item_tags in cls._get_tags_for_items(ids).values():
             tags.update(item_tags)
         
         return sorted(list(tags))
     
     @classmethod
     def _invalidate_cache(cls, item_id: Optional[int] = None) -> None:
-        """Invalidate caches after updates."""
-        cache.delete_sync(f"{cls.cache_prefix}_count")
-        cache.delete_sync(f"{cls.cache_prefix}_all_tags")
-        cache.delete_sync(f"{cls.cache_prefix}_all_authors")
-        
-        # Clear paginated caches (simple approach - clear common pages)
-        for page in range(1, 10):
-            for limit in [3, 5, 10]:
-                cache.delete_sync(f"{cls.cache_prefix}_paginated:{page}:{limit}")
+        """Invalidate caches after updates.
         
+        Every list-shaped key (counts, pages, latest, tags, authors, the
+        known ID set) and every encoded route response is stored under the
+        content type's tag, so bumping that tag invalidates all of them at
+        once, whatever page/limit they were for. The item's own keys are
+        under its ``item_tag``, whose generation loads snapshot up front, so
+        a load that read the old row before the write committed can't store
+        it over the invalidation.
+        """
         if item_id:
-            cache.delete_sync(f"{cls.cache_prefix}_by_id:{item_id}")
+            cache.invalidate_tags_sync(cls.cache_prefix, cls.item_tag(item_id))
+        else:
+            cache.invalidate_tags_sync(cls.cache_prefix)
@@ -1,6 +1,6 @@
 """Blog service for handling blog post operations."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy.orm import Session
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from ..models.content import BlogPost, BlogTag
 from ..core.cache import cache
 from ..core.logging import get_logger
-from .base import BaseContentService, get_session, DATETIME_FORMAT
+from .base import BaseContentService, ContentView, get_session, DATETIME_FORMAT
 from .blog_image import blog_image_service
 
 logger = get_logger(__name__)
@@ -30,6 +30,7 @@ class BlogService(BaseContentService):
         if cached is not None:
             return cached
         
+        snapshot = cache.snapshot((cls.item_tag(item_id),))
         if session is None:
             with get_session() as new_session:
                 tags = new_session.query(BlogTag.tag).filter(BlogTag.blog_id == item_id).all()
@@ -38,23 +39,9 @@ class BlogService(BaseContentService):
             tags = session.query(BlogTag.tag).filter(BlogTag.blog_id == item_id).all()
             result = [tag[0] for tag in tags]
         
-        cache.set_sync(cache_key, result, ttl=30)
+        cache.set_sync(cache_key, result, ttl=cls.CACHE_TTL, since=snapshot)
         return result
     
-    @classmethod
-    def _add_tags(cls, item_id: int, tags: list[str]) -> None:
-        """Add tags for a blog post."""
-        with get_session() as session:
-            # Remove existing tags
-            session.query(BlogTag).filter(BlogTag.blog_id == item_id).delete()
-            
-            # Add new tags
-            for tag in tags:
-                session.add(BlogTag(blog_id=item_id, tag=tag))
-        
-        cache.delete_sync(f"blog_tags_by_id:{item_id}")
-        cache.delete_sync("blog_all_tags")
-    
     @classmethod
     def create(
         cls,
@@ -79,34 +66,39 @@ class BlogService(BaseContentService):
         )
         
         try:
-            # Process thumbnail - use default if not a base64 image (new upload required)
-            logger.debug("Processing thumbnail image")
-            thumbnail = blog_image_service.process_thumbnail(thumbnail_path, use_default_if_not_base64=True)
-            
-            # Process content images
-            logger.debug(f"Processing {len(content)} content blocks")
-            processed_content = blog_image_service.process_content_blocks(content)
+            # Upload the thumbnail and content images in parallel; the
+            # thumbnail falls back to the default unless it is a new upload
+            logger.debug(f"Processing thumbnail and {len(content)} content blocks")
+            thumbnail, processed_content, uploaded = blog_image_service.process_images(
+                thumbnail_path, content, use_default_if_not_base64=True
+            )
             
             logger.debug("Saving blog post to database")
-            with get_session() as session:
-                post = BlogPost(
-                    title=title,
-                    author=author,
-                    author_id=author_id,
-                    description=description,
-                    content=processed_content,
-                    thumbnail_path=thumbnail,
-                    created_at=datetime.now().strftime(DATETIME_FORMAT),
-                    updated_at=""
-                )
-                session.add(post)
-                session.flush()
-                blog_id: int = int(post.id)  # type: ignore[arg-type]
+            try:
+                with get_session() as session:
+                    post = BlogPost(
+                        title=title,
+                        author=author,
+                        author_id=author_id,
+                        description=description,
+                        content=processed_content,
+                        thumbnail_path=thumbnail,
+                        created_at=datetime.now().strftime(DATETIME_FORMAT),
+                        updated_at=""
+                    )
+                    session.add(post)
+                    session.flush()
+                    cls._adjust_counters(session, total=1, authors={author: 1})
+                    blog_id: int = int(post.id)  # type: ignore[arg-type]
+                    cls._add_tags(session, blog_id, tags, replace=False)
+            except Exception:
+                # Don't leave the new uploads orphaned in R2
+                blog_image_service.delete_images(uploaded)
+                raise
             
-            logger.debug(f"Blog post saved with ID {blog_id}, adding tags")
-            # Add tags
-            cls._add_tags(blog_id, tags)
-            cls._invalidate_cache()
+            # Only after commit, so a failed write leaves the cache alone.
+            # Pass the new ID so a cached "not found" for it is dropped too
+            cls._invalidate_cache(blog_id)
             
             logger.info(
                 f"Blog post created successfully with ID {blog_id}",
@@ -114,7 +106,7 @@ class BlogService(BaseContentService):
             )
             
             return blog_id
-            
+        
         except Exception as e:
             logger.error(
                 f"Failed to create blog post: {str(e)}",
@@ -139,49 +131,56 @@ class BlogService(BaseContentService):
         thumbnail_path: dict,
         author_id: Optional[str] = None
     ) -> bool:
-        """Update an existing blog post."""
-        # First, get the existing post to compare images
-        with get_session() as session:
-            post = session.query(BlogPost).filter(BlogPost.id == blog_id).first()
-            
-            if not post:
-                return False
-            
-            # Store old content and thumbnail for cleanup
-            old_content = post.content or []
-            old_thumbnail = post.thumbnail_path
+        """Update an existing blog post.
         
-        # Process thumbnail
-        thumbnail = blog_image_service.process_thumbnail(thumbnail_path)
+        New images are uploaded first. The row, its tags and the counters
+        then change in one transaction, and images the blog post no longer uses
+        are deleted only after it commits.
+        """
+        if blog_id not in cls.get_known_ids():
+            return False
         
-        # Process content images
-        processed_content = blog_image_service.process_content_blocks(content)
+        # Upload the thumbnail and content images in parallel
+        thumbnail, processed_content, uploaded = blog_image_service.process_images(thumbnail_path, content)
         
-        # Clean up orphaned images (old images no longer in use)
+        try:
+            with get_session() as session:
+                post = session.query(BlogPost).filter(BlogPost.id == blog_id).first()
+                
+                if post:
+                    # Store old content and thumbnail for cleanup
+                    old_content = post.content or []
+                    old_thumbnail = post.thumbnail_path
+                    
+                    cls._adjust_counters(session, authors=cls._count_changes([post.author], [author]))
+                    post.title = title  # type: ignore[assignment]
+                    post.author = author  # type: ignore[assignment]
+                    if author_id is not None:
+                        post.author_id = author_id  # type: ignore[assignment]
+                    post.description = description  # type: ignore[assignment]
+                    post.content = processed_content  # type: ignore[assignment]
+                    post.thumbnail_path = thumbnail  # type: ignore[assignment]
+                    post.updated_at = datetime.now().strftime(DATETIME_FORMAT)  # type: ignore[assignment]
+                    cls._add_tags(session, blog_id, tags)
+        except Exception:
+            blog_image_service.delete_images(uploaded)
+            raise
+        
+        if not post:
+            # Deleted since the known-ID check
+            blog_image_service.delete_images(uploaded)
+            return False
+        
+        # Clean up orphaned images (old images no longer in use), and give
+        # back the references of uploads that turned out to be duplicates
         blog_image_service.cleanup_orphaned_images(
             old_content=old_content,
             new_content=processed_content,
             old_thumbnail=old_thumbnail,
-            new_thumbnail=thumbnail
+            new_thumbnail=thumbnail,
+            uploaded_keys=uploaded
         )
         
-        with get_session() as session:
-            post = session.query(BlogPost).filter(BlogPost.id == blog_id).first()
-            
-            if not post:
-                return False
-            
-            post.title = title  # type: ignore[assignment]
-            post.author = author  # type: ignore[assignment]
-            if author_id is not None:
-                post.author_id = author_id  # type: ignore[assignment]
-            post.description = description  # type: ignore[assignment]
-            post.content = processed_content  # type: ignore[assignment]
-            post.thumbnail_path = thumbnail  # type: ignore[assignment]
-            post.updated_at = datetime.now().strftime(DATETIME_FORMAT)  # type: ignore[assignment]
-        
-        # Update tags
-        cls._add_tags(blog_id, tags)
         cls._invalidate_cache(blog_id)
         
         return True
@@ -199,6 +198,15 @@ class BlogService(BaseContentService):
             content = post.content or []
             thumbnail = post.thumbnail_path
             
+            tags = [row[0] for row in session.query(BlogTag.tag).filter(BlogTag.blog_id == blog_id)]
+            cls._adjust_counters(
+                session,
+                total=-1,
+                authors={post.author: -1},
+                tags=cls._count_changes(tags, [])
+            )
+            # SQLite only cascades with foreign keys enabled, so don't rely on it
+            session.query(BlogTag).filter(BlogTag.blog_id == blog_id).delete()
             session.delete(post)
         
         # Clean up all images after successful deletion
@@ -225,8 +233,8 @@ class BlogService(BaseContentService):
             if not post:
                 return None
             
-            result = cls._process_item(post, session)
-            cache.set_sync(cache_key, result, ttl=60)
+            result = cls._process_items([post], session)[0]
+            cache.set_sync(cache_key, result, ttl=cls.CACHE_TTL, tags=(cls.cache_prefix,))
             return result
     
     @classmethod
@@ -237,16 +245,27 @@ class BlogService(BaseContentService):
         author: str = "",
         author_id: str = "",
         page: int = 1,
-        limit: int = 5
+        limit: int = 5,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        view: ContentView = "full"
     ) -> dict:
         """Search blogs - returns with 'blogs' key for API compatibility."""
-        result = super().search(query, tags, author, author_id, page, limit)
+        result = super().search(
+            query, tags, author, author_id, page, limit, date_from, date_to, view
+        )
         result["blogs"] = result.pop("items")
         return result
     
     @classmethod
-    def get_by_ids(cls, ids: list[int], page: int = 1, limit: int = 5) -> dict:
+    def get_by_ids(
+        cls,
+        ids: list[int],
+        page: int = 1,
+        limit: int = 5,
+        view: ContentView = "full"
+    ) -> dict:
         """Get blogs by IDs - returns with 'blogs' key for API compatibility."""
-        result = super().get_by_ids(ids, page, limit)
+        result = super().get_by_ids(ids, page, limit, view)
         result["blogs"] = result.pop("items")
         return result
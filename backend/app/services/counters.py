@@ -0,0 +1,148 @@
+"""Incrementally maintained totals for content types, tags and authors."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, distinct, exists, func, literal, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session as SQLASession
+
+from ..models.content import ContentCounter
+
+TOTAL = "total"
+TAG = "tag"
+AUTHOR = "author"
+
+
+class CounterService:
+    """Reads and writes the content_counters table.
+    
+    Writers call ``adjust`` with the session of the write itself, so a
+    counter changes only if the row change it describes commits. Readers
+    get totals with a primary-key lookup instead of ``COUNT(*)``.
+    ``reconcile`` recomputes a scope from the content tables to correct
+    any drift (e.g. rows edited outside the app). A scope has no counters
+    until it is first reconciled, and ``adjust`` leaves such scopes alone,
+    so the first reader builds them from the tables instead of trusting
+    deltas that started from zero.
+    """
+    
+    @staticmethod
+    def adjust(session: SQLASession, scope: str, deltas: Iterable[tuple[str, str, int]]) -> None:
+        """Apply ``(kind, name, delta)`` changes inside the caller's transaction.
+        
+        Does nothing for a scope that was never reconciled; that is checked
+        in the same statement, so it costs no extra round trip.
+        """
+        merged: Counter[tuple[str, str]] = Counter()
+        for kind, name, delta in deltas:
+            merged[(kind, name or "")] += delta
+        
+        reconciled = exists().where(ContentCounter.scope == scope, ContentCounter.kind == TOTAL)
+        rows = [
+            select(literal(scope), literal(kind), literal(name), literal(delta)).where(reconciled)
+            for (kind, name), delta in merged.items() if delta
+        ]
+        if not rows:
+            return
+        
+        statement = sqlite_insert(ContentCounter).from_select(
+            ["scope", "kind", "name", "value"],
+            rows[0] if len(rows) == 1 else union_all(*rows)
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[ContentCounter.scope, ContentCounter.kind, ContentCounter.name],
+            set_={"value": ContentCounter.value + statement.excluded.value}
+        ))
+        
+        # Tags and authors nobody uses any more drop out of the listings
+        session.query(ContentCounter).filter(
+            ContentCounter.scope == scope,
+            ContentCounter.kind != TOTAL,
+            ContentCounter.value <= 0
+        ).delete(synchronize_session=False)
+    
+    @staticmethod
+    def get_total(session: SQLASession, scope: str) -> Optional[int]:
+        """Get the item count for a scope, or None if it was never reconciled."""
+        row = session.get(ContentCounter, (scope, TOTAL, ""))
+        return int(row.value) if row is not None else None
+    
+    @staticmethod
+    def total_column(scope: str) -> Any:
+        """Scalar subquery reading a scope's total, to select alongside other rows."""
+        return (
+            select(ContentCounter.value)
+            .where(
+                ContentCounter.scope == scope,
+                ContentCounter.kind == TOTAL,
+                ContentCounter.name == ""
+            )
+            .scalar_subquery()
+        )
+    
+    @staticmethod
+    def get_counts(session: SQLASession, scope: str, kind: str) -> dict[str, int]:
+        """Get per-name counts (e.g. items per tag) for a scope."""
+        rows = (
+            session.query(ContentCounter.name, ContentCounter.value)
+            .filter(ContentCounter.scope == scope, ContentCounter.kind == kind)
+            .all()
+        )
+        return {name: value for name, value in rows}
+    
+    @staticmethod
+    def reconcile(
+        session: SQLASession,
+        scope: str,
+        model: Any,
+        tag_model: Any = None,
+        item_id_field: str = "",
+        count_authors: bool = True
+    ) -> int:
+        """Recompute every counter for a scope from the content tables.
+        
+        The scope's counters are deleted first, which takes the database
+        write lock before anything is counted: a write can't commit between
+        the counts and the new counters, so none is lost.
+        
+        Returns:
+            Number of counters that were wrong (0 when there was no drift,
+            or when the scope had no counters yet).
+        """
+        stored = {
+            (kind, name): value
+            for kind, name, value in session.execute(
+                delete(ContentCounter)
+                .where(ContentCounter.scope == scope)
+                .returning(ContentCounter.kind, ContentCounter.name, ContentCounter.value)
+            )
+        }
+        
+        actual: dict[tuple[str, str], int] = {
+            (TOTAL, ""): session.query(func.count(model.id)).scalar() or 0
+        }
+        if count_authors:
+            for author, count in session.query(model.author, func.count(model.id)).group_by(model.author):
+                actual[(AUTHOR, author or "")] = count
+        if tag_model is not None:
+            item_id = getattr(tag_model, item_id_field)
+            # Join so tag rows left behind by deleted items aren't counted
+            tag_counts = (
+                session.query(tag_model.tag, func.count(distinct(item_id)))
+                .join(model, model.id == item_id)
+                .group_by(tag_model.tag)
+            )
+            for tag, count in tag_counts:
+                actual[(TAG, tag)] = count
+        
+        drift = 0
+        if stored:
+            drift = sum(1 for key in stored.keys() | actual.keys() if stored.get(key) != actual.get(key))
+        session.add_all(
+            ContentCounter(scope=scope, kind=kind, name=name, value=value)
+            for (kind, name), value in actual.items()
+        )
+        return drift
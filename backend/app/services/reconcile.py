@@ -0,0 +1,45 @@
+"""Periodic reconciliation of the content counters."""
+
+from __future__ import annotations
+
+import asyncio
+
+from ..core.async_utils import run_sync
+from ..core.logging import get_logger
+from .blog import BlogService
+from .review import ReviewService
+from .timeline import TimelineService
+
+logger = get_logger(__name__)
+
+
+def reconcile_counters() -> dict[str, int]:
+    """Recompute every content type's counters, returning the drift per type."""
+    drift: dict[str, int] = {}
+    for service in (BlogService, ReviewService, TimelineService):
+        try:
+            drift[service.cache_prefix] = service.reconcile_counters()
+        except Exception as e:
+            logger.error(
+                f"Counter reconciliation failed for '{service.cache_prefix}': {e}",
+                **{"counters.scope": service.cache_prefix}
+            )
+            continue
+        
+        if drift[service.cache_prefix]:
+            logger.warning(
+                f"Corrected {drift[service.cache_prefix]} drifted counters for '{service.cache_prefix}'",
+                **{
+                    "counters.scope": service.cache_prefix,
+                    "counters.drift": drift[service.cache_prefix],
+                    "event": "counters_reconciled",
+                }
+            )
+    return drift
+
+
+async def run_counter_reconciler(interval: float) -> None:
+    """Reconcile the counters now and then every ``interval`` seconds until cancelled."""
+    while True:
+        await run_sync(reconcile_counters)
+        await asyncio.sleep(interval)
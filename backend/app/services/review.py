@@ -1,13 +1,13 @@
 """Review service for handling review operations."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from ..models.content import Reviews, ReviewTag
 from ..core.cache import cache
-from .base import BaseContentService, get_session, DATETIME_FORMAT
+from .base import BaseContentService, ContentView, get_session, DATETIME_FORMAT
 from .review_image import review_image_service
 
 
@@ -27,6 +27,7 @@ class ReviewService(BaseContentService):
         if cached is not None:
             return cached
         
+        snapshot = cache.snapshot((cls.item_tag(item_id),))
         if session is None:
             with get_session() as new_session:
                 tags = new_session.query(ReviewTag.tag).filter(ReviewTag.review_id == item_id).all()
@@ -35,23 +36,9 @@ class ReviewService(BaseContentService):
             tags = session.query(ReviewTag.tag).filter(ReviewTag.review_id == item_id).all()
             result = [tag[0] for tag in tags]
         
-        cache.set_sync(cache_key, result, ttl=30)
+        cache.set_sync(cache_key, result, ttl=cls.CACHE_TTL, since=snapshot)
         return result
     
-    @classmethod
-    def _add_tags(cls, item_id: int, tags: list[str]) -> None:
-        """Add tags for a review."""
-        with get_session() as session:
-            # Remove existing tags
-            session.query(ReviewTag).filter(ReviewTag.review_id == item_id).delete()
-            
-            # Add new tags
-            for tag in tags:
-                session.add(ReviewTag(review_id=item_id, tag=tag))
-        
-        cache.delete_sync(f"review_tags_by_id:{item_id}")
-        cache.delete_sync("review_all_tags")
-    
     @classmethod
     def create(
         cls,
@@ -64,30 +51,37 @@ class ReviewService(BaseContentService):
         author_id: Optional[str] = None
     ) -> int:
         """Create a new review."""
-        # Process thumbnail - use default if not a base64 image (new upload required)
-        thumbnail = review_image_service.process_thumbnail(thumbnail_path, use_default_if_not_base64=True)
+        # Upload the thumbnail and content images in parallel; the
+        # thumbnail falls back to the default unless it is a new upload
+        thumbnail, processed_content, uploaded = review_image_service.process_images(
+            thumbnail_path, content, use_default_if_not_base64=True
+        )
         
-        # Process content images
-        processed_content = review_image_service.process_content_blocks(content)
+        try:
+            with get_session() as session:
+                review = Reviews(
+                    title=title,
+                    author=author,
+                    author_id=author_id,
+                    description=description,
+                    content=processed_content,
+                    thumbnail_path=thumbnail,
+                    created_at=datetime.now().strftime(DATETIME_FORMAT),
+                    updated_at=""
+                )
+                session.add(review)
+                session.flush()
+                cls._adjust_counters(session, total=1, authors={author: 1})
+                review_id: int = int(review.id)  # type: ignore[arg-type]
+                cls._add_tags(session, review_id, tags, replace=False)
+        except Exception:
+            # Don't leave the new uploads orphaned in R2
+            review_image_service.delete_images(uploaded)
+            raise
         
-        with get_session() as session:
-            review = Reviews(
-                title=title,
-                author=author,
-                author_id=author_id,
-                description=description,
-                content=processed_content,
-                thumbnail_path=thumbnail,
-                created_at=datetime.now().strftime(DATETIME_FORMAT),
-                updated_at=""
-            )
-            session.add(review)
-            session.flush()
-            review_id: int = int(review.id)  # type: ignore[arg-type]
-        
-        # Add tags
-        cls._add_tags(review_id, tags)
-        cls._invalidate_cache()
+        # Only after commit, so a failed write leaves the cache alone.
+        # Pass the new ID so a cached "not found" for it is dropped too
+        cls._invalidate_cache(review_id)
         
         return review_id
     
@@ -103,49 +97,56 @@ class ReviewService(BaseContentService):
         thumbnail_path: dict,
         author_id: Optional[str] = None
     ) -> bool:
-        """Update an existing review."""
-        # First, get the existing review to compare images
-        with get_session() as session:
-            review = session.query(Reviews).filter(Reviews.id == review_id).first()
-            
-            if not review:
-                return False
-            
-            # Store old content and thumbnail for cleanup
-            old_content = review.content or []
-            old_thumbnail = review.thumbnail_path
+        """Update an existing review.
+        
+        New images are uploaded first. The row, its tags and the counters
+        then change in one transaction, and images the review no longer uses
+        are deleted only after it commits.
+        """
+        if review_id not in cls.get_known_ids():
+            return False
         
-        # Process thumbnail
-        thumbnail = review_image_service.process_thumbnail(thumbnail_path)
+        # Upload the thumbnail and content images in parallel
+        thumbnail, processed_content, uploaded = review_image_service.process_images(thumbnail_path, content)
         
-        # Process content images
-        processed_content = review_image_service.process_content_blocks(content)
+        try:
+            with get_session() as session:
+                review = session.query(Reviews).filter(Reviews.id == review_id).first()
+                
+                if review:
+                    # Store old content and thumbnail for cleanup
+                    old_content = review.content or []
+                    old_thumbnail = review.thumbnail_path
+                    
+                    cls._adjust_counters(session, authors=cls._count_changes([review.author], [author]))
+                    review.title = title  # type: ignore[assignment]
+                    review.author = author  # type: ignore[assignment]
+                    if author_id is not None:
+                        review.author_id = author_id  # type: ignore[assignment]
+                    review.description = description  # type: ignore[assignment]
+                    review.content = processed_content  # type: ignore[assignment]
+                    review.thumbnail_path = thumbnail  # type: ignore[assignment]
+                    review.updated_at = datetime.now().strftime(DATETIME_FORMAT)  # type: ignore[assignment]
+                    cls._add_tags(session, review_id, tags)
+        except Exception:
+            review_image_service.delete_images(uploaded)
+            raise
         
-        # Clean up orphaned images (old images no longer in use)
+        if not review:
+            # Deleted since the known-ID check
+            review_image_service.delete_images(uploaded)
+            return False
+        
+        # Clean up orphaned images (old images no longer in use), and give
+        # back the references of uploads that turned out to be duplicates
         review_image_service.cleanup_orphaned_images(
             old_content=old_content,
             new_content=processed_content,
             old_thumbnail=old_thumbnail,
-            new_thumbnail=thumbnail
+            new_thumbnail=thumbnail,
+            uploaded_keys=uploaded
         )
         
-        with get_session() as session:
-            review = session.query(Reviews).filter(Reviews.id == review_id).first()
-            
-            if not review:
-                return False
-            
-            review.title = title  # type: ignore[assignment]
-            review.author = author  # type: ignore[assignment]
-            if author_id is not None:
-                review.author_id = author_id  # type: ignore[assignment]
-            review.description = description  # type: ignore[assignment]
-            review.content = processed_content  # type: ignore[assignment]
-            review.thumbnail_path = thumbnail  # type: ignore[assignment]
-            review.updated_at = datetime.now().strftime(DATETIME_FORMAT)  # type: ignore[assignment]
-        
-        # Update tags
-        cls._add_tags(review_id, tags)
         cls._invalidate_cache(review_id)
         
         return True
@@ -163,6 +164,15 @@ class ReviewService(BaseContentService):
             content = review.content or []
             thumbnail = review.thumbnail_path
             
+            tags = [row[0] for row in session.query(ReviewTag.tag).filter(ReviewTag.review_id == review_id)]
+            cls._adjust_counters(
+                session,
+                total=-1,
+                authors={review.author: -1},
+                tags=cls._count_changes(tags, [])
+            )
+            # SQLite only cascades with foreign keys enabled, so don't rely on it
+            session.query(ReviewTag).filter(ReviewTag.review_id == review_id).delete()
             session.delete(review)
         
         # Clean up all images after successful deletion
@@ -179,16 +189,27 @@ class ReviewService(BaseContentService):
         author: str = "",
         author_id: str = "",
         page: int = 1,
-        limit: int = 5
+        limit: int = 5,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        view: ContentView = "full"
     ) -> dict:
         """Search reviews - returns with 'reviews' key for API compatibility."""
-        result = super().search(query, tags, author, author_id, page, limit)
+        result = super().search(
+            query, tags, author, author_id, page, limit, date_from, date_to, view
+        )
         result["reviews"] = result.pop("items")
         return result
     
     @classmethod
-    def get_by_ids(cls, ids: list[int], page: int = 1, limit: int = 5) -> dict:
+    def get_by_ids(
+        cls,
+        ids: list[int],
+        page: int = 1,
+        limit: int = 5,
+        view: ContentView = "full"
+    ) -> dict:
         """Get reviews by IDs - returns with 'reviews' key for API compatibility."""
-        result = super().get_by_ids(ids, page, limit)
+        result = super().get_by_ids(ids, page, limit, view)
         result["reviews"] = result.pop("items")
         return result
@@ -7,8 +7,11 @@ Designed to be easily extractable to a separate microservice in the future.
 
 from __future__ import annotations
 
-from typing import Optional, Any
-from ..core.storage import storage
+from collections import Counter
+from functools import partial
+from typing import BinaryIO, Callable, Iterable, Optional, Any
+from ..core.images import image_details
+from ..core.storage import is_content_addressed, storage, upload_concurrently
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -30,23 +33,23 @@ class ReviewImageService:
     """
     
     @staticmethod
-    def upload_thumbnail(base64_string: str) -> dict[str, str]:
+    def upload_thumbnail(base64_string: str) -> dict[str, Any]:
         """
         Upload a base64 encoded thumbnail image to R2 storage.
         
         Args:
             base64_string: Base64 encoded image data (with data URI prefix)
-            
+        
         Returns:
             Dict with 'link' (public URL) and 'key' (R2 object key)
-            
+        
         Raises:
             ValueError: If the image data is invalid
             Exception: If upload fails
         """
         if not base64_string:
             raise ValueError("Image data is required")
-            
+        
         if not base64_string.startswith("data:image"):
             raise ValueError("Invalid image data format. Expected base64 data URI.")
         
@@ -70,23 +73,23 @@ class ReviewImageService:
             raise
     
     @staticmethod
-    def upload_content_image(base64_string: str) -> dict[str, str]:
+    def upload_content_image(base64_string: str) -> dict[str, Any]:
         """
         Upload a base64 encoded content image to R2 storage.
         
         Args:
             base64_string: Base64 encoded image data (with data URI prefix)
-            
+        
         Returns:
             Dict with 'link' (public URL) and 'key' (R2 object key)
-            
+        
         Raises:
             ValueError: If the image data is invalid
             Exception: If upload fails
         """
         if not base64_string:
             raise ValueError("Image data is required")
-            
+        
         if not base64_string.startswith("data:image"):
             raise ValueError("Invalid image data format. Expected base64 data URI.")
         
@@ -109,6 +112,95 @@ class ReviewImageService:
             )
             raise
     
+    @staticmethod
+    def upload_image_file(fileobj: BinaryIO, content_type: str, thumbnail: bool = False) -> dict[str, Any]:
+        """
+        Upload an image file from a multipart upload to R2 storage.
+        
+        Content blocks and thumbnails can then reference the returned key.
+        
+        Args:
+            fileobj: Readable binary file
+            content_type: MIME type of the image
+            thumbnail: Store in the thumbnails folder instead of the content one
+        
+        Returns:
+            Dict with 'link' (public URL) and 'key' (R2 object key)
+        
+        Raises:
+            ValueError: If the image type is unsupported or the file is too large
+            Exception: If upload fails
+        """
+        folder = REVIEW_THUMBNAILS_FOLDER if thumbnail else REVIEW_CONTENT_FOLDER
+        logger.debug(
+            "Uploading review image file to R2",
+            **{"folder": folder, "image.content_type": content_type}
+        )
+        
+        try:
+            result = storage.upload_file(fileobj, content_type, folder=folder, temporary=True)
+            logger.info(
+                "Review image file uploaded successfully",
+                **{"image.key": result.get("key", "")}
+            )
+            return result
+        except Exception as e:
+            logger.error(
+                f"Failed to upload review image file: {str(e)}",
+                extra={"error.type": type(e).__name__, "error.message": str(e)}
+            )
+            raise
+    
+    @staticmethod
+    def claim_image(key: Any, folders: tuple[str, ...], claimed: list[str]) -> Optional[dict[str, Any]]:
+        """
+        Take a reference to a stored image for one more place that uses it.
+        
+        The upload endpoint only holds its reference until
+        ``UPLOAD_UNUSED_TTL``, so each use takes its own, matching what
+        ``cleanup_orphaned_images`` and ``cleanup_all_images`` release.
+        Those only release keys in this service's folders (content images
+        only from the content folder), so nothing else is claimed.
+        
+        Args:
+            key: Storage key of the image
+            folders: Folders the key may be in for where it is used
+            claimed: List the key is appended to if a reference was taken
+        
+        Returns:
+            Dict with 'link' and 'key' (plus the details of an optimized
+            image), or None if the key is outside ``folders`` or storage
+            doesn't index it
+        """
+        if not key or not isinstance(key, str) or not key.startswith(tuple(folder + "/" for folder in folders)):
+            return None
+        image = storage.acquire(key)
+        if image is not None:
+            claimed.append(key)
+        return image
+    
+    @staticmethod
+    def uploaded_image(image_data: dict[str, Any], folder: str, claimed: list[str]) -> Optional[dict[str, Any]]:
+        """
+        Resolve a key-only reference to an already uploaded image.
+        
+        The link is derived from the key, so clients only need to send the
+        key returned by the upload endpoint.
+        
+        Args:
+            image_data: Dict with a 'key' and no 'link'
+            folder: Folder the key must be in
+            claimed: Keys referenced by this call, see claim_image
+        
+        Returns:
+            Dict with 'link' and 'key' (plus the details of an optimized
+            image), or None if this isn't such a reference
+        """
+        key = image_data.get("key") or ""
+        if image_data.get("link") or not isinstance(key, str) or not key.startswith(folder + "/"):
+            return None
+        return ReviewImageService.claim_image(key, (folder,), claimed) or {"link": storage.public_url(key), "key": key}
+    
     @staticmethod
     def delete_image(key: str) -> bool:
         """
@@ -116,7 +208,7 @@ class ReviewImageService:
         
         Args:
             key: The R2 object key of the image to delete
-            
+        
         Returns:
             True if deletion was successful, False otherwise
         """
@@ -159,15 +251,36 @@ class ReviewImageService:
             return False
     
     @staticmethod
-    def process_thumbnail(image_data: Optional[dict[str, Any]], use_default_if_not_base64: bool = False) -> dict[str, str]:
+    def delete_images(keys: list[str]) -> int:
+        """
+        Delete several images, e.g. uploads whose database write failed.
+        
+        Args:
+            keys: R2 object keys of the images to delete
+        
+        Returns:
+            Number of images deleted
+        """
+        return sum(1 for key in keys if ReviewImageService.delete_image(key))
+    
+    @staticmethod
+    def process_thumbnail(
+        image_data: Optional[dict[str, Any]],
+        use_default_if_not_base64: bool = False,
+        claimed: Optional[list[str]] = None
+    ) -> dict[str, Any]:
         """
         Process thumbnail data - upload to R2 if base64, otherwise return as-is.
         
+        A 'key' from the upload endpoint is accepted in place of a link.
+        
         Args:
             image_data: Dict with 'link' key containing image URL or base64 data
             use_default_if_not_base64: If True, return default image when link is not base64
                                        (used for new posts that require fresh uploads)
-            
+            claimed: Collects the keys of stored images this call took a
+                     reference to, see claim_image
+        
         Returns:
             Dict with 'link' and optionally 'key'
         """
@@ -180,6 +293,11 @@ class ReviewImageService:
             logger.debug("No valid thumbnail data, returning default")
             return DEFAULT_REVIEW_IMAGE.copy()
         
+        claimed = [] if claimed is None else claimed
+        uploaded = ReviewImageService.uploaded_image(image_data, REVIEW_THUMBNAILS_FOLDER, claimed)
+        if uploaded:
+            return uploaded
+        
         link = image_data.get("link", "")
         
         if not link:
@@ -196,16 +314,21 @@ class ReviewImageService:
             return DEFAULT_REVIEW_IMAGE.copy()
         
         # Keep existing URL (for updates where image wasn't changed)
-        return {"link": str(link), "key": image_data.get("key", "")}
+        ReviewImageService.claim_image(image_data.get("key"), (REVIEW_THUMBNAILS_FOLDER, REVIEW_CONTENT_FOLDER), claimed)
+        return {"link": str(link), "key": image_data.get("key", ""), **image_details(image_data)}
     
     @staticmethod
-    def process_content_image(image_data: Optional[dict[str, Any]]) -> dict[str, str]:
+    def process_content_image(image_data: Optional[dict[str, Any]], claimed: Optional[list[str]] = None) -> dict[str, Any]:
         """
         Process content image data - upload to R2 if base64, otherwise return as-is.
         
+        A 'key' from the upload endpoint is accepted in place of a link.
+        
         Args:
             image_data: Dict with 'link' key containing image URL or base64 data
-            
+            claimed: Collects the keys of stored images this call took a
+                     reference to, see claim_image
+        
         Returns:
             Dict with 'link' and optionally 'key'
         """
@@ -217,6 +340,11 @@ class ReviewImageService:
         if not image_data or not isinstance(image_data, dict):
             return DEFAULT_REVIEW_IMAGE.copy()
         
+        claimed = [] if claimed is None else claimed
+        uploaded = ReviewImageService.uploaded_image(image_data, REVIEW_CONTENT_FOLDER, claimed)
+        if uploaded:
+            return uploaded
+        
         link = image_data.get("link", "")
         
         if not link:
@@ -227,7 +355,8 @@ class ReviewImageService:
             return ReviewImageService.upload_content_image(link)
         
         # Keep existing URL
-        return {"link": str(link), "key": image_data.get("key", "")}
+        ReviewImageService.claim_image(image_data.get("key"), (REVIEW_CONTENT_FOLDER,), claimed)
+        return {"link": str(link), "key": image_data.get("key", ""), **image_details(image_data)}
     
     @staticmethod
     def process_content_blocks(content: list[dict]) -> list[dict]:
@@ -236,17 +365,73 @@ class ReviewImageService:
         
         Args:
             content: List of content blocks
-            
+        
         Returns:
             Processed content with uploaded images
         """
+        return ReviewImageService.process_images(None, content)[1]
+    
+    @staticmethod
+    def process_images(
+        thumbnail_data: Optional[dict[str, Any]],
+        content: list[dict],
+        use_default_if_not_base64: bool = False
+    ) -> tuple[dict[str, Any], list[dict], list[str]]:
+        """
+        Process a review's thumbnail and content images together.
+        
+        Base64 images are uploaded concurrently on the shared upload pool
+        and blocks keep their order. If any upload fails, the ones that
+        succeeded are deleted again, the references taken to images that
+        were already stored are released and the error is raised.
+        
+        Args:
+            thumbnail_data: Thumbnail data as accepted by process_thumbnail
+            content: List of content blocks
+            use_default_if_not_base64: Passed through to process_thumbnail
+        
+        Returns:
+            Tuple of (thumbnail, processed content, keys uploaded or
+            referenced by this call)
+        """
+        claimed: list[str] = []
+        uploads: list[Callable[[], dict[str, Any]]] = []
+        # The content block each upload belongs to, or None for the thumbnail
+        targets: list[Optional[dict]] = []
+        
+        thumbnail_link = thumbnail_data.get("link") if isinstance(thumbnail_data, dict) else None
+        if isinstance(thumbnail_link, str) and thumbnail_link.startswith("data:image"):
+            uploads.append(partial(ReviewImageService.upload_thumbnail, thumbnail_link))
+            targets.append(None)
+            thumbnail = DEFAULT_REVIEW_IMAGE.copy()
+        else:
+            thumbnail = ReviewImageService.process_thumbnail(thumbnail_data, use_default_if_not_base64, claimed)
+        
         processed_content = []
         for i, block in enumerate(content):
             if block.get("type") == "image":
-                logger.debug(f"Processing image in content block {i}")
-                block["content"] = ReviewImageService.process_content_image(block.get("content", {}))
+                image_data = block.get("content", {})
+                link = image_data.get("link") if isinstance(image_data, dict) else None
+                if isinstance(link, str) and link.startswith("data:image"):
+                    logger.debug(f"Queueing upload for image in content block {i}")
+                    uploads.append(partial(ReviewImageService.upload_content_image, link))
+                    targets.append(block)
+                else:
+                    block["content"] = ReviewImageService.process_content_image(image_data, claimed)
             processed_content.append(block)
-        return processed_content
+        
+        try:
+            results = upload_concurrently(uploads)
+        except Exception:
+            ReviewImageService.delete_images(claimed)
+            raise
+        for target, result in zip(targets, results):
+            if target is None:
+                thumbnail = result
+            else:
+                target["content"] = result
+        
+        return thumbnail, processed_content, [result["key"] for result in results if result.get("key")] + claimed
     
     @staticmethod
     def validate_image_data(base64_string: str) -> tuple[bool, Optional[str]]:
@@ -255,7 +440,7 @@ class ReviewImageService:
         
         Args:
             base64_string: Base64 encoded image data
-            
+        
         Returns:
             Tuple of (is_valid, error_message)
         """
@@ -292,7 +477,7 @@ class ReviewImageService:
         
         Args:
             content: List of content blocks
-            
+        
         Returns:
             List of R2 object keys for images in the content
         """
@@ -313,7 +498,7 @@ class ReviewImageService:
         
         Args:
             thumbnail_path: Dict with 'link' and 'key'
-            
+        
         Returns:
             R2 object key if valid, None otherwise
         """
@@ -332,7 +517,7 @@ class ReviewImageService:
         
         Args:
             thumbnail_path: Dict with 'link' and 'key'
-            
+        
         Returns:
             URL/link string if valid, None otherwise
         """
@@ -348,41 +533,31 @@ class ReviewImageService:
         old_content: Any,
         new_content: Any,
         old_thumbnail: Any,
-        new_thumbnail: Any
+        new_thumbnail: Any,
+        uploaded_keys: Iterable[str] = ()
     ) -> dict[str, int]:
         """
         Delete images that are no longer used after an update.
         
-        Compares old and new content/thumbnails to find orphaned images
-        and deletes them from R2 storage.
+        Storage refcounts every key it hands out, so each reference the
+        old version held, plus each upload made for this update, is
+        released unless the new version still uses it. That way a
+        re-uploaded duplicate that resolved to a key already in use gives
+        its extra reference back instead of leaking it.
         
         Args:
             old_content: Previous content blocks
             new_content: Updated content blocks
             old_thumbnail: Previous thumbnail data
             new_thumbnail: Updated thumbnail data
-            
+            uploaded_keys: Keys uploaded while processing the update
+        
         Returns:
             Dict with 'deleted' count and 'failed' count
         """
         deleted = 0
         failed = 0
         
-        # Get old and new content image keys
-        old_content_keys = set(ReviewImageService.extract_image_keys_from_content(old_content or []))
-        new_content_keys = set(ReviewImageService.extract_image_keys_from_content(new_content or []))
-        
-        # Find orphaned content images (in old but not in new)
-        orphaned_content_keys = old_content_keys - new_content_keys
-        
-        for key in orphaned_content_keys:
-            logger.debug(f"Deleting orphaned review content image: {key}")
-            if ReviewImageService.delete_image(key):
-                deleted += 1
-            else:
-                failed += 1
-        
-        # Check thumbnail change
         old_thumb_key = ReviewImageService.extract_thumbnail_key(old_thumbnail)
         new_thumb_key = ReviewImageService.extract_thumbnail_key(new_thumbnail)
         old_thumb_link = ReviewImageService.extract_thumbnail_link(old_thumbnail)
@@ -394,22 +569,28 @@ class ReviewImageService:
             f"new_link: {new_thumb_link[:50] if new_thumb_link else None}..."
         )
         
-        # Delete old thumbnail if:
-        # 1. Old thumbnail has a valid R2 key AND
-        # 2. Either the key changed OR the link changed (meaning a new image was uploaded)
-        thumbnail_changed = (
-            old_thumb_key and 
-            (old_thumb_key != new_thumb_key or old_thumb_link != new_thumb_link)
-        )
-        
-        if thumbnail_changed and old_thumb_key:
-            logger.info(f"Deleting orphaned review thumbnail: {old_thumb_key}")
-            if ReviewImageService.delete_image(old_thumb_key):
-                deleted += 1
-            else:
-                failed += 1
-        elif old_thumb_key:
-            logger.debug(f"Thumbnail unchanged, keeping: {old_thumb_key}")
+        # Same key under a different link means the old image was replaced
+        if new_thumb_key == old_thumb_key and new_thumb_link != old_thumb_link:
+            new_thumb_key = None
+        
+        held = Counter(ReviewImageService.extract_image_keys_from_content(old_content or []))
+        held.update([old_thumb_key] if old_thumb_key else [])
+        held.update(key for key in uploaded_keys if key)
+        
+        kept = Counter(ReviewImageService.extract_image_keys_from_content(new_content or []))
+        kept.update([new_thumb_key] if new_thumb_key else [])
+        
+        for key, count in (held - kept).items():
+            if kept[key] and not is_content_addressed(key):
+                # Keys from before content addressing aren't refcounted, so
+                # releasing one that is still in use would delete it
+                continue
+            for _ in range(count):
+                logger.debug(f"Deleting orphaned review image: {key}")
+                if ReviewImageService.delete_image(key):
+                    deleted += 1
+                else:
+                    failed += 1
         
         if deleted > 0 or failed > 0:
             logger.info(
@@ -430,7 +611,7 @@ class ReviewImageService:
         Args:
             content: Content blocks with images
             thumbnail: Thumbnail data
-            
+        
         Returns:
             Dict with 'deleted' count and 'failed' count
         """
@@ -0,0 +1,179 @@
+"""Composable search over blog posts and reviews."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+from math import ceil
+from typing import Any, Optional
+
+from sqlalchemy import or_
+
+from ..core.cache import cache
+from ..core.fulltext import fulltext_table, match_clause, match_expression, rank
+from .base import DATETIME_FORMAT, ContentView, get_session, paginate
+
+
+class ContentSearch:
+    """Builds one SQL statement from any mix of search filters.
+    
+    Every filter that is set is ANDed into the same query, so a request
+    can combine text, tags, author, author_id and a date range instead of
+    the first non-empty one winning. Text goes through the FTS5 index when
+    it is available, ranking results by BM25; otherwise, and for plain
+    listings, results are ordered newest first. Each page, its items' tags
+    and the total come back from one statement (see ``paginate``).
+    
+    Usage:
+        ContentSearch(BlogService).text("loki").tags(["mcu"]).fetch_cached(1, 5)
+    """
+    
+    def __init__(self, service: Any):
+        self._service = service
+        self._model = service.model
+        self._text = ""
+        self._tags: tuple[str, ...] = ()
+        self._author = ""
+        self._author_id = ""
+        self._date_from: Optional[date] = None
+        self._date_to: Optional[date] = None
+        self._ids: Optional[list[int]] = None
+        self._view: ContentView = "full"
+    
+    def text(self, query: str) -> ContentSearch:
+        """Match words in the title or description, each word as a prefix.
+        
+        Without the full-text index this falls back to a case-insensitive
+        substring match.
+        """
+        self._text = query.strip().lower()
+        return self
+    
+    def tags(self, tags: Optional[list[str]]) -> ContentSearch:
+        """Require every one of ``tags``."""
+        self._tags = tuple(sorted({tag for tag in tags or () if tag}))
+        return self
+    
+    def author(self, author: str) -> ContentSearch:
+        """Match a substring of the author name (case-insensitive)."""
+        self._author = author.strip().lower()
+        return self
+    
+    def author_id(self, author_id: str) -> ContentSearch:
+        """Match an exact author ID."""
+        self._author_id = author_id.strip()
+        return self
+    
+    def created_between(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> ContentSearch:
+        """Limit to items created on or after ``date_from`` and on or before ``date_to``."""
+        self._date_from = date_from
+        self._date_to = date_to
+        return self
+    
+    def within(self, ids: list[int]) -> ContentSearch:
+        """Limit to a fixed set of item IDs."""
+        self._ids = list(ids)
+        return self
+    
+    def view(self, view: ContentView) -> ContentSearch:
+        """Return ``summary`` items (no article body) or ``full`` ones."""
+        self._view = view
+        return self
+    
+    def cache_key(self, page: int, limit: int) -> str:
+        """Key for this search, identical for equivalent filter combinations."""
+        filters = {
+            "text": self._text,
+            "tags": self._tags,
+            "author": self._author,
+            "author_id": self._author_id,
+            "from": self._date_from.isoformat() if self._date_from else None,
+            "to": self._date_to.isoformat() if self._date_to else None,
+            "view": self._view if self._view != "full" else None,
+        }
+        # Drop unset filters so adding a default doesn't change existing keys
+        filters = {name: value for name, value in filters.items() if value}
+        return (
+            f"{self._service.cache_prefix}_search:"
+            f"{json.dumps(filters, sort_keys=True, separators=(',', ':'))}:{page}:{limit}"
+        )
+    
+    def _filters(self) -> list[Any]:
+        model = self._model
+        filters: list[Any] = []
+        
+        if self._ids is not None:
+            filters.append(model.id.in_(self._ids))
+        if self._text and self._fulltext() is None:
+            filters.append(or_(
+                model.title.ilike(f'%{self._text}%'),
+                model.description.ilike(f'%{self._text}%')
+            ))
+        if self._tags and self._service.tag_model:
+            filters.append(model.id.in_(self._service._ids_with_all_tags(list(self._tags))))
+        if self._author_id:
+            filters.append(model.author_id == self._author_id)
+        if self._author:
+            filters.append(model.author.ilike(f'%{self._author}%'))
+        # created_at is stored as DATETIME_FORMAT text, which sorts chronologically
+        if self._date_from:
+            filters.append(model.created_at >= self._date_from.strftime(DATETIME_FORMAT))
+        if self._date_to:
+            filters.append(
+                model.created_at < (self._date_to + timedelta(days=1)).strftime(DATETIME_FORMAT)
+            )
+        return filters
+    
+    def _fulltext(self) -> Optional[tuple[Any, str]]:
+        """The FTS table and MATCH expression for the text filter, if FTS applies."""
+        if not self._text:
+            return None
+        fts = fulltext_table(self._model.__tablename__)
+        expression = match_expression(self._text)
+        if fts is None or expression is None:
+            return None
+        return fts, expression
+    
+    def fetch(self, page: int = 1, limit: int = 5) -> dict:
+        """Run the search, returning a page of processed items and the total."""
+        if self._ids is not None and not self._ids:
+            return {"items": [], "total": 0, "total_pages": 0, "page": page}
+        
+        model = self._model
+        
+        with get_session() as session:
+            query = self._service._page_query(session, self._view).filter(*self._filters())
+            order_by = [model.created_at.desc(), model.id.desc()]
+            
+            fulltext = self._fulltext()
+            if fulltext:
+                fts, expression = fulltext
+                query = (
+                    query
+                    .join(fts, fts.c.rowid == model.id)
+                    .filter(match_clause(fts, expression))
+                )
+                order_by.insert(0, rank(fts))
+            
+            rows, total = paginate(query.order_by(*order_by), page, limit)
+            items = self._service._process_rows(rows, self._view)
+        
+        return {
+            "items": items,
+            "total": total,
+            "total_pages": ceil(total / limit) if total > 0 else 0,
+            "page": page
+        }
+    
+    def fetch_cached(self, page: int = 1, limit: int = 5) -> dict:
+        """``fetch`` through the cache, under the content type's tag so writes invalidate it."""
+        return cache.get_or_compute(
+            self.cache_key(page, limit),
+            lambda: self.fetch(page, limit),
+            ttl=self._service.CACHE_TTL,
+            tags=(self._service.cache_prefix,)
+        )
@@ -1,11 +1,17 @@
 """Timeline service for handling MCU project timeline operations."""
 
+import json
 from math import ceil
 from typing import Optional
 
+from sqlalchemy import tuple_
+
 from ..models.content import Timeline
 from ..core.cache import cache
-from .base import get_session
+from ..core.pagination import decode_cursor, encode_cursor
+from ..core.fulltext import fulltext_table, match_clause, match_expression, rank
+from .base import get_session, paginate
+from .counters import CounterService
 
 
 class TimelineService:
@@ -13,32 +19,46 @@ class TimelineService:
     
     cache_prefix = "timeline"
     
+    # How long a lookup for a missing ID is remembered
+    NOT_FOUND_TTL = 30
+    
     @classmethod
     def count(cls) -> int:
-        """Get total count of timeline projects."""
+        """Get total count of timeline projects, read from the counters table."""
         cache_key = f"{cls.cache_prefix}_count"
         cached = cache.get_sync(cache_key)
         if cached is not None:
             return cached
         
         with get_session() as session:
-            count = session.query(Timeline).count()
-            cache.set_sync(cache_key, count, ttl=300)
+            count = CounterService.get_total(session, cls.cache_prefix)
+            if count is None:
+                CounterService.reconcile(session, cls.cache_prefix, Timeline, count_authors=False)
+                count = session.query(Timeline).count()
+            cache.set_sync(cache_key, count, ttl=300, tags=(cls.cache_prefix,))
             return count
     
+    @classmethod
+    def reconcile_counters(cls) -> int:
+        """Recompute the project total, returning how many counters had drifted."""
+        with get_session() as session:
+            drift = CounterService.reconcile(session, cls.cache_prefix, Timeline, count_authors=False)
+        
+        if drift:
+            cache.invalidate_tags_sync(cls.cache_prefix)
+        return drift
+    
     @classmethod
     def get_all(cls) -> list[dict]:
         """Get all timeline projects."""
-        cache_key = f"{cls.cache_prefix}_all"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+        def _load() -> list[dict]:
+            with get_session() as session:
+                projects = session.query(Timeline).all()
+                return [project.to_dict() for project in projects]
         
-        with get_session() as session:
-            projects = session.query(Timeline).all()
-            result = [project.to_dict() for project in projects]
-            cache.set_sync(cache_key, result, ttl=300)
-            return result
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_all", _load, ttl=300, stale_ttl=900
+        )
     
     @classmethod
     def get_paginated(cls, page: int = 1, limit: int = 10) -> dict:
@@ -49,34 +69,82 @@ class TimelineService:
             return cached
         
         with get_session() as session:
-            total = session.query(Timeline).count()
-            offset = (page - 1) * limit
-            
-            if offset >= total:
-                return {
-                    "projects": [],
-                    "total": total,
-                    "total_pages": ceil(total / limit) if total > 0 else 0,
-                    "page": page
-                }
-            
-            projects = (
-                session.query(Timeline)
-                .order_by(Timeline.phase.asc(), Timeline.id.asc())
-                .offset(offset)
-                .limit(limit)
-                .all()
+            # Page and total (from the counters table) in one statement
+            rows, total = paginate(
+                session.query(Timeline).order_by(Timeline.phase.asc(), Timeline.id.asc()),
+                page,
+                limit,
+                total=CounterService.total_column(cls.cache_prefix)
             )
+            projects = [row[0] for row in rows]
             
             result = {
                 "projects": [project.to_dict() for project in projects],
                 "total": total,
-                "total_pages": ceil(total / limit),
-                "page": page
+                "total_pages": ceil(total / limit) if total > 0 else 0,
+                "page": page,
+                # Lets page-number clients switch to get_after from here
+                "next_cursor": cls.cursor_for(projects[-1]) if projects and page * limit < total else None
             }
-            cache.set_sync(cache_key, result, ttl=120)
+            cache.set_sync(cache_key, result, ttl=120, tags=(cls.cache_prefix,))
             return result
     
+    @classmethod
+    def parse_cursor(cls, cursor: str) -> tuple[int, int]:
+        """Decode a ``next_cursor`` from ``get_after`` or ``get_paginated``.
+        
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        return decode_cursor(cursor, (int, int))
+    
+    @classmethod
+    def cursor_for(cls, project: Timeline) -> str:
+        """Cursor pointing just past ``project`` in (phase, id) order."""
+        return encode_cursor((project.phase, project.id))
+    
+    @classmethod
+    def get_after(cls, after: Optional[tuple[int, int]] = None, limit: int = 10) -> dict:
+        """Get the page of projects following ``after`` (keyset pagination).
+        
+        Pages are keyed on (phase, id), which the phase index covers, so
+        deep pages cost the same as the first. ``after`` comes from
+        ``parse_cursor``; None starts at the first project.
+        
+        Returns:
+            Dict with ``projects``, ``total`` and ``next_cursor`` (None on
+            the last page).
+        """
+        def _load() -> dict:
+            with get_session() as session:
+                query = session.query(
+                    Timeline, CounterService.total_column(cls.cache_prefix).label("total")
+                )
+                if after is not None:
+                    query = query.filter(tuple_(Timeline.phase, Timeline.id) > after)
+                
+                # One extra row tells whether another page follows
+                rows = (
+                    query
+                    .order_by(Timeline.phase.asc(), Timeline.id.asc())
+                    .limit(limit + 1)
+                    .all()
+                )
+                page = [row[0] for row in rows[:limit]]
+                
+                return {
+                    "projects": [project.to_dict() for project in page],
+                    "total": rows[0].total if rows and rows[0].total is not None else cls.count(),
+                    "next_cursor": cls.cursor_for(page[-1]) if len(rows) > limit else None
+                }
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_after:{json.dumps(after)}:{limit}",
+            _load,
+            ttl=120,
+            tags=(cls.cache_prefix,)
+        )
+    
     @classmethod
     def search(
         cls,
@@ -85,51 +153,72 @@ class TimelineService:
         page: int = 1,
         limit: int = 10
     ) -> dict:
-        """Search timeline projects by name or filter by phase."""
+        """Search timeline projects by name or filter by phase.
+        
+        Name matches use the FTS5 index when available, ranked by BM25,
+        and fall back to a substring match otherwise.
+        """
         with get_session() as session:
             base_query = session.query(Timeline)
+            order_by = [Timeline.phase.asc(), Timeline.id.asc()]
             
             if phase is not None:
                 base_query = base_query.filter(Timeline.phase == phase)
             
             if query:
-                base_query = base_query.filter(Timeline.name.ilike(f'%{query}%'))
+                fts = fulltext_table(Timeline.__tablename__)
+                expression = match_expression(query)
+                if fts is not None and expression is not None:
+                    base_query = (
+                        base_query
+                        .join(fts, fts.c.rowid == Timeline.id)
+                        .filter(match_clause(fts, expression))
+                    )
+                    order_by.insert(0, rank(fts))
+                else:
+                    base_query = base_query.filter(Timeline.name.ilike(f'%{query}%'))
             
-            total = base_query.count()
-            offset = (page - 1) * limit
-            
-            projects = (
-                base_query
-                .order_by(Timeline.phase.asc(), Timeline.id.asc())
-                .offset(offset)
-                .limit(limit)
-                .all()
-            )
+            rows, total = paginate(base_query.order_by(*order_by), page, limit)
             
             return {
-                "projects": [project.to_dict() for project in projects],
+                "projects": [row[0].to_dict() for row in rows],
                 "total": total,
                 "total_pages": ceil(total / limit) if total > 0 else 0,
                 "page": page
             }
     
+    @classmethod
+    def get_known_ids(cls) -> frozenset[int]:
+        """Get the exact set of existing project IDs."""
+        def _load() -> frozenset[int]:
+            with get_session() as session:
+                return frozenset(row[0] for row in session.query(Timeline.id).all())
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_ids", _load, ttl=300, tags=(cls.cache_prefix,)
+        )
+    
     @classmethod
     def get_by_id(cls, project_id: int) -> Optional[dict]:
-        """Get a single project by ID."""
-        cache_key = f"{cls.cache_prefix}_id:{project_id}"
-        cached = cache.get_sync(cache_key)
-        if cached is not None:
-            return cached
+        """Get a single project by ID.
         
-        with get_session() as session:
-            project = session.query(Timeline).filter(Timeline.id == project_id).first()
-            
-            if not project:
-                return None
-            
-            result = project.to_dict()
-            cache.set_sync(cache_key, result, ttl=60)
-            return result
+        IDs missing from ``get_known_ids`` return None without a query, and
+        misses that do reach the database are cached for ``NOT_FOUND_TTL``.
+        """
+        if project_id not in cls.get_known_ids():
+            return None
+        
+        def _load() -> Optional[dict]:
+            with get_session() as session:
+                project = session.query(Timeline).filter(Timeline.id == project_id).first()
+                return project.to_dict() if project else None
+        
+        return cache.get_or_compute(
+            f"{cls.cache_prefix}_id:{project_id}",
+            _load,
+            ttl=60,
+            negative_ttl=cls.NOT_FOUND_TTL
+        )
     
     @classmethod
     def get_by_phase(cls, phase: int) -> list[dict]:
@@ -145,6 +234,35 @@ class TimelineService:
             cache.set_sync(cache_key, result, ttl=60)
             return result
     
+    @classmethod
+    def get_many(cls, ids: list[int]) -> list[dict]:
+        """Get projects by ID in the given order, skipping IDs that don't exist.
+        
+        Uncached projects are loaded with one IN query and cached under
+        their ``get_by_id`` keys.
+        """
+        known_ids = cls.get_known_ids()
+        ids = [project_id for project_id in ids if project_id in known_ids]
+        
+        found: dict[int, dict] = {}
+        missing = []
+        for project_id in dict.fromkeys(ids):
+            cached = cache.get_sync(f"{cls.cache_prefix}_id:{project_id}")
+            if cached is not None:
+                found[project_id] = cached
+            else:
+                missing.append(project_id)
+        
+        if missing:
+            with get_session() as session:
+                projects = session.query(Timeline).filter(Timeline.id.in_(missing)).all()
+                for project in projects:
+                    result = project.to_dict()
+                    found[project.id] = result
+                    cache.set_sync(f"{cls.cache_prefix}_id:{project.id}", result, ttl=60)
+        
+        return [found[project_id] for project_id in ids if project_id in found]
+    
     @classmethod
     def get_by_ids(cls, ids: list[int], page: int = 1, limit: int = 5) -> dict:
         """Get projects by IDs with pagination."""
@@ -156,16 +274,9 @@ class TimelineService:
         end_idx = min(start_idx + limit, total)
         page_ids = ids[start_idx:end_idx]
         
-        with get_session() as session:
-            items = []
-            for project_id in page_ids:
-                project = session.query(Timeline).filter(Timeline.id == project_id).first()
-                if project:
-                    items.append(project.to_dict())
-            
-            return {
-                "projects": items,
-                "total": total,
-                "total_pages": ceil(total / limit),
-                "page": page
-            }
+        return {
+            "projects": cls.get_many(page_ids),
+            "total": total,
+            "total_pages": ceil(total / limit),
+            "page": page
+        }
@@ -7,8 +7,8 @@ Designed to be easily extractable to a separate microservice in the future.
 
 from __future__ import annotations
 
-from typing import Optional
-from ..core.storage import storage
+from typing import Any, BinaryIO, Optional
+from ..core.storage import is_content_addressed, storage
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -23,26 +23,39 @@ class TopicImageService:
     
     This service is designed to be stateless and easily movable to a separate
     microservice. All it needs is access to R2 storage.
+    
+    Uploads return a delete handle as their 'key' rather than the storage
+    key, which anyone with the same image could compute.
     """
     
     @staticmethod
-    def upload_image(base64_string: str) -> dict[str, str]:
+    def with_handle(result: dict[str, Any]) -> dict[str, Any]:
+        """Swap the storage key of an upload result for a delete handle."""
+        try:
+            handle = storage.issue_handle(result["key"])
+        except Exception:
+            storage.delete_image(result["key"])
+            raise
+        return {**result, "key": handle}
+    
+    @staticmethod
+    def upload_image(base64_string: str) -> dict[str, Any]:
         """
         Upload a base64 encoded image to R2 storage.
         
         Args:
             base64_string: Base64 encoded image data (with data URI prefix)
-            
+        
         Returns:
-            Dict with 'link' (public URL) and 'key' (R2 object key)
-            
+            Dict with 'link' (public URL) and 'key' (delete handle)
+        
         Raises:
             ValueError: If the image data is invalid
             Exception: If upload fails
         """
         if not base64_string:
             raise ValueError("Image data is required")
-            
+        
         if not base64_string.startswith("data:image"):
             raise ValueError("Invalid image data format. Expected base64 data URI.")
         
@@ -57,7 +70,7 @@ class TopicImageService:
                 "Topic image uploaded successfully",
                 **{"image.key": result.get("key", "")}
             )
-            return result
+            return TopicImageService.with_handle(result)
         except Exception as e:
             logger.error(
                 f"Failed to upload topic image: {str(e)}",
@@ -65,14 +78,50 @@ class TopicImageService:
             )
             raise
     
+    @staticmethod
+    def upload_image_file(fileobj: BinaryIO, content_type: str) -> dict[str, Any]:
+        """
+        Upload an image file from a multipart upload to R2 storage.
+        
+        Args:
+            fileobj: Readable binary file
+            content_type: MIME type of the image
+        
+        Returns:
+            Dict with 'link' (public URL) and 'key' (delete handle)
+        
+        Raises:
+            ValueError: If the image type is unsupported or the file is too large
+            Exception: If upload fails
+        """
+        logger.debug(
+            "Uploading topic image file to R2",
+            **{"folder": TOPIC_IMAGES_FOLDER, "image.content_type": content_type}
+        )
+        
+        try:
+            result = storage.upload_file(fileobj, content_type, folder=TOPIC_IMAGES_FOLDER)
+            logger.info(
+                "Topic image file uploaded successfully",
+                **{"image.key": result.get("key", "")}
+            )
+            return TopicImageService.with_handle(result)
+        except Exception as e:
+            logger.error(
+                f"Failed to upload topic image file: {str(e)}",
+                extra={"error.type": type(e).__name__, "error.message": str(e)}
+            )
+            raise
+    
     @staticmethod
     def delete_image(key: str) -> bool:
         """
         Delete an image from R2 storage.
         
         Args:
-            key: The R2 object key of the image to delete
-            
+            key: The delete handle returned by the upload, or the R2 object
+                 key of an image uploaded before handles existed
+        
         Returns:
             True if deletion was successful, False otherwise
         """
@@ -80,6 +129,19 @@ class TopicImageService:
             logger.debug("No image key provided for deletion")
             return False
         
+        if "/" not in key:
+            try:
+                result = storage.release_handle(key)
+                if not result:
+                    logger.warning("Unknown topic image handle")
+                return result
+            except Exception as e:
+                logger.error(
+                    f"Failed to delete topic image: {str(e)}",
+                    extra={"error.type": type(e).__name__, "error.message": str(e)}
+                )
+                return False
+        
         # Validate the key belongs to topic-images folder for safety
         if not key.startswith(TOPIC_IMAGES_FOLDER + "/"):
             logger.warning(
@@ -88,6 +150,15 @@ class TopicImageService:
             )
             return False
         
+        # Content-addressed keys can be computed from the image, so only
+        # their handle may release them
+        if is_content_addressed(key):
+            logger.warning(
+                "Attempted to delete topic image by storage key",
+                **{"image.key": key}
+            )
+            return False
+        
         logger.debug(
             "Deleting topic image from R2",
             **{"image.key": key}
@@ -120,7 +191,7 @@ class TopicImageService:
         
         Args:
             base64_string: Base64 encoded image data
-            
+        
         Returns:
             Tuple of (is_valid, error_message)
         """
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Any, Optional
-from math import ceil
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.user import User, Session, BlogLike, ReviewLike, ProjectLike
+from .base import ContentView
 from .blog import BlogService
 from .review import ReviewService
 
@@ -53,7 +53,7 @@ class UserService:
                 "username": user.username,
                 "display_username": user.display_username
             }
-            
+        
         except Exception as e:
             print(f"Error getting user from token: {e}")
             return None
@@ -82,7 +82,7 @@ class UserService:
                 "reviews": reviews,
                 "projects": projects
             }
-            
+        
         except Exception as e:
             print(f"Error getting liked content: {e}")
             return {"blogs": [], "reviews": [], "projects": []}
@@ -94,48 +94,13 @@ class UserService:
         tags: Optional[list[str]] = None,
         author: str = "",
         page: int = 1,
-        limit: int = 5
+        limit: int = 5,
+        view: ContentView = "full"
     ) -> dict[str, Any]:
         """Search within user's liked blogs."""
-        if not liked_ids:
-            return {"blogs": [], "total": 0, "total_pages": 0, "page": page}
-        
-        # Get all liked blogs
-        all_blogs = []
-        for blog_id in liked_ids:
-            blog = BlogService.get_by_id(blog_id)
-            if blog:
-                all_blogs.append(blog)
-        
-        # Filter based on criteria
-        filtered = []
-        for blog in all_blogs:
-            # Check query match
-            title_match = query.lower() in blog['title'].lower() if query else True
-            desc_match = query.lower() in blog.get('description', '').lower() if query and not title_match else False
-            
-            # Check tags
-            tag_match = all(tag in blog.get('tags', []) for tag in (tags or []))
-            
-            # Check author
-            author_match = author.lower() in blog['author'].lower() if author else True
-            
-            if (title_match or desc_match) and tag_match and author_match:
-                filtered.append(blog)
-        
-        # Paginate
-        total = len(filtered)
-        total_pages = ceil(total / limit)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paged = filtered[start_idx:end_idx] if start_idx < total else []
-        
-        return {
-            "blogs": paged,
-            "total": total,
-            "total_pages": total_pages,
-            "page": page
-        }
+        result = BlogService.search_within(liked_ids, query, tags, author, page, limit, view)
+        result["blogs"] = result.pop("items")
+        return result
     
     @staticmethod
     def search_liked_reviews(
@@ -144,40 +109,10 @@ class UserService:
         tags: Optional[list[str]] = None,
         author: str = "",
         page: int = 1,
-        limit: int = 5
+        limit: int = 5,
+        view: ContentView = "full"
     ) -> dict[str, Any]:
         """Search within user's liked reviews."""
-        if not liked_ids:
-            return {"reviews": [], "total": 0, "total_pages": 0, "page": page}
-        
-        # Get all liked reviews
-        all_reviews = []
-        for review_id in liked_ids:
-            review = ReviewService.get_by_id(review_id)
-            if review:
-                all_reviews.append(review)
-        
-        # Filter based on criteria
-        filtered = []
-        for review in all_reviews:
-            title_match = query.lower() in review['title'].lower() if query else True
-            desc_match = query.lower() in review.get('description', '').lower() if query and not title_match else False
-            tag_match = all(tag in review.get('tags', []) for tag in (tags or []))
-            author_match = author.lower() in review['author'].lower() if author else True
-            
-            if (title_match or desc_match) and tag_match and author_match:
-                filtered.append(review)
-        
-        # Paginate
-        total = len(filtered)
-        total_pages = ceil(total / limit)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paged = filtered[start_idx:end_idx] if start_idx < total else []
-        
-        return {
-            "reviews": paged,
-            "total": total,
-            "total_pages": total_pages,
-            "page": page
-        }
+        result = ReviewService.search_within(liked_ids, query, tags, author, page, limit, view)
+        result["reviews"] = result.pop("items")
+        return result
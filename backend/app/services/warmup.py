@@ -0,0 +1,75 @@
+"""Startup cache warm-up for the hottest read paths."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable
+
+from ..core.async_utils import run_sync
+from ..core.logging import get_logger
+from .blog import BlogService
+from .review import ReviewService
+from .timeline import TimelineService
+
+logger = get_logger(__name__)
+
+
+def _warmup_calls() -> list[tuple[str, Callable[[], Any]]]:
+    """The service calls behind the landing, list and filter pages."""
+    calls: list[tuple[str, Callable[[], Any]]] = []
+    for service in (BlogService, ReviewService):
+        prefix = service.cache_prefix
+        calls += [
+            (f"{prefix}_count", service.count),
+            (f"{prefix}_page:full:1:5", lambda s=service: s.get_page(1, 5)),
+            (f"{prefix}_latest:3", lambda s=service: s.get_latest(3)),
+            (f"{prefix}_tag_counts", service.get_all_tags),
+            (f"{prefix}_author_counts", service.get_all_authors),
+            (f"{prefix}_ids", service.get_known_ids),
+        ]
+    calls += [
+        ("timeline_all", TimelineService.get_all),
+        ("timeline_ids", TimelineService.get_known_ids),
+    ]
+    return calls
+
+
+async def warm_up_cache(timeout: float) -> None:
+    """Preload hot cache keys concurrently, waiting at most ``timeout`` seconds.
+    
+    Loads still running when the budget runs out are left to finish in
+    the background rather than cancelled, so they still fill the cache.
+    Failures are logged and never stop startup.
+    """
+    start = time.monotonic()
+    tasks = {
+        asyncio.create_task(run_sync(func)): name
+        for name, func in _warmup_calls()
+    }
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    
+    def _report_failure(task: asyncio.Task) -> bool:
+        if task.cancelled() or task.exception() is None:
+            return False
+        logger.warning(
+            f"Cache warm-up failed for '{tasks[task]}': {task.exception()}",
+            **{"cache.key": tasks[task]}
+        )
+        return True
+    
+    failed = [task for task in done if _report_failure(task)]
+    for task in pending:
+        task.add_done_callback(_report_failure)
+    
+    duration_ms = round((time.monotonic() - start) * 1000, 2)
+    logger.info(
+        f"Cache warm-up finished in {duration_ms}ms",
+        **{
+            "cache.warmup.duration_ms": duration_ms,
+            "cache.warmup.loaded": len(done) - len(failed),
+            "cache.warmup.failed": len(failed),
+            "cache.warmup.pending": len(pending),
+            "event": "cache_warmup",
+        }
+    )
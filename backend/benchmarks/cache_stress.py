@@ -0,0 +1,162 @@
+"""
+Concurrency stress benchmark for the in-process cache.
+
+Hammers a Cache from many threads (the way the DB executor does) while an
+event loop runs aget_or_compute against the same keys, then checks that
+no value was ever returned for the wrong key and that the entry/byte
+accounting still adds up. Reports throughput per thread count for a
+single-lock cache (shards=1) and the striped default. On a GIL build the
+interpreter bounds total throughput, so the numbers mainly show that
+striping adds no overhead; lock waits drop, but the gain is small next
+to the GIL itself.
+
+Run from the backend directory (needs the usual .env so app settings load):
+    python -m benchmarks.cache_stress --threads 1,2,4,8 --shards 1,16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from app.core.cache import Cache
+
+TAGS = ("blog", "review", "timeline")
+
+
+def expected_value(key: str) -> tuple[str, int]:
+    """The only value any loader or writer ever stores for a key."""
+    return (key, len(key))
+
+
+def check_value(key: str, value: object, errors: list[str]) -> None:
+    if value is not None and value != expected_value(key):
+        errors.append(f"{key!r} returned {value!r}")
+
+
+def thread_worker(
+    cache: Cache,
+    keys: list[str],
+    ops: int,
+    seed: int,
+    errors: list[str],
+    start: threading.Barrier
+) -> None:
+    rng = random.Random(seed)
+    start.wait()
+    for _ in range(ops):
+        key = rng.choice(keys)
+        roll = rng.random()
+        try:
+            if roll < 0.70:
+                check_value(key, cache.get_or_compute(
+                    key, lambda: expected_value(key), ttl=60, tags=(key.split("_")[0],)
+                ), errors)
+            elif roll < 0.85:
+                check_value(key, cache.get_sync(key), errors)
+            elif roll < 0.95:
+                cache.set_sync(key, expected_value(key), ttl=60, tags=(key.split("_")[0],))
+            elif roll < 0.99:
+                cache.delete_sync(key)
+            else:
+                cache.invalidate_tags_sync(rng.choice(TAGS))
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+
+
+async def async_worker(cache: Cache, keys: list[str], stop: threading.Event, errors: list[str]) -> int:
+    rng = random.Random(0)
+    calls = 0
+    
+    async def _load(key: str) -> tuple[str, int]:
+        await asyncio.sleep(0)
+        return expected_value(key)
+    
+    while not stop.is_set():
+        key = rng.choice(keys)
+        value = await cache.aget_or_compute(key, lambda: _load(key), ttl=60)
+        check_value(key, value, errors)
+        calls += 1
+    return calls
+
+
+def check_accounting(cache: Cache, max_entries: int, errors: list[str]) -> None:
+    stats = cache.stats()
+    prefixes = stats["prefixes"].values()
+    if sum(p["entries"] for p in prefixes) != stats["entries"]:
+        errors.append("per-prefix entry counts do not add up to the cache size")
+    if sum(p["bytes"] for p in prefixes) != stats["bytes"]:
+        errors.append("per-prefix byte counts do not add up to the cache size")
+    if stats["entries"] != len(cache):
+        errors.append("stats() and len() disagree on the number of entries")
+    # Per-shard limits are rounded up, so allow one extra entry per shard
+    if stats["entries"] > max_entries + stats["shards"]:
+        errors.append(f"{stats['entries']} entries exceeds the limit of {max_entries}")
+
+
+def run(threads: int, shards: int, ops: int, num_keys: int, max_entries: int) -> tuple[float, list[str]]:
+    cache = Cache(max_entries=max_entries, shards=shards)
+    keys = [f"{TAGS[i % len(TAGS)]}_key:{i}" for i in range(num_keys)]
+    errors: list[str] = []
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    
+    loop_result: list[int] = []
+    loop_thread = threading.Thread(
+        target=lambda: loop_result.append(asyncio.run(async_worker(cache, keys, stop, errors)))
+    )
+    loop_thread.start()
+    
+    workers = [
+        threading.Thread(
+            target=thread_worker,
+            args=(cache, keys, ops // threads, seed, errors, start)
+        )
+        for seed in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - began
+    
+    stop.set()
+    loop_thread.join()
+    check_accounting(cache, max_entries, errors)
+    cache.shutdown()
+    return ops / elapsed, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated thread counts")
+    parser.add_argument("--shards", default="1,16", help="Comma-separated shard counts")
+    parser.add_argument("--ops", type=int, default=200_000, help="Operations per run")
+    parser.add_argument("--keys", type=int, default=5_000, help="Distinct keys")
+    parser.add_argument("--max-entries", type=int, default=2_000, help="Cache entry limit (below --keys to force eviction)")
+    args = parser.parse_args()
+    
+    thread_counts = [int(t) for t in args.threads.split(",")]
+    shard_counts = [int(s) for s in args.shards.split(",")]
+    
+    print(f"{'shards':>6} {'threads':>7} {'ops/s':>12} {'vs 1 thread':>11}  result")
+    failed = False
+    for shards in shard_counts:
+        baseline = None
+        for threads in thread_counts:
+            throughput, errors = run(threads, shards, args.ops, args.keys, args.max_entries)
+            baseline = baseline or throughput
+            result = "ok" if not errors else f"{len(errors)} errors, e.g. {errors[0]}"
+            failed = failed or bool(errors)
+            print(f"{shards:>6} {threads:>7} {throughput:>12,.0f} {throughput / baseline:>10.2f}x  {result}")
+    
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Admin write latency benchmark for blog and review posts.
+
+Runs create, update and delete through the services against a throwaway
+SQLite file, so it never touches the content database. Every statement
+and every COMMIT can be delayed by --rtt milliseconds to stand in for the
+network round trip to a remote Turso database. Reports mean and p95
+latency per operation plus the statements and commits each one issued.
+Posts carry no base64 images, so nothing is uploaded to R2.
+
+Run from the backend directory (needs the usual .env so app settings load):
+    python -m benchmarks.write_latency --rounds 50 --tags 8 --rtt 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.content import ContentBase
+from app.services import base
+from app.services.blog import BlogService
+from app.services.review import ReviewService
+
+SERVICES = {"blog": BlogService, "review": ReviewService}
+
+
+class RoundTrips:
+    """Counts (and optionally delays) statements and commits on an engine."""
+    
+    def __init__(self, engine: Any, rtt: float) -> None:
+        self.rtt = rtt
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine, "commit", self._on_commit)
+    
+    def _on_statement(self, *args: Any) -> None:
+        self.statements += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+    
+    def _on_commit(self, *args: Any) -> None:
+        self.commits += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+    
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+
+def post_fields(i: int, num_tags: int, version: int) -> dict[str, Any]:
+    """Fields for a post; ``version`` shifts half the tags so updates change them."""
+    shift = version * (num_tags // 2)
+    return {
+        "title": f"Benchmark post {i} v{version}",
+        "author": f"author-{(i + version) % 5}",
+        "description": "Write latency benchmark",
+        "content": [{"type": "text", "content": "Lorem ipsum " * 50}],
+        "tags": [f"tag-{(t + shift) % (num_tags * 2)}" for t in range(num_tags)],
+        "thumbnail_path": {"link": "https://example.com/thumbnail.png"},
+    }
+
+
+def measure(trips: RoundTrips, op: Callable[[], Any]) -> tuple[float, int, int]:
+    trips.reset()
+    began = time.perf_counter()
+    op()
+    return time.perf_counter() - began, trips.statements, trips.commits
+
+
+def run(service: Any, trips: RoundTrips, rounds: int, num_tags: int) -> dict[str, list[tuple[float, int, int]]]:
+    results: dict[str, list[tuple[float, int, int]]] = {"create": [], "update": [], "delete": []}
+    for i in range(rounds):
+        item_id: list[int] = []
+        results["create"].append(measure(trips, lambda: item_id.append(service.create(**post_fields(i, num_tags, 0)))))
+        # Warm the known-ID set the way a preceding admin page load would
+        service.get_known_ids()
+        results["update"].append(measure(trips, lambda: service.update(item_id[0], **post_fields(i, num_tags, 1))))
+        results["delete"].append(measure(trips, lambda: service.delete(item_id[0])))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50, help="Create/update/delete cycles per content type")
+    parser.add_argument("--tags", type=int, default=8, help="Tags per post")
+    parser.add_argument("--rtt", type=float, default=0.0, help="Simulated round trip per statement and commit, in ms")
+    parser.add_argument("--types", default="blog,review", help="Comma-separated content types")
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    ContentBase.metadata.create_all(engine)
+    base.ContentSessionLocal = sessionmaker(bind=engine)
+    trips = RoundTrips(engine, args.rtt / 1000)
+    
+    try:
+        print(f"{'type':>6} {'op':>6} {'mean ms':>9} {'p95 ms':>9} {'stmts':>6} {'commits':>7}")
+        for name in args.types.split(","):
+            for op, samples in run(SERVICES[name], trips, args.rounds, args.tags).items():
+                latencies = sorted(sample[0] * 1000 for sample in samples)
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                statements = statistics.mean(sample[1] for sample in samples)
+                commits = statistics.mean(sample[2] for sample in samples)
+                print(
+                    f"{name:>6} {op:>6} {statistics.mean(latencies):>9.2f} {p95:>9.2f} "
+                    f"{statements:>6.1f} {commits:>7.1f}"
+                )
+    finally:
+        engine.dispose()
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Rebuild the FTS5 full-text indexes for blog_posts, reviews and timeline.
+
+Creates any missing index tables and sync triggers, then repopulates every
+index from its content table. Run after bulk edits made outside the app
+(e.g. restoring a backup) or if search results look out of date.
+
+Usage: python -m migrations.rebuild_fts
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import content_engine
+from app.core.fulltext import FULLTEXT_INDEXES, ensure_fulltext_indexes, rebuild_fulltext_indexes
+
+
+def run_rebuild():
+    """Create and rebuild all full-text indexes."""
+    
+    if not ensure_fulltext_indexes(content_engine):
+        print("✗ FTS5 is disabled (SEARCH_FTS_ENABLED) or not supported by this database")
+        sys.exit(1)
+    
+    rebuild_fulltext_indexes(content_engine)
+    for content_table in FULLTEXT_INDEXES:
+        print(f"✓ Rebuilt {content_table}_fts")
+    
+    print("\n✓ Full-text indexes rebuilt successfully!")
+
+
+if __name__ == "__main__":
+    print("Rebuilding full-text indexes...")
+    print("=" * 50)
+    run_rebuild()
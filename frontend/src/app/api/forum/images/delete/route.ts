@@ -4,6 +4,9 @@ import { headers } from "next/headers";
 
 const BACKEND_URL = process.env.BACKEND_URL || "http://localhost:4000";
 
+// Opaque handle the backend returns as an upload's key
+const DELETE_HANDLE = /^[A-Za-z0-9_-]{43}$/;
+
 /**
  * Delete a topic image from the backend storage service.
  *
@@ -31,8 +34,12 @@ export async function POST(req: NextRequest) {
 			);
 		}
 
-		// Validate key format (should be topic-images/uuid.ext)
-		if (!key.startsWith("topic-images/")) {
+		// Validate key format: the delete handle returned by the upload, or
+		// topic-images/uuid.ext for images uploaded before handles existed
+		if (
+			typeof key !== "string" ||
+			!(DELETE_HANDLE.test(key) || key.startsWith("topic-images/"))
+		) {
 			return NextResponse.json(
 				{ error: "Invalid image key format" },
 				{ status: 400 },
@@ -311,7 +311,7 @@ export const forumTopic = pgTable("forum_topic", {
 	spoilerExpiresAt: timestamp("spoiler_expires_at"), // When spoiler protection expires
 	editCount: integer("edit_count").notNull().default(0), // Track number of edits (max 5)
 	imageUrl: text("image_url"), // Public URL of the attached image (optional)
-	imageKey: text("image_key"), // R2 storage key for image deletion
+	imageKey: text("image_key"), // Delete handle from the image upload (older rows: R2 storage key)
 });
 
 export type ForumTopic = typeof forumTopic.$inferSelect;